@@ -0,0 +1,127 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+"""
+Multithreaded throughput benchmark for ConcurrentCoupledValues.
+
+Every thread runs a mix of lookups and updates against one shared set for a
+fixed amount of time. The same workload is run against a CoupledValues guarded
+by a single threading.Lock, which serialises readers as well as writers,
+against a ConcurrentCoupledValues with its default lock, and against one that
+lets readers share a ReadWriteLock. Run from the root of the repository with:
+
+    $python3 benchmarks/concurrent_throughput.py --threads 1 2 4 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coupledvalues import ConcurrentCoupledValues, CoupledValues, ReadWriteLock
+
+
+class GlobalLockCoupledValues(object):
+    def __init__(self, init_values):
+        self._cv = CoupledValues(init_values)
+        self._lock = threading.Lock()
+
+    def get_value(self, key):
+        with self._lock:
+            return self._cv.get_value(key)
+
+    def update(self, key, value):
+        with self._lock:
+            return self._cv.update(key, value)
+
+
+def read_write_locked(init_values):
+    return ConcurrentCoupledValues(init_values, lock=ReadWriteLock())
+
+
+def run_workload(table, threads, duration, size, write_ratio):
+    counts = [0] * threads
+    stop = threading.Event()
+
+    def worker(index):
+        rng = random.Random(index)
+        done = 0
+        while not stop.is_set():
+            for _ in range(100):
+                key = rng.randrange(size)
+                if rng.random() < write_ratio:
+                    # Renames the counterpart of key to a value that is only
+                    # ever used once, so that writers never clash.
+                    table.update(key, ("w", index, done))
+                    done += 1
+                else:
+                    table.get_value(key)
+                    done += 1
+        counts[index] = done
+
+    workers = [
+        threading.Thread(target=worker, args=(index,))
+        for index in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / duration
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    init_values = {key: -key - 1 for key in range(args.size)}
+    implementations = [
+        ("CoupledValues + Lock", GlobalLockCoupledValues),
+        ("ConcurrentCoupledValues", ConcurrentCoupledValues),
+        ("ConcurrentCoupledValues + RW lock", read_write_locked)
+    ]
+    print(f"{'implementation':<34}{'threads':>8}{'ops/s':>14}")
+    for name, implementation in implementations:
+        for threads in args.threads:
+            table = implementation(init_values)
+            throughput = run_workload(
+                table, threads, args.duration, args.size, args.write_ratio
+            )
+            print(f"{name:<34}{threads:>8}{throughput:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+"""
+Benchmark suite for coupled-values.
+
+Times every public method of CoupledValues and CoupledPair, and the
+make_pairs and create_pairs helpers, on sets of increasing size filled with
+int, str or tuple values. For each benchmark the throughput and the peak
+memory allocated while it runs are recorded, and the results can be saved as
+JSON and compared with an earlier run to catch regressions.
+
+Run from the root of the repository with:
+
+    $python3 benchmarks/suite.py run --output before.json
+    $python3 benchmarks/suite.py run --output after.json
+    $python3 benchmarks/suite.py compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coupledpairs import CoupledPair, make_pairs
+from coupledvalues import ERROR_OFF, CoupledValues, create_pairs
+
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000, 1000000]
+KEY_TYPES = {
+    "int": lambda index: index,
+    "str": lambda index: f"key-{index}",
+    "tuple": lambda index: (index, "key")
+}
+# Every benchmark handles about this many keys per measurement. Benchmarks
+# that use up a key with every call, such as pop, handle at most size keys.
+ITEMS_PER_MEASUREMENT = 10000
+REPEAT = 3
+
+BENCHMARKS = []
+
+
+def benchmark(name, whole_set=False, uses_up_keys=False):
+    """
+    Registers a benchmark. The decorated function takes a Fixture and returns
+    a function that performs the benchmarked call once when given the index of
+    the call. whole_set benchmarks handle every pair in the fixture with each
+    call, and uses_up_keys benchmarks cannot be called more than size times.
+    """
+    def register(function):
+        BENCHMARKS.append((name, whole_set, uses_up_keys, function))
+        return function
+    return register
+
+
+def calls_for(size, whole_set, uses_up_keys):
+    if whole_set:
+        return max(1, ITEMS_PER_MEASUREMENT // size)
+    if uses_up_keys:
+        return min(size, ITEMS_PER_MEASUREMENT)
+    return ITEMS_PER_MEASUREMENT
+
+
+class Fixture(object):
+    """
+    Data a benchmark runs against: size pairs of values made with make_key, a
+    CoupledValues holding them and the same pairs as a dict.
+    """
+
+    def __init__(self, size, make_key):
+        self.size = size
+        self.make_key = make_key
+        self.firsts = [make_key(index * 2) for index in range(size)]
+        self.seconds = [make_key(index * 2 + 1) for index in range(size)]
+        self.as_dict = dict(zip(self.firsts, self.seconds))
+        self.cv = CoupledValues(self.as_dict)
+        self.missing = [make_key(-index - 1) for index in range(size)]
+
+    def key(self, index):
+        return self.firsts[index % self.size]
+
+    def fresh_sets(self):
+        """
+        Returns a new CoupledValues holding the pairs for every call of a
+        whole_set benchmark that empties the set, so that building the sets
+        is not timed along with the calls.
+        """
+        calls = calls_for(self.size, whole_set=True, uses_up_keys=False)
+        return [CoupledValues(self.as_dict) for _ in range(calls)]
+
+
+### ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ BENCHMARKS ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+@benchmark("CoupledValues.__init__", whole_set=True)
+def bench_init(fixture):
+    return lambda index: CoupledValues(fixture.as_dict)
+
+
+@benchmark("CoupledValues.get_value")
+def bench_get_value(fixture):
+    return lambda index: fixture.cv.get_value(fixture.key(index))
+
+
+@benchmark("CoupledValues.get_value (miss)")
+def bench_get_value_miss(fixture):
+    cv = CoupledValues(fixture.as_dict, error_mode=ERROR_OFF)
+    return lambda index: cv.get_value(fixture.missing[index % fixture.size])
+
+
+@benchmark("CoupledValues.contains")
+def bench_contains(fixture):
+    return lambda index: fixture.cv.contains(fixture.key(index))
+
+
+@benchmark("CoupledValues.get_many", whole_set=True)
+def bench_get_many(fixture):
+    return lambda index: fixture.cv.get_many(fixture.firsts)
+
+
+@benchmark("CoupledValues.contains_many", whole_set=True)
+def bench_contains_many(fixture):
+    return lambda index: fixture.cv.contains_many(fixture.firsts)
+
+
+@benchmark("CoupledValues.push", uses_up_keys=True)
+def bench_push(fixture):
+    cv = CoupledValues()
+    pairs = list(fixture.as_dict.items())
+    return lambda index: cv.push(pairs[index])
+
+
+@benchmark("CoupledValues.pop", uses_up_keys=True)
+def bench_pop(fixture):
+    cv = CoupledValues(fixture.as_dict)
+    return lambda index: cv.pop(fixture.firsts[index])
+
+
+@benchmark("CoupledValues.pop_many", whole_set=True)
+def bench_pop_many(fixture):
+    sets = fixture.fresh_sets()
+    return lambda index: sets[index].pop_many(fixture.firsts)
+
+
+@benchmark("CoupledValues.update", uses_up_keys=True)
+def bench_update(fixture):
+    cv = CoupledValues(fixture.as_dict)
+    return lambda index: cv.update(
+        fixture.firsts[index], fixture.missing[index]
+    )
+
+
+@benchmark("CoupledValues.temporary_push")
+def bench_temporary_push(fixture):
+    # The overlay does not copy the set, so every call handles only the one
+    # pair it pushes
+    extras = [
+        {missing: fixture.make_key(-fixture.size - index - 1)}
+        for index, missing in enumerate(fixture.missing)
+    ]
+    return lambda index: fixture.cv.temporary_push(
+        extras[index % fixture.size]
+    )
+
+
+@benchmark("CoupledValues.to_str", whole_set=True)
+def bench_to_str(fixture):
+    return lambda index: fixture.cv.to_str()
+
+
+@benchmark("CoupledValues.clear", whole_set=True)
+def bench_clear(fixture):
+    sets = fixture.fresh_sets()
+    return lambda index: sets[index].clear()
+
+
+@benchmark("CoupledPair.__init__")
+def bench_pair_init(fixture):
+    return lambda index: CoupledPair(
+        fixture.firsts[index % fixture.size],
+        fixture.seconds[index % fixture.size]
+    )
+
+
+@benchmark("CoupledPair.has")
+def bench_pair_has(fixture):
+    pair = CoupledPair(fixture.firsts[0], fixture.seconds[0])
+    return lambda index: pair.has(fixture.seconds[index % fixture.size])
+
+
+@benchmark("CoupledPair.counterpart")
+def bench_pair_counterpart(fixture):
+    pair = CoupledPair(fixture.firsts[0], fixture.seconds[0])
+    return lambda index: pair.counterpart(fixture.seconds[0])
+
+
+@benchmark("CoupledPair.is_similar_to")
+def bench_pair_is_similar_to(fixture):
+    pair = CoupledPair(fixture.firsts[0], fixture.seconds[0])
+    other = CoupledPair(fixture.seconds[0], fixture.firsts[0])
+    return lambda index: pair.is_similar_to(other)
+
+
+@benchmark("CoupledPair.clashes_with")
+def bench_pair_clashes_with(fixture):
+    pair = CoupledPair(fixture.firsts[0], fixture.seconds[0])
+    pairs = [
+        CoupledPair(first, second)
+        for first, second in zip(fixture.firsts, fixture.seconds)
+    ]
+    return lambda index: pair.clashes_with(pairs[index % fixture.size])
+
+
+@benchmark("CoupledPair.modify")
+def bench_pair_modify(fixture):
+    pair = CoupledPair(fixture.firsts[0], fixture.seconds[0])
+    return lambda index: pair.modify(
+        fixture.firsts[0], fixture.seconds[index % fixture.size]
+    )
+
+
+@benchmark("CoupledPair.to_str")
+def bench_pair_to_str(fixture):
+    pair = CoupledPair(fixture.firsts[0], fixture.seconds[0])
+    return lambda index: pair.to_str()
+
+
+@benchmark("make_pairs", whole_set=True)
+def bench_make_pairs(fixture):
+    return lambda index: make_pairs(fixture.as_dict)
+
+
+@benchmark("create_pairs", whole_set=True)
+def bench_create_pairs(fixture):
+    return lambda index: create_pairs(fixture.cv)
+
+
+### ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ RUNNER ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+def measure(factory, fixture, calls, repeat=REPEAT):
+    """
+    Times calls calls of the benchmark built by factory, keeping the fastest
+    of repeat measurements, then makes the calls once more under tracemalloc
+    to find the peak memory they allocate.
+    """
+    seconds = None
+    for _ in range(repeat):
+        call = factory(fixture)
+        start = time.perf_counter()
+        for index in range(calls):
+            call(index)
+        elapsed = time.perf_counter() - start
+        if seconds is None or elapsed < seconds:
+            seconds = elapsed
+
+    call = factory(fixture)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for index in range(calls):
+        call(index)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run(sizes, key_types, names=None, max_seconds=None, log=sys.stderr):
+    results = []
+    for key_type in key_types:
+        too_slow = set()
+        for size in sorted(sizes):
+            fixture = Fixture(size, KEY_TYPES[key_type])
+            for name, whole_set, uses_up_keys, factory in BENCHMARKS:
+                if names and not any(part in name for part in names):
+                    continue
+                if name in too_slow:
+                    continue
+                calls = calls_for(size, whole_set, uses_up_keys)
+                seconds, peak = measure(factory, fixture, calls)
+                items = calls * size if whole_set else calls
+                result = {
+                    "name": name,
+                    "key_type": key_type,
+                    "size": size,
+                    "calls": calls,
+                    "seconds": seconds,
+                    "items_per_second": items / seconds if seconds else None,
+                    "peak_bytes": peak
+                }
+                results.append(result)
+                print(
+                    f"{name:<34}{key_type:>6}{size:>9}"
+                    + f"{result['items_per_second'] or 0:>16,.0f} items/s"
+                    + f"{peak:>14,} B",
+                    file=log
+                )
+                if max_seconds is not None and seconds > max_seconds:
+                    too_slow.add(name)
+                    print(f"  {name} is too slow, skipping larger sizes",
+                          file=log)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+
+
+def compare(before, after, threshold, out=sys.stdout):
+    """
+    Prints the change in throughput of every benchmark found in both runs and
+    returns the benchmarks that became slower by more than threshold.
+    """
+    def key(result):
+        return result["name"], result["key_type"], result["size"]
+
+    old_results = {key(result): result for result in before["results"]}
+    regressions = []
+    print(f"{'benchmark':<34}{'type':>6}{'size':>9}{'before':>14}"
+          + f"{'after':>14}{'change':>9}", file=out)
+    for result in after["results"]:
+        old = old_results.get(key(result))
+        if old is None or not old["items_per_second"]:
+            continue
+        if not result["items_per_second"]:
+            continue
+        change = result["items_per_second"] / old["items_per_second"] - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions.append((result, change))
+        print(
+            f"{result['name']:<34}{result['key_type']:>6}{result['size']:>9}"
+            + f"{old['items_per_second']:>14,.0f}"
+            + f"{result['items_per_second']:>14,.0f}{change:>+9.1%}{flag}",
+            file=out
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite for coupled-values"
+    )
+    commands = parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES
+    )
+    run_parser.add_argument(
+        "--types", nargs="+", choices=sorted(KEY_TYPES), default=["int"]
+    )
+    run_parser.add_argument(
+        "--only", nargs="+", metavar="NAME",
+        help="only run benchmarks whose name contains one of these"
+    )
+    run_parser.add_argument(
+        "--max-seconds", type=float, default=30.0,
+        help="skip larger sizes of a benchmark once it takes longer than this"
+    )
+    run_parser.add_argument("--output", help="file to save the results to")
+    compare_parser = commands.add_parser(
+        "compare", help="compare two saved runs"
+    )
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="fraction of throughput that may be lost before a benchmark is "
+        + "flagged as a regression (default 0.1)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.sizes, args.types, args.only, args.max_seconds)
+        if args.output:
+            with open(args.output, "w") as fh:
+                json.dump(results, fh, indent=2)
+        return 0
+    elif args.command == "compare":
+        with open(args.before) as fh:
+            before = json.load(fh)
+        with open(args.after) as fh:
+            after = json.load(fh)
+        regressions = compare(before, after, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) found")
+            return 1
+        return 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,4 +22,13 @@
 # SOFTWARE.
 # 
 
-from coupledpairs.coupledpairs import CoupledPair, make_pairs
+from coupledpairs.coupledpairs import (
+    CoupledPair,
+    freeze_value,
+    FrozenCoupledPair,
+    IdentityCoupledPair,
+    iterate_pairs,
+    KeyedCoupledPair,
+    make_pairs,
+    normalize_text
+)
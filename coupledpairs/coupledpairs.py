@@ -23,6 +23,9 @@
 #
 
 
+from collections.abc import Iterable
+
+
 class CoupledPair(object):
     """
     Custom Pair class. CoupledPair has special methods that allow checking for
@@ -64,20 +67,30 @@ class CoupledPair(object):
     pair: CoupledPair
     """
 
+    # _listener is set by a CoupledValues that tracks changes to its pairs, and
+    # is called with the pair, the value that was replaced by modify and the
+    # key that was used to modify it
+    __slots__ = ("first", "second", "_listener")
+
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
     def __init__(self, first, second):
         if first == second:
-            raise ValueError(f"pair values cannot be the same")
+            raise ValueError("pair values cannot be the same")
         self.first = first
         self.second = second
 
+    def __reduce__(self):
+        return type(self), (self.first, self.second)
+
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
     def __contains__(self, value):
         return self.has(value)
 
     def __eq__(self, other_pair):
+        if not isinstance(other_pair, CoupledPair):
+            return NotImplemented
         return self.is_similar_to(other_pair)
 
     def __repr__(self):
@@ -119,11 +132,7 @@ class CoupledPair(object):
         """
         if not isinstance(other_pair, CoupledPair):
             raise TypeError("other_pair must be an instance of CoupledPair")
-        conditions = [
-            self.has(other_pair.first),
-            self.has(other_pair.second)
-        ]
-        return any(conditions)
+        return self.has(other_pair.first) or self.has(other_pair.second)
     
     def copy(self):
         """
@@ -133,9 +142,9 @@ class CoupledPair(object):
         Returns
         -------
         new_pair: CoupledPair
-            The copied pair
+            The copied pair, of the same type as this pair
         """
-        return CoupledPair(self.first, self.second)
+        return type(self)(self.first, self.second)
 
     def counterpart(self, key):
         """
@@ -189,11 +198,7 @@ class CoupledPair(object):
         -------
         bool
         """
-        conditions = [
-            value == self.first,
-            value == self.second
-        ]
-        return any(conditions)
+        return bool(value == self.first or value == self.second)
 
     def is_similar_to(self, other_pair):
         """
@@ -225,11 +230,16 @@ class CoupledPair(object):
         """
         if not isinstance(other_pair, CoupledPair):
             raise TypeError("other_pair must be an instance of CoupledPair")
-        conditions = [
-            self.first == other_pair.first and self.second == other_pair.second,
-            self.first == other_pair.second and self.second == other_pair.first
-        ]
-        return any(conditions)
+        return bool(
+            (
+                self.first == other_pair.first
+                and self.second == other_pair.second
+            )
+            or (
+                self.first == other_pair.second
+                and self.second == other_pair.first
+            )
+        )
 
     def setup_str(self):
         """
@@ -305,16 +315,517 @@ class CoupledPair(object):
         if key == value:
             raise ValueError("key cannot be the same as value")
         if key == self.first:
+            old_value = self.second
             self.second = value
         elif key == self.second:
+            old_value = self.first
             self.first = value
         else:
             raise KeyError(f"{key} does not exist")
+        listener = getattr(self, "_listener", None)
+        if listener is not None:
+            listener(self, old_value, key)
+
+
+class FrozenCoupledPair(CoupledPair):
+    """
+    Immutable CoupledPair. The values of a FrozenCoupledPair cannot be changed
+    once it has been created, which makes it hashable. The hash does not depend
+    on the order of the values, so FrozenCoupledPair("a", "b") and
+    FrozenCoupledPair("b", "a") are equal and hash the same, and frozen pairs
+    can be kept in sets or used as dictionary keys. The hash is only computed
+    the first time it is needed and is then cached.
+
+    Example
+    -------
+
+        >>> pairs = {FrozenCoupledPair("a", "b"), FrozenCoupledPair("b", "a")}
+        >>> len(pairs)
+        1
+
+    Parameters
+    ----------
+    first: object
+
+    second: object
+
+    Raises
+    ------
+    ValueError
+        If first and second are the same
+
+    Returns
+    -------
+    pair: FrozenCoupledPair
+    """
+
+    __slots__ = ("_hash",)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(self, first, second):
+        if first == second:
+            raise ValueError("pair values cannot be the same")
+        object.__setattr__(self, "first", first)
+        object.__setattr__(self, "second", second)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            pair_hash = hash(frozenset((self.first, self.second)))
+            object.__setattr__(self, "_hash", pair_hash)
+            return pair_hash
+
+    def to_str(self):
+        """
+        Convert FrozenCoupledPair to full string.
+
+        Returns
+        -------
+        str
+        """
+        s_str = self.setup_str()
+        return f"FrozenCoupledPair({s_str[0]}, {s_str[1]})"
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenCoupledPair is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenCoupledPair is immutable")
+
+    def modify(self, key, value):
+        """
+        FrozenCoupledPair cannot be modified. Use
+        FrozenCoupledPair.replace instead.
+
+        Raises
+        ------
+        TypeError
+            Always
+        """
+        raise TypeError("FrozenCoupledPair is immutable")
+
+    def replace(self, key, value):
+        """
+        Like CoupledPair.modify, but returns a new FrozenCoupledPair instead of
+        changing this one.
+
+        Example
+        -------
+
+            >>> my_pair = FrozenCoupledPair("my key", "old value")
+            >>> my_pair.replace("my key", "new value")
+            FrozenCoupledPair('my key', 'new value')
+
+        Parameters
+        ----------
+        key: object
+            The value of the key in the pair
+
+        value: object
+            The value that replaces the counterpart of key
+
+        Raises
+        ------
+        KeyError
+            If key is not in the pair
+
+        ValueError
+            If value is the same as key
+
+        Returns
+        -------
+        new_pair: FrozenCoupledPair
+        """
+        if key == value:
+            raise ValueError("key cannot be the same as value")
+        if key == self.first:
+            return type(self)(self.first, value)
+        elif key == self.second:
+            return type(self)(value, self.second)
+        else:
+            raise KeyError(f"{key} does not exist")
+
+
+class IdentityCoupledPair(CoupledPair):
+    """
+    CoupledPair that compares values by identity (is) instead of equality
+    (==). Use it for values that are expensive to compare or that cannot be
+    compared with ==, such as arrays, dataframes or ORM entities, where two
+    values are the same only if they are the same object.
+
+    Example
+    -------
+
+        >>> first, second = [1, 2], [1, 2]
+        >>> my_pair = IdentityCoupledPair(first, second)
+        >>> my_pair.counterpart(first) is second
+        True
+        >>> my_pair.has([1, 2])
+        False
+
+    Parameters
+    ----------
+    first: object
+
+    second: object
+
+    Raises
+    ------
+    ValueError
+        If first and second are the same object
+
+    Returns
+    -------
+    pair: IdentityCoupledPair
+    """
+
+    __slots__ = ()
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(self, first, second):
+        if first is second:
+            raise ValueError("pair values cannot be the same")
+        self.first = first
+        self.second = second
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def counterpart(self, key):
+        """
+        Returns the value paired with key. See CoupledPair.counterpart.
+
+        Raises
+        ------
+        KeyError
+            If key is not one of the objects in the pair
+
+        Returns
+        -------
+        value: object
+        """
+        if key is self.first:
+            return self.second
+        elif key is self.second:
+            return self.first
+        else:
+            raise KeyError(f"{type(key).__name__} object does not exist here")
+
+    def has(self, value):
+        """
+        Checks if value is one of the objects in the pair.
+
+        Returns
+        -------
+        bool
+        """
+        return value is self.first or value is self.second
+
+    def is_similar_to(self, other_pair):
+        """
+        Checks if other_pair holds the same two objects, in either order.
+
+        Raises
+        ------
+        TypeError
+            If other_pair is not an instance of CoupledPair
+
+        Returns
+        -------
+        bool
+        """
+        if not isinstance(other_pair, CoupledPair):
+            raise TypeError("other_pair must be an instance of CoupledPair")
+        return (
+            (
+                self.first is other_pair.first
+                and self.second is other_pair.second
+            )
+            or (
+                self.first is other_pair.second
+                and self.second is other_pair.first
+            )
+        )
+
+    def to_str(self):
+        """
+        Convert IdentityCoupledPair to full string.
+
+        Returns
+        -------
+        str
+        """
+        s_str = self.setup_str()
+        return f"IdentityCoupledPair({s_str[0]}, {s_str[1]})"
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def modify(self, key, value):
+        """
+        Replaces the object paired with key by value. See CoupledPair.modify.
+
+        Raises
+        ------
+        KeyError
+            If key is not one of the objects in the pair
+
+        ValueError
+            If value is the same object as key
+
+        Returns
+        -------
+        None
+        """
+        if key is value:
+            raise ValueError("key cannot be the same as value")
+        if key is self.first:
+            old_value = self.second
+            self.second = value
+        elif key is self.second:
+            old_value = self.first
+            self.first = value
+        else:
+            raise KeyError(f"{type(key).__name__} object does not exist here")
+        listener = getattr(self, "_listener", None)
+        if listener is not None:
+            listener(self, old_value, key)
+
+
+class KeyedCoupledPair(CoupledPair):
+    """
+    CoupledPair that compares values by a canonical key instead of by the
+    values themselves: two values are the same if key_func gives equal
+    results for them. The values are kept as they were given.
+
+    Example
+    -------
+
+        >>> my_pair = KeyedCoupledPair("Alice ", "alice@example.com",
+        ...                            normalize_text)
+        >>> my_pair.counterpart("ALICE")
+        'alice@example.com'
+
+    Parameters
+    ----------
+    first: object
+
+    second: object
+
+    key_func: callable
+        Returns the canonical key of a value
+
+    Raises
+    ------
+    ValueError
+        If first and second have the same key
+
+    Returns
+    -------
+    pair: KeyedCoupledPair
+    """
+
+    __slots__ = ("key_func",)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(self, first, second, key_func):
+        if key_func(first) == key_func(second):
+            raise ValueError("pair values cannot be the same")
+        self.key_func = key_func
+        self.first = first
+        self.second = second
+
+    def __reduce__(self):
+        return type(self), (self.first, self.second, self.key_func)
+
+    def copy(self):
+        """
+        Copy the current values including references into a new
+        KeyedCoupledPair with the same key_func.
+
+        Returns
+        -------
+        new_pair: KeyedCoupledPair
+        """
+        return type(self)(self.first, self.second, self.key_func)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def counterpart(self, key):
+        """
+        Returns the value paired with the value that has the same key as key.
+        See CoupledPair.counterpart.
+
+        Raises
+        ------
+        KeyError
+            If no value in the pair has the same key as key
+
+        Returns
+        -------
+        value: object
+        """
+        key_func = self.key_func
+        canonical_key = key_func(key)
+        if canonical_key == key_func(self.first):
+            return self.second
+        elif canonical_key == key_func(self.second):
+            return self.first
+        else:
+            raise KeyError(f"{key} does not exist here")
+
+    def has(self, value):
+        """
+        Checks if a value in the pair has the same key as value.
+
+        Returns
+        -------
+        bool
+        """
+        key_func = self.key_func
+        canonical_key = key_func(value)
+        return bool(
+            canonical_key == key_func(self.first)
+            or canonical_key == key_func(self.second)
+        )
+
+    def is_similar_to(self, other_pair):
+        """
+        Checks if the values of other_pair have the same keys as the values
+        of this pair, in either order.
+
+        Raises
+        ------
+        TypeError
+            If other_pair is not an instance of CoupledPair
+
+        Returns
+        -------
+        bool
+        """
+        if not isinstance(other_pair, CoupledPair):
+            raise TypeError("other_pair must be an instance of CoupledPair")
+        key_func = self.key_func
+        keys = (key_func(self.first), key_func(self.second))
+        other_keys = (key_func(other_pair.first), key_func(other_pair.second))
+        return keys == other_keys or keys == other_keys[::-1]
+
+    def to_str(self):
+        """
+        Convert KeyedCoupledPair to full string.
+
+        Returns
+        -------
+        str
+        """
+        s_str = self.setup_str()
+        return f"KeyedCoupledPair({s_str[0]}, {s_str[1]})"
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def modify(self, key, value):
+        """
+        Replaces the value paired with the value that has the same key as key.
+        See CoupledPair.modify.
+
+        Raises
+        ------
+        KeyError
+            If no value in the pair has the same key as key
+
+        ValueError
+            If value has the same key as key
+
+        Returns
+        -------
+        None
+        """
+        key_func = self.key_func
+        canonical_key = key_func(key)
+        if canonical_key == key_func(value):
+            raise ValueError("key cannot be the same as value")
+        if canonical_key == key_func(self.first):
+            key = self.first
+            old_value = self.second
+            self.second = value
+        elif canonical_key == key_func(self.second):
+            key = self.second
+            old_value = self.first
+            self.first = value
+        else:
+            raise KeyError(f"{key} does not exist")
+        listener = getattr(self, "_listener", None)
+        if listener is not None:
+            listener(self, old_value, key)
 
 
 ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ GENERAL FUNCTIONS ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
-def make_pairs(values):
+def iterate_pairs(values, pair_type=CoupledPair):
+    """
+    Like make_pairs, but returns a generator that creates the pairs one at a
+    time instead of a list, so a large or unbounded source of pairs never has
+    to be held in memory all at once.
+
+    Example
+    -------
+
+        >>> rows = ((i, -i) for i in range(1, 4))
+        >>> for pair in iterate_pairs(rows):
+        ...     print(pair)
+        CoupledPair(1, -1)
+        CoupledPair(2, -2)
+        CoupledPair(3, -3)
+
+    Parameters
+    ----------
+    values: CoupledPair, list, set, tuple, dict or iterable
+
+    pair_type: type = CoupledPair
+
+    Raises
+    ------
+    TypeError
+        If values, or one of the items inside it, cannot be made into a pair
+
+    Returns
+    -------
+    generator of pair_type
+    """
+    if isinstance(values, CoupledPair):
+        if isinstance(values, pair_type):
+            yield values
+        else:
+            yield pair_type(values.first, values.second)
+    elif isinstance(values, list) or isinstance(values, set):
+        for value in values:
+            yield from iterate_pairs(value, pair_type)
+    elif isinstance(values, tuple):
+        yield pair_type(values[0], values[1])
+    elif isinstance(values, dict):
+        for key, value in values.items():
+            yield pair_type(key, value)
+    elif isinstance(values, (str, bytes)) or not isinstance(values, Iterable):
+        raise TypeError(
+            "make_pairs only accepts CoupledPair, list, set, tuple, dict or "
+            + "an iterable of pairs"
+        )
+    else:
+        for value in values:
+            if isinstance(value, (CoupledPair, dict)):
+                yield from iterate_pairs(value, pair_type)
+            else:
+                first, second = value
+                yield pair_type(first, second)
+
+
+def make_pairs(values, pair_type=CoupledPair):
     """
     Makes a list pairs from an iterable. However, different iterables have
     different behaviours when making a list of pairs.
@@ -335,29 +846,83 @@ def make_pairs(values):
     created. Using a dictionary to create a list of CoupledPair objects is by far
     the safest method.
 
+    If you are trying to make a list of pairs from any other iterable, such as a
+    generator, a csv.reader or a database cursor, each item it yields is
+    unpacked into the two values of a pair, unless it is a CoupledPair or a
+    dict. To avoid building the whole list, use iterate_pairs instead.
+
+    pair_type decides which kind of pair is produced, so passing
+    FrozenCoupledPair makes a list of immutable pairs. CoupledPair objects that
+    are not already instances of pair_type are converted.
+
     Parameters
     ----------
-    value: CoupledPair, list, set, tuple or dict
+    value: CoupledPair, list, set, tuple, dict or iterable
+
+    pair_type: type = CoupledPair
+        CoupledPair or one of its subclasses, such as FrozenCoupledPair
 
     Returns
     -------
-    list of CoupledPair
+    list of pair_type
     """
-    if isinstance(values, CoupledPair):
-        return [values]
-    elif isinstance(values, list) or isinstance(values, set):
-        result = []
-        for value in values:
-            result.extend(make_pairs(value))
-        return result
-    elif isinstance(values, tuple):
-        return [CoupledPair(values[0], values[1])]
-    elif isinstance(values, dict):
-        result = []
-        for key, value in values.items():
-            result.append(CoupledPair(key, value))
-        return result
-    else:
-        raise TypeError(
-            "make_pairs only accepts CoupledPair, list, set, tuple or dict"
+    return list(iterate_pairs(values, pair_type))
+
+
+def freeze_value(value):
+    """
+    Key function for KeyedCoupledPair and KeyedCoupledValues that makes
+    lists, dicts and sets hashable: lists become tuples, dicts become
+    frozensets of their items and sets become frozensets, recursively.
+    Other values are returned as they are.
+
+    Example
+    -------
+
+        >>> freeze_value({"tags": ["a", "b"]})
+        frozenset({('tags', ('a', 'b'))})
+
+    Parameters
+    ----------
+    value: object
+
+    Returns
+    -------
+    key: object
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset(
+            (freeze_value(key), freeze_value(item))
+            for key, item in value.items()
         )
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_value(item) for item in value)
+    return value
+
+
+def normalize_text(value):
+    """
+    Key function for KeyedCoupledPair and KeyedCoupledValues that ignores
+    case and extra whitespace in strings: the string is casefolded, stripped
+    and every run of whitespace inside it is replaced by a single space.
+    Other values are returned as they are.
+
+    Example
+    -------
+
+        >>> normalize_text("  Hello   World ")
+        'hello world'
+
+    Parameters
+    ----------
+    value: object
+
+    Returns
+    -------
+    key: object
+    """
+    if isinstance(value, str):
+        return " ".join(value.casefold().split())
+    return value
@@ -29,9 +29,20 @@ from coupledvalues.errors import *
 
 
 __all__ = [
-    "ERROR_OFF", "ERROR_ON",
+    "DEFAULT_CHUNK_SIZE", "DEFAULT_REPR_ITEMS", "ERROR_OFF", "ERROR_ON",
+    "MERGE_COLLECT", "MERGE_KEEP_LEFT", "MERGE_KEEP_RIGHT", "MERGE_RAISE",
+    "SIDE_FIRST", "SIDE_SECOND", "JOIN_INNER", "JOIN_OUTER",
+    "DELTA_PUSH", "DELTA_UPDATE", "DELTA_POP", "DELTA_CLEAR", "DELTA_RESET",
     "BaseCoupledValuesError", "BaseExistenceError",
-    "AlreadyExistsError", "ClashingError",
-    "BaseCoupledValues",
-    "CoupledValues", "create_pairs"
+    "AlreadyExistsError", "ClashingError", "SequenceGapError",
+    "BaseCoupledValues", "build_parallel", "CacheCoupledValues",
+    "ChangeFeed", "receive_deltas", "send_deltas",
+    "ConcurrentCoupledValues", "ReadWriteLock",
+    "CoupledValues", "create_pairs", "IdentityCoupledValues",
+    "KeyedCoupledValues",
+    "MappedCoupledValues", "open_mapped", "save_mapped",
+    "NumericCoupledValues", "OverlayCoupledValues",
+    "dump", "dumps", "load", "loads", "Snapshot", "SortedCoupledValues",
+    "build_typed", "IntCoupledValues", "StrCoupledValues",
+    "Transaction"
 ]
\ No newline at end of file
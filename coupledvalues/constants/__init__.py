@@ -24,7 +24,26 @@
 
 
 ### DEFINE CONSTANTS ###
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_REPR_ITEMS = 100
 
 ### DEFINE OPTIONS ###
 ERROR_ON = "ERROR_ON"
-ERROR_OFF = "ERROR_OFF"
\ No newline at end of file
+ERROR_OFF = "ERROR_OFF"
+
+MERGE_RAISE = "MERGE_RAISE"
+MERGE_KEEP_LEFT = "MERGE_KEEP_LEFT"
+MERGE_KEEP_RIGHT = "MERGE_KEEP_RIGHT"
+MERGE_COLLECT = "MERGE_COLLECT"
+
+SIDE_FIRST = "SIDE_FIRST"
+SIDE_SECOND = "SIDE_SECOND"
+
+JOIN_INNER = "JOIN_INNER"
+JOIN_OUTER = "JOIN_OUTER"
+
+DELTA_PUSH = "DELTA_PUSH"
+DELTA_UPDATE = "DELTA_UPDATE"
+DELTA_POP = "DELTA_POP"
+DELTA_CLEAR = "DELTA_CLEAR"
+DELTA_RESET = "DELTA_RESET"
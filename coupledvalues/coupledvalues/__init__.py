@@ -24,10 +24,48 @@
 
 
 from coupledvalues.coupledvalues.basecoupledvalues import *
+from coupledvalues.coupledvalues.cachecoupledvalues import *
+from coupledvalues.coupledvalues.changefeed import *
+from coupledvalues.coupledvalues.concurrentcoupledvalues import *
 from coupledvalues.coupledvalues.coupledvalues import *
+from coupledvalues.coupledvalues.identitycoupledvalues import *
+from coupledvalues.coupledvalues.keyedcoupledvalues import *
+from coupledvalues.coupledvalues.mappedcoupledvalues import *
+from coupledvalues.coupledvalues.numericcoupledvalues import *
+from coupledvalues.coupledvalues.overlaycoupledvalues import *
+from coupledvalues.coupledvalues.parallelbuild import *
+from coupledvalues.coupledvalues.serialization import *
+from coupledvalues.coupledvalues.snapshot import *
+from coupledvalues.coupledvalues.sortedcoupledvalues import *
+from coupledvalues.coupledvalues.transaction import *
+from coupledvalues.coupledvalues.typedcoupledvalues import *
 
 __all__ = [
     "BaseCoupledValues",
+    "build_parallel",
+    "CacheCoupledValues",
+    "ChangeFeed",
+    "receive_deltas",
+    "send_deltas",
+    "ConcurrentCoupledValues",
+    "ReadWriteLock",
     "CoupledValues",
-    "create_pairs"
+    "create_pairs",
+    "IdentityCoupledValues",
+    "KeyedCoupledValues",
+    "MappedCoupledValues",
+    "open_mapped",
+    "save_mapped",
+    "NumericCoupledValues",
+    "OverlayCoupledValues",
+    "dump",
+    "dumps",
+    "load",
+    "loads",
+    "Snapshot",
+    "SortedCoupledValues",
+    "build_typed",
+    "IntCoupledValues",
+    "StrCoupledValues",
+    "Transaction"
 ]
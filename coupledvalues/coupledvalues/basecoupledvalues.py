@@ -23,100 +23,782 @@
 #
 
 
+from itertools import islice
+
 from coupledpairs import *
 from coupledvalues.constants import *
+from coupledvalues.coupledvalues.changefeed import ChangeFeed, _MutationHook
+from coupledvalues.coupledvalues.instrumentation import Instrumentation
+from coupledvalues.coupledvalues.snapshot import Snapshot
 from coupledvalues.errors import *
 
 
+_MISSING = object()
+
+_DELTA_OPERATIONS = frozenset(
+    (DELTA_PUSH, DELTA_UPDATE, DELTA_POP, DELTA_CLEAR, DELTA_RESET)
+)
+
+
+def _unique_values(values):
+    seen = set()
+    unhashable_values = []
+    result = []
+    for value in values:
+        try:
+            if value in seen:
+                continue
+            seen.add(value)
+        except TypeError:
+            if any(value == other for other in unhashable_values):
+                continue
+            unhashable_values.append(value)
+        result.append(value)
+    return result
+
+
+def _flatten_pairs(pairs):
+    firsts = []
+    seconds = []
+    pair_types = []
+    for pair in pairs:
+        firsts.append(pair.first)
+        seconds.append(pair.second)
+        pair_types.append(type(pair))
+    if len(set(pair_types)) <= 1:
+        pair_types = pair_types[0] if pair_types else CoupledPair
+    return firsts, seconds, pair_types
+
+
+def _unflatten_pairs(firsts, seconds, pair_types):
+    if isinstance(pair_types, type):
+        return [
+            pair_types(first, second) for first, second in zip(firsts, seconds)
+        ]
+    return [
+        pair_type(first, second)
+        for first, second, pair_type in zip(firsts, seconds, pair_types)
+    ]
+
+
+def _restore_pairs(cls, error_mode, firsts, seconds, pair_types):
+    new_cv = cls(error_mode=error_mode)
+    new_cv._insert_pairs(
+        new_cv._convert_pair(pair)
+        for pair in _unflatten_pairs(firsts, seconds, pair_types)
+    )
+    return new_cv
+
+
 class BaseCoupledValues(object):
     """
     Base CoupledValues class. All CoupledValues implementations are inherited
     from this class.
+
+    Pairs are stored in insertion order in a dictionary keyed by the identity of
+    each pair, and every hashable value is indexed in a second dictionary that
+    maps the value to the pair holding it. Looking up, adding or removing a pair
+    therefore takes constant time on average. Pairs holding a value that cannot
+    be hashed are kept aside in a separate collection and are searched linearly,
+    so such values are still accepted as before.
     """
 
+    # Type of the pairs that the set creates from the values it is given
+    _pair_type = CoupledPair
+
+    # Function that gives the key a value is indexed by, None for the value
+    # itself
+    _index_key = None
+
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
     def __init__(self, error_mode=ERROR_ON):
         if error_mode not in {ERROR_OFF, ERROR_ON}:
             raise ValueError("error_mode must be ERROR_ON or ERROR_OFF")
-        self._pairs = []
+        self._pairs = {}
+        self._index = {}
+        self._unhashable_pairs = {}
         self._error_mode = error_mode
+        self._instrumentation = None
+        self._changed = None
+        self._mutation_hook = None
+        self._method_hooks = None
+        self._applied_sequence = None
+
+    def __reduce__(self):
+        # Pickled as two flat lists of values instead of one object per pair.
+        # The pairs were already validated, so they are inserted back without
+        # checking for clashes, and the index is rebuilt in one pass.
+        return _restore_pairs, (
+            (type(self), self._error_mode)
+            + _flatten_pairs(self._iterate_pairs())
+        )
 
     def _push_pair(self, pair):
+        pair = self._convert_pair(pair)
         if self._clashes(pair):
             raise ClashingError(
                 f"{pair} clashes with another pair in the set"
             )
-        self._pairs.append(pair)
+        self._insert_pair(pair)
         return None
 
     def _push_pairs(self, pairs):
+        # Every pair is converted before anything is added, so a pair the set
+        # rejects cannot leave it half-updated
+        pairs = [self._convert_pair(pair) for pair in pairs]
+        clashing_values = self._find_clashes(pairs)
+        if clashing_values:
+            raise ClashingError.from_values(clashing_values)
+        self._insert_pairs(pairs)
+        return None
+
+    def _push_pair_chunks(self, pairs, chunk_size, progress=None):
+        # Returns the pairs that were pushed, as they were converted by the
+        # set. Pairs are read, converted and checked for clashes one chunk at
+        # a time, against the set and so against the chunks already added,
+        # so a push never holds more than one chunk besides the set. If a
+        # chunk clashes or anything fails, the chunks already added are
+        # removed again. The rest of the pairs are then read, so that
+        # ClashingError lists every clashing value of the whole push
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        pairs = iter(pairs)
+        pushed = []
+        try:
+            while True:
+                chunk = [
+                    self._convert_pair(pair)
+                    for pair in islice(pairs, chunk_size)
+                ]
+                if not chunk:
+                    return pushed
+                if self._find_clashes(chunk):
+                    read = pushed + chunk
+                    read.extend(self._convert_pair(pair) for pair in pairs)
+                    break
+                self._insert_pairs(chunk)
+                pushed.extend(chunk)
+                if progress is not None:
+                    progress(len(pushed))
+        except BaseException:
+            self._discard_pushed(pushed)
+            raise
+        self._discard_pushed(pushed)
+        raise ClashingError.from_values(self._find_clashes(read))
+
+    def _discard_pushed(self, pairs):
+        for pair in reversed(pairs):
+            self._discard_pair(pair)
+        return None
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _convert_pair(self, pair):
+        # Sets that store their own kind of pair convert the pairs they are
+        # given here
+        return pair
+
+    def _index_pair(self, pair):
+        indexed = True
+        for value in (pair.first, pair.second):
+            try:
+                self._index[value] = pair
+            except TypeError:
+                indexed = False
+        if not indexed:
+            self._unhashable_pairs[id(pair)] = pair
+        return None
+
+    def _unindex_pair(self, pair):
+        for value in (pair.first, pair.second):
+            try:
+                if self._index.get(value) is pair:
+                    del self._index[value]
+            except TypeError:
+                pass
+        self._unhashable_pairs.pop(id(pair), None)
+        return None
+
+    def _insert_pair(self, pair):
+        self._pairs[id(pair)] = pair
+        self._index_pair(pair)
+        if self._changed is not None:
+            self._watch(pair, self._record_change)
+        return None
+
+    def _insert_pairs(self, pairs):
         for pair in pairs:
-            self._push_pair(pair)
+            self._insert_pair(pair)
+        return None
+
+    def _discard_pair(self, pair):
+        del self._pairs[id(pair)]
+        self._unindex_pair(pair)
+        if self._changed is not None:
+            self._watch(pair, None)
+            self._changed.pop(id(pair), None)
+        return None
+
+    def _drop_pair(self, pair):
+        # Removes a pair that the set lets go of by itself, for example an
+        # evicted or expired pair. Unlike _discard_pair, it is wrapped by
+        # _MutationHook, so that change feeds and snapshots see the removal
+        self._discard_pair(pair)
+        return None
+
+    @staticmethod
+    def _watch(pair, listener):
+        try:
+            pair._listener = listener
+        except AttributeError:
+            # FrozenCoupledPair cannot change, so there is nothing to track
+            pass
+        return None
+
+    def _reindex(self):
+        self._index.clear()
+        self._unhashable_pairs.clear()
+        for pair in self._pairs.values():
+            self._index_pair(pair)
         return None
 
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
-    def _contains(self, key):
-        for pair in self._pairs:
-            if pair.has(key):
-                return True
-        return False
+    def __len__(self):
+        return len(self._pairs)
 
-    def _get_pair(self, key):
-        for pair in self._pairs:
+    # - ## ~~~~~~~~~~~~~~~~~ INSTRUMENTATION SECTION ~~~~~~~~~~~~~~~~~ ##
+
+    def enable_stats(self, callback=None):
+        """
+        Starts counting calls, index probes and equality comparisons, and
+        timing the lookups, clash checks, pushes, updates and removals of
+        this set. When stats are not enabled these paths run
+        without any instrumentation at all.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": "b"})
+            >>> my_cv.enable_stats()
+            >>> my_cv["a"]
+            'b'
+            >>> my_cv.stats()["get_pair"]["calls"]
+            1
+
+        Parameters
+        ----------
+        callback: callable, optional
+            Called as callback(operation, seconds, probes, comparisons) after
+            every instrumented call, for example to forward the figures to a
+            metrics system
+
+        Returns
+        -------
+        None
+        """
+        self.disable_stats()
+        self._instrumentation = Instrumentation(self, callback)
+        self._instrumentation.attach()
+        return None
+
+    def disable_stats(self):
+        """
+        Stops recording stats and removes the instrumentation.
+
+        Returns
+        -------
+        None
+        """
+        if self._instrumentation is not None:
+            self._instrumentation.detach()
+            self._instrumentation = None
+        return None
+
+    def reset_stats(self):
+        """
+        Sets all recorded stats back to zero.
+
+        Returns
+        -------
+        None
+        """
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+        return None
+
+    def stats(self):
+        """
+        Returns a snapshot of the stats recorded since enable_stats or
+        reset_stats was last called, keyed by operation. For every operation,
+        the number of calls, the total and mean time spent in them, estimates
+        of the number of index probes and equality comparisons, and a
+        histogram of latencies are given. See OperationStats for details.
+
+        Returns
+        -------
+        stats: dict
+            Empty if stats are not enabled
+        """
+        if self._instrumentation is None:
+            return {}
+        return self._instrumentation.snapshot()
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ LOOKUP SECTION ~~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _find_pair(self, key):
+        try:
+            pair = self._index.get(key, _MISSING)
+        except TypeError:
+            pair = _MISSING
+        if pair is not _MISSING:
+            return pair
+        for pair in self._unhashable_pairs.values():
             if pair.has(key):
                 return pair
+        return None
+
+    # The methods of the storage that look up keys, which Instrumentation
+    # wraps to count their work with _lookup_cost, and those that look up
+    # many keys at once, counted with _bulk_lookup_cost
+    _lookup_methods = ("_find_pair",)
+    _bulk_lookup_methods = ()
+
+    def _lookup_cost(self, key):
+        # The number of index probes and equality comparisons that looking
+        # up key makes, found by following the steps of _find_pair without
+        # changing anything: 1 probe of the hash index, with 1 comparison if
+        # it holds key, then 1 probe of every pair with unhashable values
+        # until one has key, with 1 comparison for each value tried
+        try:
+            if key in self._index:
+                return 1, 1
+            probes = 1
+        except TypeError:
+            probes = 0
+        comparisons = 0
+        for pair in self._unhashable_pairs.values():
+            probes += 1
+            comparisons += 1
+            if key == pair.first:
+                return probes, comparisons
+            comparisons += 1
+            if key == pair.second:
+                return probes, comparisons
+        return probes, comparisons
+
+    def _bulk_lookup_cost(self, keys):
+        # The same as _lookup_cost for a batch lookup
+        probes = comparisons = 0
+        for key in keys:
+            key_probes, key_comparisons = self._lookup_cost(key)
+            probes += key_probes
+            comparisons += key_comparisons
+        return probes, comparisons
+
+    def _contains(self, key):
+        return self._find_pair(key) is not None
+
+    def _get_pair(self, key):
+        pair = self._find_pair(key)
+        if pair is not None:
+            return pair
+        if self._error_mode == ERROR_ON:
+            raise KeyError(f"{key} does not exist in the set")
+        else:
+            return None
+
+    def _get_many(self, keys, default=_MISSING):
+        find_pair = self._find_pair
+        for key in keys:
+            pair = find_pair(key)
+            if pair is None:
+                yield self._missing_value(key, default)
+            else:
+                yield pair.counterpart(key)
+
+    def _contains_many(self, keys):
+        find_pair = self._find_pair
+        for key in keys:
+            yield find_pair(key) is not None
+
+    def _missing_value(self, key, default=_MISSING):
+        if default is not _MISSING:
+            return default
         if self._error_mode == ERROR_ON:
             raise KeyError(f"{key} does not exist in the set")
         else:
             return None
 
     def _has(self, pair):
-        for existing_pair in self._pairs:
-            if existing_pair.is_similar_to(pair):
-                return True
-        return False
+        existing_pair = self._find_pair(pair.first)
+        if existing_pair is None:
+            return False
+        return existing_pair.is_similar_to(pair)
 
     def _iterate_pairs(self):
-        for pair in self._pairs:
+        for pair in self._pairs.values():
             yield pair
 
     def _iterate_values(self):
-        for pair in self._pairs:
+        for pair in self._pairs.values():
             yield pair.first, pair.second
 
     # - ## ~~~~~~~~~~~~~~~~~~~ VALIDATION SECTION ~~~~~~~~~~~~~~~~~~~ ##
 
     def _clashes(self, pair):
-        if self._has(pair):
-            return True
-        for existing_pair in self._pairs:
-            if pair.clashes_with(existing_pair):
-                return True
-        return False
+        return (
+            self._find_pair(pair.first) is not None
+            or self._find_pair(pair.second) is not None
+        )
+
+    def _find_clashes(self, pairs):
+        staged = BaseCoupledValues()
+        clashing_values = []
+        for pair in pairs:
+            for value in (pair.first, pair.second):
+                if (
+                    self._find_pair(value) is not None
+                    or staged._find_pair(value) is not None
+                ):
+                    clashing_values.append(value)
+            staged._insert_pair(pair)
+        return _unique_values(clashing_values)
 
     def _validate_all(self):
-        for pair in self._pairs:
-            if self._clashes(pair):
-                return False
-        return True
+        return not self._find_duplicates()
+
+    def _find_duplicates(self):
+        seen = set()
+        unhashable_values = []
+        duplicates = []
+        for first, second in self._iterate_values():
+            for value in (first, second):
+                try:
+                    if value in seen:
+                        duplicates.append(value)
+                    else:
+                        seen.add(value)
+                except TypeError:
+                    if any(value == other for other in unhashable_values):
+                        duplicates.append(value)
+                    else:
+                        unhashable_values.append(value)
+        return _unique_values(duplicates)
+
+    def validate(self, changed_only=False):
+        """
+        Checks that no value appears in more than one pair of the set, in time
+        proportional to the size of the set, and returns every value that does.
+        If none do, the index of the set is also brought up to date, so pairs
+        that were changed with CoupledPair.modify outside of the set can be
+        looked up by their new values again.
+
+        With change tracking enabled, changed_only=True only checks the pairs
+        that were modified since the last validation.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": "b", "c": "d"})
+            >>> my_cv.enable_change_tracking()
+            >>> my_cv._find_pair("a").modify("a", "d")
+            >>> my_cv.validate(changed_only=True)
+            ['d']
+
+        Parameters
+        ----------
+        changed_only: bool = False
+            Whether to only check the pairs modified since the last validation.
+            Ignored unless change tracking is enabled
+
+        Returns
+        -------
+        duplicates: list
+            The values that appear in more than one pair, empty if the set is
+            valid
+        """
+        if changed_only and self._changed is not None:
+            return self._validate_changed()
+        duplicates = self._find_duplicates()
+        if not duplicates:
+            self._reindex()
+            if self._changed is not None:
+                self._changed.clear()
+        return duplicates
+
+    def _validate_changed(self):
+        changed = self._changed
+        self._changed = {}
+        duplicates = []
+        for pair, old_values in changed.values():
+            if id(pair) not in self._pairs:
+                continue
+            for old_value in old_values:
+                try:
+                    if self._index.get(old_value) is pair:
+                        del self._index[old_value]
+                except TypeError:
+                    pass
+            self._unhashable_pairs.pop(id(pair), None)
+            indexed = True
+            for value in (pair.first, pair.second):
+                other_pair = self._find_pair(value)
+                if other_pair is not None and other_pair is not pair:
+                    # Kept as changed so that it is reported until fixed
+                    self._changed[id(pair)] = (pair, [])
+                    duplicates.append(value)
+                    continue
+                try:
+                    self._index[value] = pair
+                except TypeError:
+                    indexed = False
+            if not indexed:
+                self._unhashable_pairs[id(pair)] = pair
+        return _unique_values(duplicates)
+
+    # - ## ~~~~~~~~~~~~~~~~~ CHANGE TRACKING SECTION ~~~~~~~~~~~~~~~~~ ##
+
+    def enable_change_tracking(self):
+        """
+        Starts recording which pairs of the set are modified with
+        CoupledPair.modify, including by code that holds on to the pairs
+        outside of the set, so that validate(changed_only=True) only needs to
+        check those pairs. Assigning to CoupledPair.first or
+        CoupledPair.second directly is not tracked, and a pair can only be
+        tracked by one set at a time.
+
+        Returns
+        -------
+        None
+        """
+        if self._changed is None:
+            self._changed = {}
+            for pair in self._pairs.values():
+                self._watch(pair, self._record_change)
+        return None
+
+    def disable_change_tracking(self):
+        """
+        Stops recording modified pairs. Pairs modified since the last
+        validation are only found again by a full validate.
+
+        Returns
+        -------
+        None
+        """
+        if self._changed is not None:
+            for pair in self._pairs.values():
+                self._watch(pair, None)
+            self._changed = None
+        return None
+
+    def _record_change(self, pair, old_value, key=None):
+        change = self._changed.get(id(pair))
+        if change is None:
+            self._changed[id(pair)] = (pair, [old_value])
+        else:
+            change[1].append(old_value)
+        return None
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~ CHANGE FEED SECTION ~~~~~~~~~~~~~~~~~~~~ ##
+
+    def change_feed(self, callback=None):
+        """
+        Starts recording every change made to the set as a delta record, so
+        that replicas of the set can be kept up to date with apply_deltas at a
+        cost proportional to the number of changes. See ChangeFeed for the
+        format of the records. CoupledPair.modify is only reported for pairs
+        that are not tracked by another set.
+
+        Example
+        -------
+
+            >>> master = CoupledValues({"a": "b"})
+            >>> replica = CoupledValues(master)
+            >>> feed = master.change_feed()
+            >>> master.update("a", "c")
+            >>> master.push(("d", "e"))
+            >>> feed.drain()
+            [(1, 'DELTA_UPDATE', 'a', 'c'), (2, 'DELTA_PUSH', 'd', 'e')]
+
+        Parameters
+        ----------
+        callback: callable, optional
+            Called as callback(delta) for every delta record. If None, the
+            records are kept until they are taken with ChangeFeed.drain
+
+        Returns
+        -------
+        feed: ChangeFeed
+            Call feed.close() to stop recording
+        """
+        feed = ChangeFeed(self, callback)
+        self._add_mutation_listener(feed._on_change)
+        return feed
+
+    def _add_mutation_listener(self, listener):
+        if self._mutation_hook is None:
+            self._mutation_hook = _MutationHook(self)
+            self._mutation_hook.attach()
+        self._mutation_hook._listeners += (listener,)
+        return None
+
+    def _remove_mutation_listener(self, listener):
+        hook = self._mutation_hook
+        if hook is None or listener not in hook._listeners:
+            return None
+        hook._listeners = tuple(
+            other for other in hook._listeners if other != listener
+        )
+        if not hook._listeners:
+            hook.detach()
+            self._mutation_hook = None
+        return None
+
+    def apply_deltas(self, deltas):
+        """
+        Replays delta records made by the ChangeFeed of another set onto this
+        one. Runs of pushed pairs are pushed together in one batch. Before
+        anything is applied, the sequence numbers are checked to follow on
+        from the last record applied to this set, so that a replica never
+        silently skips a change. A DELTA_RESET record made by
+        ChangeFeed.reset_delta replaces the whole contents of the set and may
+        start at any sequence number.
+
+        Example
+        -------
+
+            >>> replica.apply_deltas(feed.drain())
+            2
+            >>> replica
+            CoupledValues([('a', 'c'), ('d', 'e')])
+
+        Parameters
+        ----------
+        deltas: iterable of tuple
+
+        Raises
+        ------
+        SequenceGapError
+            If a record does not follow on from the one before it. Nothing is
+            applied in that case
+
+        ValueError
+            If a record has an unknown operation. Nothing is applied in that
+            case
+
+        Returns
+        -------
+        sequence: int or None
+            Sequence number of the last record applied to the set
+        """
+        deltas = list(deltas)
+        sequence = self._applied_sequence
+        for delta in deltas:
+            if delta[1] not in _DELTA_OPERATIONS:
+                raise ValueError(f"unknown delta operation {delta[1]!r}")
+            if delta[1] == DELTA_RESET or sequence is None:
+                sequence = delta[0]
+            elif delta[0] != sequence + 1:
+                raise SequenceGapError(
+                    f"expected delta {sequence + 1} but received delta "
+                    f"{delta[0]}",
+                    sequence + 1,
+                    delta[0]
+                )
+            else:
+                sequence = delta[0]
+        pushed = []
+        for _, operation, a, b in deltas:
+            if operation == DELTA_PUSH:
+                pushed.append(self._pair_type(a, b))
+                continue
+            if pushed:
+                self._push_pairs(pushed)
+                pushed = []
+            if operation == DELTA_UPDATE:
+                self._update(a, b)
+            elif operation == DELTA_POP:
+                self._remove_and_get_pair(a)
+            elif operation == DELTA_CLEAR:
+                self._clear()
+            else:
+                self._clear()
+                pushed = [self._pair_type(*values) for values in zip(a, b)]
+        if pushed:
+            self._push_pairs(pushed)
+        self._applied_sequence = sequence
+        return sequence
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ SNAPSHOT SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def snapshot(self):
+        """
+        Returns a read-only view of the set as it is now, that keeps showing
+        the same pairs while the set is changed, for example to iterate over
+        the pairs while popping or updating them. Taking a snapshot does not
+        copy the set: only the pairs that are changed after it was taken are
+        kept, so it costs memory in proportion to the writes made since. See
+        Snapshot for details.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": "b", "c": "d"})
+            >>> with my_cv.snapshot() as snapshot:
+            ...     for first, second in snapshot:
+            ...         my_cv.pop(first)
+            >>> len(my_cv), len(snapshot)
+            (0, 2)
+
+        Returns
+        -------
+        snapshot: Snapshot
+            Call snapshot.close() to stop keeping changed pairs when it is no
+            longer needed
+        """
+        snapshot = Snapshot(self)
+        snapshot._open()
+        return snapshot
 
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
     def _update(self, key, value):
         if key == value:
-            raise ValueError(f"key cannot be the same as value")
-        pair = self._get_pair(key)
+            raise ValueError("key cannot be the same as value")
+        # _find_pair rather than _get_pair and _contains, which are the lookups
+        # made on behalf of the user
+        pair = self._find_pair(key)
         if pair is None:
-            raise KeyError(f"{key} does not exist")
-        if self._contains(value):
+            raise KeyError(f"{key} does not exist in the set")
+        if self._find_pair(value) is not None:
             raise ClashingError(f"{value} is already in the set.")
-        pair.modify(key, value)
+        if isinstance(pair, FrozenCoupledPair):
+            new_pair = pair.replace(key, value)
+            self._discard_pair(pair)
+            self._insert_pair(new_pair)
+            return None
+        change = None
+        if self._changed is not None:
+            change = self._changed.get(id(pair))
+            earlier_changes = len(change[1]) if change is not None else 0
+        self._unindex_pair(pair)
+        try:
+            pair.modify(key, value)
+        finally:
+            self._index_pair(pair)
+            # The set keeps its own index up to date, so only changes made
+            # outside of it before this update are left to validate
+            if change is not None:
+                del change[1][earlier_changes:]
+            elif self._changed is not None:
+                self._changed.pop(id(pair), None)
         return None
 
     def _add_or_update(self, key, value):
-        new_pair = CoupledPair(key, value)
+        new_pair = self._pair_type(key, value)
         if self._clashes(new_pair):
             self._update(key, value)
         else:
@@ -125,27 +807,43 @@ class BaseCoupledValues(object):
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
     def _remove_and_get_pair(self, key):
-        for pair in self._pairs:
-            if pair.has(key):
-                old_pair = pair
-                self._pairs.remove(pair)
-                return old_pair
+        pair = self._find_pair(key)
+        if pair is not None:
+            self._discard_pair(pair)
+            return pair
         if self._error_mode == ERROR_ON:
             raise KeyError(f"{key} does not exist in the set")
         else:
             return None
 
     def _remove_and_get_counterpart(self, key):
-        for pair in self._pairs:
-            if pair.has(key):
-                old_value = pair.counterpart(key)
-                self._pairs.remove(pair)
-                return old_value
+        pair = self._find_pair(key)
+        if pair is not None:
+            old_value = pair.counterpart(key)
+            self._discard_pair(pair)
+            return old_value
         if self._error_mode == ERROR_ON:
             raise KeyError(f"{key} does not exist in the set")
         else:
             return None
 
+    def _pop_many(self, keys, default=_MISSING):
+        find_pair = self._find_pair
+        for key in keys:
+            pair = find_pair(key)
+            if pair is None:
+                yield self._missing_value(key, default)
+            else:
+                old_value = pair.counterpart(key)
+                self._discard_pair(pair)
+                yield old_value
+
     def _clear(self):
+        if self._changed is not None:
+            for pair in self._pairs.values():
+                self._watch(pair, None)
+            self._changed.clear()
         self._pairs.clear()
+        self._index.clear()
+        self._unhashable_pairs.clear()
         return None
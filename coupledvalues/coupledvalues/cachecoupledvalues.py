@@ -0,0 +1,382 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from collections import OrderedDict
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import (
+    _flatten_pairs,
+    _MISSING,
+    _unflatten_pairs
+)
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "CacheCoupledValues"
+]
+
+
+def _restore_cache(cls, error_mode, max_size, ttl, firsts, seconds,
+                   pair_types):
+    new_cv = cls(error_mode=error_mode, max_size=max_size, ttl=ttl)
+    new_cv._insert_pairs(_unflatten_pairs(firsts, seconds, pair_types))
+    return new_cv
+
+
+class CacheCoupledValues(CoupledValues):
+    """
+    CoupledValues with a bounded size and optional expiry, for use as a
+    two-way cache such as session token <-> user handle.
+
+    When max_size is given, pushing a pair into a full set evicts the least
+    recently used pair. Looking up either value of a pair with get_value,
+    contains, get_many, contains_many or [], or updating it, makes it the most
+    recently used pair. The order is kept in an OrderedDict, so a lookup and
+    an eviction both take O(1) time.
+
+    When ttl is given, every pair expires ttl seconds after it was pushed or
+    last updated, and set_ttl gives a single pair a lifetime of its own.
+    Expired pairs are removed when they are looked up, and before new pairs
+    are pushed, using a heap of expiry times, so expiring takes O(log n)
+    amortised time per pair.
+
+    Lookups made on behalf of the user count as hits or misses, and missing
+    keys are handled according to error_mode as in CoupledValues. See
+    cache_info for the counters. Evicted and expired pairs are reported to
+    change feeds and snapshots of the set as popped pairs.
+
+    Example
+    -------
+
+        >>> sessions = CacheCoupledValues(max_size=2)
+        >>> sessions.push([("token-1", "ann"), ("token-2", "bob")])
+        >>> sessions["ann"]
+        'token-1'
+        >>> sessions.push(("token-3", "cid"))
+        >>> sessions.contains("bob")
+        False
+        >>> sessions.cache_info()["evictions"]
+        1
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    max_size: int, optional
+        Maximum number of pairs. If None, the size is not bounded
+
+    ttl: float, optional
+        Seconds after which pairs expire. If None, pairs do not expire unless
+        set_ttl is called for them
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    progress: callable, optional
+
+    clock: callable = time.monotonic
+        Returns the current time in seconds
+
+    Raises
+    ------
+    ValueError
+        If max_size is less than 1 or ttl is not positive
+
+    Returns
+    -------
+    CacheCoupledValues
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        init_values=[],
+        error_mode=ERROR_ON,
+        max_size=None,
+        ttl=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None,
+        clock=monotonic
+    ):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._recency = OrderedDict()
+        self._deadlines = {}
+        self._expiry_heap = []
+        self._expiry_counter = count()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        super().__init__(
+            init_values,
+            error_mode=error_mode,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+
+    def __reduce__(self):
+        # Pickled from the least to the most recently used pair, so that the
+        # order of eviction is kept. Expiry times start again on unpickling.
+        return _restore_cache, (
+            (type(self), self._error_mode, self._max_size, self._ttl)
+            + _flatten_pairs(self._recency.values())
+        )
+
+    def _new_empty(self):
+        return type(self)(
+            error_mode=self._error_mode,
+            max_size=self._max_size,
+            ttl=self._ttl,
+            clock=self._clock
+        )
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _insert_pair(self, pair):
+        self._expire()
+        super()._insert_pair(pair)
+        self._recency[id(pair)] = pair
+        if self._ttl is not None:
+            self._set_deadline(pair, self._ttl)
+        if self._max_size is not None:
+            while len(self._pairs) > self._max_size:
+                _, oldest_pair = self._recency.popitem(last=False)
+                self._drop_pair(oldest_pair)
+                self._evictions += 1
+        return None
+
+    def _insert_pairs(self, pairs):
+        for pair in pairs:
+            self._insert_pair(pair)
+        return None
+
+    def _discard_pair(self, pair):
+        # Pairs pushed earlier in the same push may already have been evicted
+        # when the push is rolled back
+        if self._pairs.get(id(pair)) is not pair:
+            return None
+        super()._discard_pair(pair)
+        self._recency.pop(id(pair), None)
+        self._deadlines.pop(id(pair), None)
+        return None
+
+    def _touch(self, pair):
+        self._recency.move_to_end(id(pair))
+        return None
+
+    def _set_deadline(self, pair, ttl):
+        if ttl is None:
+            self._deadlines.pop(id(pair), None)
+            return None
+        deadline = self._clock() + ttl
+        self._deadlines[id(pair)] = deadline
+        heappush(
+            self._expiry_heap, (deadline, next(self._expiry_counter), pair)
+        )
+        return None
+
+    def _is_expired(self, pair):
+        deadline = self._deadlines.get(id(pair))
+        return deadline is not None and deadline <= self._clock()
+
+    def _expire(self):
+        heap = self._expiry_heap
+        if not heap:
+            return 0
+        now = self._clock()
+        expired = 0
+        while heap and heap[0][0] <= now:
+            deadline, _, pair = heappop(heap)
+            # Entries of pairs that were removed or given a new deadline are
+            # left in the heap and skipped here
+            if (
+                self._pairs.get(id(pair)) is pair
+                and self._deadlines.get(id(pair)) == deadline
+            ):
+                self._drop_pair(pair)
+                expired += 1
+        self._expirations += expired
+        return expired
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ LOOKUP SECTION ~~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _find_pair(self, key):
+        pair = super()._find_pair(key)
+        if pair is not None and self._deadlines and self._is_expired(pair):
+            self._drop_pair(pair)
+            self._expirations += 1
+            return None
+        return pair
+
+    def _lookup(self, key):
+        pair = self._find_pair(key)
+        if pair is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._touch(pair)
+        return pair
+
+    def _contains(self, key):
+        return self._lookup(key) is not None
+
+    def _get_pair(self, key):
+        pair = self._lookup(key)
+        if pair is not None:
+            return pair
+        if self._error_mode == ERROR_ON:
+            raise KeyError(f"{key} does not exist in the set")
+        else:
+            return None
+
+    def _get_many(self, keys, default=_MISSING):
+        lookup = self._lookup
+        for key in keys:
+            pair = lookup(key)
+            if pair is None:
+                yield self._missing_value(key, default)
+            else:
+                yield pair.counterpart(key)
+
+    def _contains_many(self, keys):
+        lookup = self._lookup
+        for key in keys:
+            yield lookup(key) is not None
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~~ CACHE SECTION ~~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def cache_info(self):
+        """
+        Returns the counters of the cache: the number of lookups that found
+        their key (hits) or did not (misses), the number of pairs evicted to
+        stay within max_size (evictions) and the number of pairs that expired
+        (expirations), along with the current and maximum size.
+
+        Returns
+        -------
+        info: dict
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "size": len(self),
+            "max_size": self._max_size
+        }
+
+    def reset_cache_info(self):
+        """
+        Sets the hit, miss, eviction and expiration counters back to zero.
+
+        Returns
+        -------
+        None
+        """
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        return None
+
+    def set_ttl(self, key, ttl):
+        """
+        Makes the pair holding key expire ttl seconds from now, whatever the
+        ttl of the set is. The pair gets the ttl of the set again when it is
+        updated.
+
+        Parameters
+        ----------
+        key: object
+
+        ttl: float or None
+            Seconds until the pair expires, or None for it never to expire
+
+        Raises
+        ------
+        KeyError
+            If key does not exist and error_mode is ERROR_ON
+
+        ValueError
+            If ttl is not positive
+
+        Returns
+        -------
+        found: bool
+            Whether key was found
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        pair = self._find_pair(key)
+        if pair is None:
+            self._missing_value(key)
+            return False
+        self._set_deadline(pair, ttl)
+        return True
+
+    def expire(self):
+        """
+        Removes every pair that has expired now, instead of waiting for the
+        pairs to be looked up or for new pairs to be pushed.
+
+        Returns
+        -------
+        expired: int
+            Number of pairs removed
+        """
+        return self._expire()
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _update(self, key, value):
+        super()._update(key, value)
+        pair = super()._find_pair(key)
+        self._touch(pair)
+        self._set_deadline(pair, self._ttl)
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _clear(self):
+        super()._clear()
+        self._recency.clear()
+        self._deadlines.clear()
+        self._expiry_heap.clear()
+        return None
@@ -0,0 +1,461 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from contextlib import contextmanager
+from functools import wraps
+
+from coupledvalues.constants import *
+from coupledvalues.errors import *
+from coupledvalues.coupledvalues.hooks import _add_hooks, _remove_hooks
+
+__all__ = [
+    "ChangeFeed",
+    "receive_deltas",
+    "send_deltas"
+]
+
+
+_MISSING = object()
+
+# Methods of a BaseCoupledValues that change its contents, and that are wrapped
+# by a _MutationHook to report those changes.
+HOOKED_OPERATIONS = (
+    "_push_pair",
+    "_push_pairs",
+    "_push_pair_chunks",
+    "_update",
+    "_remove_and_get_pair",
+    "_remove_and_get_counterpart",
+    "_pop_many",
+    "_clear",
+    "_apply_transaction",
+    "_record_change",
+    "_drop_pair"
+)
+
+
+class _MutationHook(object):
+    """
+    Reports every change made to one BaseCoupledValues to its listeners, as
+    listener(operation, a, b, old) where operation is one of the DELTA_
+    constants. old holds the values of the pair as they were before a
+    DELTA_UPDATE or DELTA_POP, and the values of every pair that was in the
+    set before a DELTA_CLEAR. Like Instrumentation, it wraps the mutating
+    methods of that one set while it is attached, so sets without listeners
+    run exactly the same code as before.
+    """
+
+    def __init__(self, table):
+        self._table = table
+        # Replaced rather than changed in place, so that listeners can be
+        # removed while the hook is reporting a change
+        self._listeners = ()
+        self._depth = 0
+        # Pairs dropped by the set during the current call, and the values of
+        # the pairs dropped during the last call, which the wrapper of that
+        # call does not report again
+        self._dropped = []
+        self._lost = set()
+        self._tracking = False
+
+    def attach(self):
+        table = self._table
+        _add_hooks(table, self, {
+            name: getattr(self, name)
+            for name in HOOKED_OPERATIONS if hasattr(table, name)
+        })
+        # Pairs modified with CoupledPair.modify are reported through change
+        # tracking, so the pairs have to be watched by the wrapped
+        # _record_change
+        self._tracking = table._changed is not None
+        if self._tracking:
+            for pair in table._pairs.values():
+                table._watch(pair, table._record_change)
+        else:
+            table.enable_change_tracking()
+        return None
+
+    def detach(self):
+        table = self._table
+        _remove_hooks(table, self)
+        if self._tracking:
+            for pair in table._pairs.values():
+                table._watch(pair, table._record_change)
+        else:
+            table.disable_change_tracking()
+        return None
+
+    def _emit(self, operation, a=None, b=None, old=None):
+        # Methods that are called by other hooked methods are reported by the
+        # outermost call only
+        if self._depth:
+            return None
+        for listener in self._listeners:
+            listener(operation, a, b, old)
+        return None
+
+    def _emit_pushes(self, pairs):
+        for pair in pairs:
+            if _values_id(pair) not in self._lost:
+                self._emit(DELTA_PUSH, pair.first, pair.second)
+        return None
+
+    def _emit_drops(self, pairs):
+        # A pair of a weak IdentityCoupledValues is dropped once one of its
+        # values was collected, so it is popped by the other value
+        for pair in pairs:
+            key = pair.first if pair.first is not None else pair.second
+            self._emit(DELTA_POP, key, None, (pair.first, pair.second))
+        return None
+
+    def _call(self, method, *args, pushing=()):
+        # Pairs that the set drops by itself during the call are reported
+        # before the changes made by the call, even if the call fails. Pairs
+        # of pushing that are dropped before the call returns are not
+        # reported at all, as replicas never see them
+        if not self._depth:
+            self._lost = set()
+        self._depth += 1
+        try:
+            return method(*args)
+        finally:
+            self._depth -= 1
+            if not self._depth and self._dropped:
+                self._report_dropped(pushing)
+
+    def _report_dropped(self, pushing):
+        dropped, self._dropped = self._dropped, []
+        pushed = {_values_id(pair) for pair in pushing}
+        self._emit_drops(
+            pair for pair in dropped if _values_id(pair) not in pushed
+        )
+        self._lost = {_values_id(pair) for pair in dropped}
+        return None
+
+    def _values_of(self, key):
+        pair = self._table._find_pair(key)
+        if pair is None:
+            return None
+        return (pair.first, pair.second)
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ WRAPPERS SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _push_pair(self, method):
+        @wraps(method)
+        def wrapper(pair):
+            self._call(method, pair, pushing=(pair,))
+            self._emit_pushes((pair,))
+            return None
+        return wrapper
+
+    def _push_pairs(self, method):
+        @wraps(method)
+        def wrapper(pairs):
+            pairs = list(pairs)
+            self._call(method, pairs, pushing=pairs)
+            self._emit_pushes(pairs)
+            return None
+        return wrapper
+
+    def _push_pair_chunks(self, method):
+        # Chunks that were pushed are rolled back if a later chunk fails, so
+        # nothing is reported until every chunk is in
+        @wraps(method)
+        def wrapper(pairs, chunk_size, progress=None):
+            pairs = list(pairs)
+            pushed = self._call(
+                method, pairs, chunk_size, progress, pushing=pairs
+            )
+            self._emit_pushes(pushed)
+            return pushed
+        return wrapper
+
+    def _update(self, method):
+        @wraps(method)
+        def wrapper(key, value):
+            old = self._values_of(key)
+            self._call(method, key, value)
+            self._emit(DELTA_UPDATE, key, value, old)
+            return None
+        return wrapper
+
+    def _remove_and_get_pair(self, method):
+        @wraps(method)
+        def wrapper(key):
+            old = self._values_of(key)
+            removed = self._call(method, key)
+            if old is not None:
+                self._emit(DELTA_POP, key, None, old)
+            return removed
+        return wrapper
+
+    _remove_and_get_counterpart = _remove_and_get_pair
+
+    def _pop_many(self, method):
+        @wraps(method)
+        def wrapper(keys, default=_MISSING):
+            for key in keys:
+                old = self._values_of(key)
+                if default is _MISSING:
+                    values = self._call(list, method((key,)))
+                else:
+                    values = self._call(list, method((key,), default))
+                if old is not None:
+                    self._emit(DELTA_POP, key, None, old)
+                yield values[0]
+        return wrapper
+
+    def _clear(self, method):
+        table = self._table
+
+        @wraps(method)
+        def wrapper():
+            old = list(table._iterate_values())
+            self._call(method)
+            self._emit(DELTA_CLEAR, None, None, old)
+            return None
+        return wrapper
+
+    def _apply_transaction(self, method):
+        table = self._table
+
+        @wraps(method)
+        def wrapper(transaction):
+            # A ConcurrentCoupledValues releases its lock when method returns,
+            # so it is held here until the changes have been reported
+            with _holding(getattr(table, "lock", None)):
+                staged = list(transaction._staged.values())
+                self._call(method, transaction, pushing=staged)
+                self._emit_drops(
+                    pair for pair in transaction._replaced_pairs
+                    if _values_id(pair) not in self._lost
+                )
+                self._emit_pushes(staged)
+            return None
+        return wrapper
+
+    def _record_change(self, method):
+        # Pairs that the set modifies itself in _update are reported by the
+        # wrapped _update instead
+        @wraps(method)
+        def wrapper(pair, old_value, key):
+            self._call(method, pair, old_value, key)
+            value = pair.counterpart(key)
+            if pair.second is value:
+                old = (key, old_value)
+            else:
+                old = (old_value, key)
+            self._emit(DELTA_UPDATE, key, value, old)
+            return None
+        return wrapper
+
+    def _drop_pair(self, method):
+        # Pairs dropped while another hooked method runs are reported when it
+        # returns, as only then is it known whether they were just pushed
+        @wraps(method)
+        def wrapper(pair):
+            method(pair)
+            if self._depth:
+                self._dropped.append(pair)
+            else:
+                self._emit_drops((pair,))
+            return None
+        return wrapper
+
+
+def _values_id(pair):
+    return (id(pair.first), id(pair.second))
+
+
+@contextmanager
+def _holding(lock):
+    if lock is None:
+        yield None
+    else:
+        with lock.writing():
+            yield lock
+
+
+class ChangeFeed(object):
+    """
+    Ordered stream of the changes made to a BaseCoupledValues, used to keep
+    replicas of the set up to date without copying the whole set every time.
+    Use BaseCoupledValues.change_feed rather than creating one directly.
+
+    Every change is described by a delta record, a tuple of
+    (sequence, operation, a, b) where sequence counts up from 1 without gaps
+    and operation is one of:
+
+        DELTA_PUSH: the pair (a, b) was pushed
+        DELTA_UPDATE: the counterpart of a was set to b
+        DELTA_POP: the pair containing a was removed
+        DELTA_CLEAR: the set was cleared
+
+    Changes made by push, update, pop, clear, apply_batch, transactions and
+    CoupledPair.modify on pairs of the set are all reported. Records are kept
+    until they are taken with drain, unless a callback is given, in which
+    case every record is passed to the callback as soon as it is made.
+
+    Parameters
+    ----------
+    table: BaseCoupledValues
+
+    callback: callable, optional
+        Called as callback(delta) for every delta record
+
+    Returns
+    -------
+    ChangeFeed
+    """
+
+    def __init__(self, table, callback=None):
+        self._table = table
+        self._callback = callback
+        self._deltas = []
+        self.sequence = 0
+
+    def _on_change(self, operation, a, b, old):
+        self.sequence += 1
+        delta = (self.sequence, operation, a, b)
+        if self._callback is None:
+            self._deltas.append(delta)
+        else:
+            self._callback(delta)
+        return None
+
+    def drain(self):
+        """
+        Returns the delta records made since drain was last called, oldest
+        first, and forgets them.
+
+        Returns
+        -------
+        deltas: list of tuple
+        """
+        deltas = self._deltas
+        self._deltas = []
+        return deltas
+
+    def reset_delta(self):
+        """
+        Returns a DELTA_RESET record holding every pair of the set, that
+        brings a new or out of date replica to the state of the set at the
+        current sequence number. Records that are drained later follow on
+        from it. The record does not use up a sequence number of its own.
+
+        Returns
+        -------
+        delta: tuple
+            (sequence, DELTA_RESET, firsts, seconds)
+        """
+        firsts = []
+        seconds = []
+        for pair in self._table._iterate_pairs():
+            firsts.append(pair.first)
+            seconds.append(pair.second)
+        return (self.sequence, DELTA_RESET, firsts, seconds)
+
+    def close(self):
+        """
+        Stops recording changes. Records that were not drained yet are kept.
+
+        Returns
+        -------
+        None
+        """
+        self._table._remove_mutation_listener(self._on_change)
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return None
+
+
+def send_deltas(connection, deltas):
+    """
+    Sends a list of delta records through connection as a single message.
+    connection can be either end of multiprocessing.Pipe, or a connection
+    made with multiprocessing.connection.Client or Listener, including over a
+    local AF_UNIX socket.
+
+    Example
+    -------
+
+        >>> master_end, replica_end = multiprocessing.Pipe()
+        >>> feed = master.change_feed()
+        >>> send_deltas(master_end, [feed.reset_delta()])
+        >>> master.update("a", "c")
+        >>> send_deltas(master_end, feed.drain())
+
+    Parameters
+    ----------
+    connection: multiprocessing.connection.Connection
+
+    deltas: list of tuple
+
+    Returns
+    -------
+    None
+    """
+    deltas = list(deltas)
+    if deltas:
+        connection.send(deltas)
+    return None
+
+
+def receive_deltas(connection, replica, timeout=None):
+    """
+    Receives one message sent with send_deltas and applies its records to
+    replica with BaseCoupledValues.apply_deltas.
+
+    Parameters
+    ----------
+    connection: multiprocessing.connection.Connection
+
+    replica: BaseCoupledValues
+
+    timeout: float, optional
+        Seconds to wait for a message. If None, waits until one arrives
+
+    Raises
+    ------
+    EOFError
+        If the other end of connection was closed
+
+    SequenceGapError
+        If the records do not follow on from those applied before
+
+    Returns
+    -------
+    applied: int
+        Number of records applied, 0 if no message arrived before timeout
+    """
+    if timeout is not None and not connection.poll(timeout):
+        return 0
+    deltas = connection.recv()
+    replica.apply_deltas(deltas)
+    return len(deltas)
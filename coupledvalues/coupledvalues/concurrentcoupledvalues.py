@@ -0,0 +1,473 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import _MISSING
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "ConcurrentCoupledValues",
+    "ReadWriteLock"
+]
+
+
+class ReadWriteLock(object):
+    """
+    Lock that can be held by many readers at once or by a single writer.
+    Waiting writers are served before new readers so that a steady stream of
+    readers cannot starve them. Every acquire and release does its
+    bookkeeping in Python, so it only pays off when readers hold the lock
+    for long, for example around a loop of lookups that has to see the set
+    unchanged. See ConcurrentCoupledValues.
+
+    Both sides are re-entrant: a thread that holds the lock for reading may
+    acquire it for reading again, and a thread that holds it for writing may
+    acquire it again for either reading or writing. A thread that only holds
+    the lock for reading cannot acquire it for writing, as two threads doing
+    so would deadlock each other.
+
+    Example
+    -------
+
+        >>> lock = ReadWriteLock()
+        >>> with lock.reading():
+        ...     pass # Other readers may run here at the same time
+        >>> with lock.writing():
+        ...     pass # Nobody else holds the lock here
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._waiting_writers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._local = threading.local()
+
+    def acquire_read(self):
+        """
+        Blocks until the lock can be held for reading.
+
+        Returns
+        -------
+        None
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            local.counted = self._writer != threading.get_ident()
+            if local.counted:
+                with self._condition:
+                    while self._writer is not None or self._waiting_writers:
+                        self._condition.wait()
+                    self._readers += 1
+        local.depth = depth + 1
+        return None
+
+    def release_read(self):
+        """
+        Releases the lock held for reading.
+
+        Raises
+        ------
+        RuntimeError
+            If the current thread does not hold the lock for reading
+
+        Returns
+        -------
+        None
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            raise RuntimeError("cannot release a read lock that is not held")
+        local.depth = depth - 1
+        if depth == 1 and local.counted:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+        return None
+
+    def acquire_write(self):
+        """
+        Blocks until the lock can be held for writing.
+
+        Raises
+        ------
+        RuntimeError
+            If the current thread holds the lock for reading only
+
+        Returns
+        -------
+        None
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return None
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("cannot upgrade a read lock to a write lock")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+        return None
+
+    def release_write(self):
+        """
+        Releases the lock held for writing.
+
+        Raises
+        ------
+        RuntimeError
+            If the current thread does not hold the lock for writing
+
+        Returns
+        -------
+        None
+        """
+        if self._writer != threading.get_ident():
+            raise RuntimeError("cannot release a write lock that is not held")
+        self._write_depth -= 1
+        if self._write_depth == 0:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
+        return None
+
+    @contextmanager
+    def reading(self):
+        """
+        Context manager that holds the lock for reading.
+        """
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self):
+        """
+        Context manager that holds the lock for writing.
+        """
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+class _ExclusiveLock(object):
+    # Default lock of a ConcurrentCoupledValues, with the interface of
+    # ReadWriteLock. Readers and writers both hold one re-entrant lock, whose
+    # acquire and release run in C. Under the GIL, lookups cannot run in
+    # parallel anyway, so this is faster than counting readers
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.acquire_read = self.acquire_write = self._lock.acquire
+        self.release_read = self.release_write = self._lock.release
+
+    def reading(self):
+        return self._lock
+
+    def writing(self):
+        return self._lock
+
+
+def _reading(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.lock.release_read()
+    return wrapper
+
+
+def _writing(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.lock.release_write()
+    return wrapper
+
+
+class ConcurrentCoupledValues(CoupledValues):
+    """
+    CoupledValues that can be shared between threads. Lookups hold the lock
+    of the set for reading and methods that change the set hold it for
+    writing, so every public method, including update and pop, is atomic.
+
+    By default, readers hold the lock exclusively too: it is one re-entrant
+    lock that is acquired and released in C, so a lookup costs about as much
+    as one guarded by a plain threading.Lock. Lookups could not run in
+    parallel under the GIL anyway. Pass lock=ReadWriteLock() to let readers
+    hold the lock together, which is only worth its overhead when they hold
+    it for long, for example with lock.reading() around many lookups.
+
+    To make several calls atomic together, hold the lock for writing around
+    them:
+
+        >>> with my_cv.lock.writing():
+        ...     if "a" in my_cv:
+        ...         my_cv["a"] = my_cv.pop("b")
+
+    update_if and pop_if check the current counterpart of a key before changing
+    it, for the common compare-and-set case. apply_batch runs alone, and a
+    transaction holds the lock for writing while it is committed, but reads the
+    set without locking it while changes are staged.
+
+    Iterating over the pairs, for example through create_pairs, works on a copy
+    taken while holding the lock. Streaming get_many, contains_many and
+    pop_many calls are answered in full before they return. The
+    OverlayCoupledValues returned by temporary_push reads this set without
+    locking it.
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    progress: callable, optional
+
+    lock: ReadWriteLock, optional
+        Lock to hold instead of the default one
+
+    Returns
+    -------
+    ConcurrentCoupledValues
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        init_values=[],
+        error_mode=ERROR_ON,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None,
+        lock=None
+    ):
+        self.lock = _ExclusiveLock() if lock is None else lock
+        super().__init__(
+            init_values,
+            error_mode=error_mode,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+
+    push = _writing(CoupledValues.push)
+    temporary_push = _reading(CoupledValues.temporary_push)
+    intersection = _reading(CoupledValues.intersection)
+    difference = _reading(CoupledValues.difference)
+    symmetric_difference = _reading(CoupledValues.symmetric_difference)
+    merge = _reading(CoupledValues.merge)
+    compose = _reading(CoupledValues.compose)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    # The lookups and updates of single keys are written out instead of
+    # wrapped with _reading and _writing, as packing their arguments into
+    # *args and **kwargs costs more than taking the lock
+
+    def __len__(self):
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return CoupledValues.__len__(self)
+        finally:
+            lock.release_read()
+
+    def contains(self, key):
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return CoupledValues.contains(self, key)
+        finally:
+            lock.release_read()
+
+    def get_value(self, key):
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return CoupledValues.get_value(self, key)
+        finally:
+            lock.release_read()
+
+    contains.__doc__ = CoupledValues.contains.__doc__
+    get_value.__doc__ = CoupledValues.get_value.__doc__
+    to_str = _reading(CoupledValues.to_str)
+
+    # validate can rebuild the index, so it needs the lock for writing
+    validate = _writing(CoupledValues.validate)
+    enable_change_tracking = _writing(CoupledValues.enable_change_tracking)
+    disable_change_tracking = _writing(CoupledValues.disable_change_tracking)
+    change_feed = _writing(CoupledValues.change_feed)
+    snapshot = _writing(CoupledValues.snapshot)
+
+    def _iterate_pairs(self):
+        with self.lock.reading():
+            pairs = list(super()._iterate_pairs())
+        return iter(pairs)
+
+    def _iterate_values(self):
+        with self.lock.reading():
+            values = list(super()._iterate_values())
+        return iter(values)
+
+    def contains_many(self, keys, stream=False):
+        with self.lock.reading():
+            results = super().contains_many(keys)
+        if stream:
+            return iter(results)
+        return results
+
+    def get_many(self, keys, default=_MISSING, stream=False):
+        with self.lock.reading():
+            values = super().get_many(keys, default)
+        if stream:
+            return iter(values)
+        return values
+
+    contains_many.__doc__ = CoupledValues.contains_many.__doc__
+    get_many.__doc__ = CoupledValues.get_many.__doc__
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def update(self, key, value):
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return CoupledValues.update(self, key, value)
+        finally:
+            lock.release_write()
+
+    update.__doc__ = CoupledValues.update.__doc__
+    apply_batch = _writing(CoupledValues.apply_batch)
+    apply_deltas = _writing(CoupledValues.apply_deltas)
+    _apply_transaction = _writing(CoupledValues._apply_transaction)
+
+    def update_if(self, key, expected, value):
+        """
+        Atomically update the counterpart of key to value, but only if it is
+        currently expected.
+
+        Parameters
+        ----------
+        key: object
+
+        expected: object
+            The counterpart key must currently have
+
+        value: object
+
+        Raises
+        ------
+        ClashingError
+            If value is already in the set
+
+        Returns
+        -------
+        updated: bool
+            Whether the counterpart was expected and has been updated
+        """
+        with self.lock.writing():
+            pair = self._find_pair(key)
+            if pair is None or not pair.counterpart(key) == expected:
+                return False
+            self._update(key, value)
+            return True
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    clear = _writing(CoupledValues.clear)
+
+    def pop(self, key):
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return CoupledValues.pop(self, key)
+        finally:
+            lock.release_write()
+
+    pop.__doc__ = CoupledValues.pop.__doc__
+
+    def pop_if(self, key, expected):
+        """
+        Atomically pop the pair of key, but only if its counterpart is
+        currently expected.
+
+        Parameters
+        ----------
+        key: object
+
+        expected: object
+            The counterpart key must currently have
+
+        Returns
+        -------
+        popped: bool
+            Whether the counterpart was expected and the pair has been popped
+        """
+        with self.lock.writing():
+            pair = self._find_pair(key)
+            if pair is None or not pair.counterpart(key) == expected:
+                return False
+            # Goes through the same path as pop, so change feeds and
+            # snapshots see the pair being removed
+            self._remove_and_get_pair(key)
+            return True
+
+    def pop_many(self, keys, default=_MISSING, stream=False):
+        with self.lock.writing():
+            values = super().pop_many(keys, default)
+        if stream:
+            return iter(values)
+        return values
+
+    pop_many.__doc__ = CoupledValues.pop_many.__doc__
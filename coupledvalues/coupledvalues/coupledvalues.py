@@ -23,9 +23,14 @@
 #
 
 
+from itertools import islice
+
 from coupledpairs import *
 from coupledvalues.constants import *
-from coupledvalues.coupledvalues.basecoupledvalues import BaseCoupledValues
+from coupledvalues.coupledvalues.basecoupledvalues import (
+    _MISSING,
+    BaseCoupledValues
+)
 from coupledvalues.errors import *
 
 __all__ = [
@@ -34,7 +39,7 @@ __all__ = [
 ]
 
 
-def create_pairs(values):
+def create_pairs(values, pair_type=CoupledPair):
     """
     Functions like make_pairs but also accepts BaseCoupledValues and its
     descendents.
@@ -45,21 +50,30 @@ def create_pairs(values):
 
     Parameters
     ----------
-    value: CoupledPair, list, set, tuple or dict, BaseCoupledValues
+    value: CoupledPair, list, set, tuple, dict, iterable or BaseCoupledValues
+
+    pair_type: type = CoupledPair
+        CoupledPair or one of its subclasses, such as FrozenCoupledPair
 
     Returns
     -------
-    list of CoupledPair
+    list of pair_type
     """
-    if type(values) in {CoupledPair, list, set, tuple, dict}:
-        return make_pairs(values)
-    elif isinstance(values, BaseCoupledValues):
-        return list(values._pairs)
-    else:
-        raise TypeError(
-            "values must be an instance of BaseCoupledValues, CoupledPairs, "
-            + "list, tuple or dict"
-        )
+    return list(_iterate_created_pairs(values, pair_type))
+
+
+def _as_coupled_values(values):
+    if isinstance(values, BaseCoupledValues):
+        return values
+    return CoupledValues(values)
+
+
+def _iterate_created_pairs(values, pair_type=CoupledPair):
+    if isinstance(values, BaseCoupledValues):
+        # New pairs are created so that modifying a pair in one set cannot
+        # change the pairs of another set behind its back
+        return iterate_pairs(values._iterate_values(), pair_type)
+    return iterate_pairs(values, pair_type)
 
 
 class CoupledValues(BaseCoupledValues):
@@ -73,7 +87,11 @@ class CoupledValues(BaseCoupledValues):
 
     Parameters
     ----------
-    init_values: CoupledPair, list, set, tuple or dict, BaseCoupledValues
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+        Generators and other iterables, such as a csv.reader, are accepted.
+        They are read, checked for clashes and added chunk_size pairs at a
+        time
 
     error_mode: str = ERROR_ON
         Whether to show error or a placeholder value when running certain
@@ -81,6 +99,12 @@ class CoupledValues(BaseCoupledValues):
             coupledvalues.ERROR_ON,
             coupledvalues.ERROR_OFF
 
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+        Number of pairs read, checked and added at a time
+
+    progress: callable, optional
+        Called with the number of pairs added so far after every chunk
+
     Raises
     ------
     TypeError
@@ -95,15 +119,24 @@ class CoupledValues(BaseCoupledValues):
     CoupledValues
     """
 
+    # Maximum number of pairs shown by repr() and str()
+    repr_max_items = DEFAULT_REPR_ITEMS
+
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
     def __init__(
         self,
         init_values=[],
-        error_mode=ERROR_ON
+        error_mode=ERROR_ON,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None
     ):
         super().__init__(error_mode=error_mode)
-        self._push_pairs(create_pairs(init_values))
+        self._push_pair_chunks(
+            _iterate_created_pairs(init_values, self._pair_type),
+            chunk_size,
+            progress
+        )
 
     # - ## ~~~~~~~~~~~~~~~~~ TEMPORARY PUSH SECTION ~~~~~~~~~~~~~~~~~ ##
 
@@ -117,6 +150,11 @@ class CoupledValues(BaseCoupledValues):
         """
         Makes a new CoupledValues object with self and another valid set of
         pairs acceptable to create_pairs.
+
+        The new set is an OverlayCoupledValues that shares the pairs of self
+        instead of copying them, so only the new pairs are validated and
+        stored. Use OverlayCoupledValues.materialize to turn it into an
+        independent CoupledValues.
         
         Parameters
         ----------
@@ -127,15 +165,339 @@ class CoupledValues(BaseCoupledValues):
         ClashingError
             If two of the pairs clash
 
+        Returns
+        -------
+        new_cv: OverlayCoupledValues
+        """
+        from coupledvalues.coupledvalues.overlaycoupledvalues import (
+            OverlayCoupledValues
+        )
+        return OverlayCoupledValues(
+            self, pairs, error_mode=self._error_mode
+        )
+
+    # - ## ~~~~~~~~~~~~~~~~~ SET OPERATIONS SECTION ~~~~~~~~~~~~~~~~~ ##
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __xor__(self, other):
+        return self.symmetric_difference(other)
+
+    def _new_empty(self):
+        return type(self)(error_mode=self._error_mode)
+
+    def union(self, other):
+        """
+        Makes a new set with the pairs of self and the pairs of other. Same as
+        merge(other, MERGE_RAISE), and as self | other.
+
+        Parameters
+        ----------
+        other: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
+        Raises
+        ------
+        ClashingError
+            If a pair of other clashes with a different pair of self. All the
+            clashing values are listed
+
+        Returns
+        -------
+        new_cv: CoupledValues
+        """
+        return self.merge(other, MERGE_RAISE)
+
+    def intersection(self, other):
+        """
+        Makes a new set with the pairs of self that are also in other, in the
+        order of self. Pairs are compared with CoupledPair.is_similar_to, so
+        the order of the values in a pair does not matter. Same as
+        self & other.
+
+        Example
+        -------
+
+            >>> CoupledValues({"a": "b", "c": "d"}) & {"b": "a", "c": "e"}
+            CoupledValues([('a', 'b')])
+
+        Parameters
+        ----------
+        other: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
         Returns
         -------
         new_cv: CoupledValues
         """
-        new_cv = CoupledValues()
-        new_cv._push_pairs(create_pairs(self))
-        new_cv._push_pairs(create_pairs(pairs))
+        other = _as_coupled_values(other)
+        new_cv = self._new_empty()
+        new_cv._insert_pairs(
+            pair.copy() for pair in self._iterate_pairs() if other._has(pair)
+        )
         return new_cv
 
+    def difference(self, other):
+        """
+        Makes a new set with the pairs of self that are not in other. Same as
+        self - other.
+
+        Example
+        -------
+
+            >>> CoupledValues({"a": "b", "c": "d"}) - {"b": "a", "c": "e"}
+            CoupledValues([('c', 'd')])
+
+        Parameters
+        ----------
+        other: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
+        Returns
+        -------
+        new_cv: CoupledValues
+        """
+        other = _as_coupled_values(other)
+        new_cv = self._new_empty()
+        new_cv._insert_pairs(
+            pair.copy()
+            for pair in self._iterate_pairs()
+            if not other._has(pair)
+        )
+        return new_cv
+
+    def symmetric_difference(self, other):
+        """
+        Makes a new set with the pairs that are in either self or other, but
+        not in both. Same as self ^ other.
+
+        Parameters
+        ----------
+        other: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
+        Raises
+        ------
+        ClashingError
+            If a pair only in self clashes with a pair only in other, such as
+            ("a", "b") and ("a", "c"). All the clashing values are listed
+
+        Returns
+        -------
+        new_cv: CoupledValues
+        """
+        other = _as_coupled_values(other)
+        new_cv = self._new_empty()
+        new_cv._push_pairs(
+            [
+                pair.copy()
+                for pair in self._iterate_pairs()
+                if not other._has(pair)
+            ]
+            + [
+                pair.copy()
+                for pair in other._iterate_pairs()
+                if not self._has(pair)
+            ]
+        )
+        return new_cv
+
+    def merge(self, other, policy=MERGE_RAISE):
+        """
+        Makes a new set with the pairs of self and the pairs of other, in time
+        proportional to the size of both. A pair of other conflicts with self
+        if it shares a value with a different pair of self, and policy decides
+        what happens then:
+
+            MERGE_RAISE       raise a ClashingError listing every clashing
+                              value
+            MERGE_KEEP_LEFT   keep the pairs of self and skip the pair of
+                              other
+            MERGE_KEEP_RIGHT  replace the pairs of self with the pair of
+                              other
+            MERGE_COLLECT     keep the pairs of self, and also return the
+                              conflicts
+
+        Example
+        -------
+
+            >>> left = CoupledValues({"a": "b", "c": "d"})
+            >>> left.merge({"a": "z", "e": "f"}, MERGE_KEEP_RIGHT)
+            CoupledValues([('c', 'd'), ('a', 'z'), ('e', 'f')])
+            >>> merged, conflicts = left.merge({"a": "z"}, MERGE_COLLECT)
+            >>> conflicts
+            [(CoupledPair('a', 'b'), CoupledPair('a', 'z'))]
+
+        Parameters
+        ----------
+        other: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
+        policy: str = MERGE_RAISE
+            MERGE_RAISE, MERGE_KEEP_LEFT, MERGE_KEEP_RIGHT or MERGE_COLLECT
+
+        Raises
+        ------
+        ValueError
+            If policy is not one of the values above
+
+        ClashingError
+            If policy is MERGE_RAISE and a pair of other conflicts with self
+
+        Returns
+        -------
+        new_cv: CoupledValues
+            The merged set
+
+        conflicts: list of tuple of CoupledPair
+            Only returned if policy is MERGE_COLLECT. A (pair of self, pair of
+            other) tuple for every conflict
+        """
+        if policy not in {
+            MERGE_RAISE, MERGE_KEEP_LEFT, MERGE_KEEP_RIGHT, MERGE_COLLECT
+        }:
+            raise ValueError(
+                "policy must be MERGE_RAISE, MERGE_KEEP_LEFT, MERGE_KEEP_RIGHT "
+                + "or MERGE_COLLECT"
+            )
+        other = _as_coupled_values(other)
+        new_cv = self._new_empty()
+        new_cv._insert_pairs(pair.copy() for pair in self._iterate_pairs())
+        clashing_values = []
+        conflicts = []
+        for pair in other._iterate_pairs():
+            # Pairs of other are stored the way new_cv stores its own pairs
+            pair = new_cv._convert_pair(pair.copy())
+            if new_cv._has(pair):
+                continue
+            left_pairs = []
+            for value in (pair.first, pair.second):
+                left_pair = new_cv._find_pair(value)
+                if left_pair is None:
+                    continue
+                if policy == MERGE_RAISE:
+                    clashing_values.append(value)
+                if not any(left_pair.is_similar_to(p) for p in left_pairs):
+                    left_pairs.append(left_pair)
+            if not left_pairs:
+                new_cv._insert_pair(pair)
+            elif policy == MERGE_KEEP_RIGHT:
+                for left_pair in left_pairs:
+                    new_cv._discard_pair(left_pair)
+                new_cv._insert_pair(pair)
+            elif policy == MERGE_COLLECT:
+                conflicts.extend(
+                    (left_pair.copy(), pair.copy()) for left_pair in left_pairs
+                )
+        if clashing_values:
+            raise ClashingError.from_values(clashing_values)
+        if policy == MERGE_COLLECT:
+            return new_cv, conflicts
+        return new_cv
+
+    @staticmethod
+    def _check_compose_options(how, side):
+        if how not in {JOIN_INNER, JOIN_OUTER}:
+            raise ValueError("how must be JOIN_INNER or JOIN_OUTER")
+        if side not in {SIDE_FIRST, SIDE_SECOND}:
+            raise ValueError("side must be SIDE_FIRST or SIDE_SECOND")
+        return None
+
+    def compose(self, other, how=JOIN_INNER, side=SIDE_SECOND):
+        """
+        Joins two sets into one, in a single pass over self: for every pair
+        (a, b) of self whose value b is in a pair (b, c) of other, the new set
+        has the pair (a, c). For example, joining internal ids <-> vendor ids
+        with vendor ids <-> vendor SKUs gives internal ids <-> vendor SKUs.
+
+        Example
+        -------
+
+            >>> ids = CoupledValues({1: "v-1", 2: "v-2"})
+            >>> skus = CoupledValues({"SKU-A": "v-1"})
+            >>> ids.compose(skus)
+            CoupledValues([(1, 'SKU-A')])
+            >>> composed, left, right = ids.compose(skus, JOIN_OUTER)
+            >>> left
+            [CoupledPair(2, 'v-2')]
+
+        Parameters
+        ----------
+        other: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
+        how: str = JOIN_INNER
+            JOIN_INNER to only return the new set, or JOIN_OUTER to also return
+            the pairs of self and of other that had no match
+
+        side: str = SIDE_SECOND
+            Which value of the pairs of self is looked up in other. With
+            SIDE_FIRST, the pair (a, b) of self is joined on a and gives
+            (b, c)
+
+        Raises
+        ------
+        ValueError
+            If how or side is not one of the values above, or if a new pair
+            would hold the same value twice
+
+        ClashingError
+            If a value of self would end up in the same new set as an equal
+            value of other
+
+        Returns
+        -------
+        new_cv: CoupledValues
+            The composed set. If both sets are of the same class, such as two
+            NumericCoupledValues, new_cv is of that class too
+
+        unmatched_self: list of CoupledPair
+            Only returned with JOIN_OUTER. The pairs of self with no match
+
+        unmatched_other: list of CoupledPair
+            Only returned with JOIN_OUTER. The pairs of other with no match
+        """
+        self._check_compose_options(how, side)
+        other = _as_coupled_values(other)
+        if type(self) is type(other):
+            new_cv = self._new_empty()
+        else:
+            new_cv = CoupledValues(error_mode=self._error_mode)
+        composed_pairs = []
+        unmatched_self = []
+        matched_other = BaseCoupledValues()
+        for pair in self._iterate_pairs():
+            if side == SIDE_SECOND:
+                kept, joined = pair.first, pair.second
+            else:
+                kept, joined = pair.second, pair.first
+            other_pair = other._find_pair(joined)
+            if other_pair is None:
+                if how == JOIN_OUTER:
+                    unmatched_self.append(pair.copy())
+                continue
+            composed_pairs.append(
+                new_cv._pair_type(kept, other_pair.counterpart(joined))
+            )
+            if how == JOIN_OUTER:
+                matched_other._insert_pair(other_pair)
+        new_cv._push_pairs(composed_pairs)
+        if how == JOIN_INNER:
+            return new_cv
+        unmatched_other = [
+            pair.copy()
+            for pair in other._iterate_pairs()
+            if not matched_other._has(pair)
+        ]
+        return new_cv, unmatched_self, unmatched_other
+
     # - ## ~~~~~~~~~~~~~~~~~ PERMANENT PUSH SECTION ~~~~~~~~~~~~~~~~~ ##
 
     def __iadd__(self, pairs):
@@ -150,24 +512,48 @@ class CoupledValues(BaseCoupledValues):
         self.push(pairs)
         return self
 
-    def push(self, pairs):
+    def push(self, pairs, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
         """
-        Push new pairs into the set.
+        Push new pairs into the set. The pairs can come from any iterable,
+        such as a generator, and are read, checked for clashes and added
+        chunk_size pairs at a time, so only one chunk is held in memory
+        besides the set. If any of the pairs clash or cannot be read, or if
+        progress raises, the chunks that were already added are removed again,
+        leaving the set unchanged.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues()
+            >>> with open("ids.csv", newline="") as fh:
+            ...     my_cv.push(csv.reader(fh), progress=print)
 
         Parameters
         ----------
-        pairs: CoupledPair, list, set, tuple or dict, BaseCoupledValues
+        pairs: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+            Number of pairs read, checked and added at a time
+
+        progress: callable, optional
+            Called with the number of pairs pushed so far after every chunk
 
         Raises
         ------
         ClashingError
-            If two of the pairs clash
+            If two of the pairs clash. Every clashing value is listed in
+            ClashingError.values
 
         Returns
         -------
         None
         """
-        self._push_pairs(create_pairs(pairs))
+        self._push_pair_chunks(
+            _iterate_created_pairs(pairs, self._pair_type),
+            chunk_size,
+            progress
+        )
         return None
 
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
@@ -179,10 +565,10 @@ class CoupledValues(BaseCoupledValues):
         return self.get_value(key)
 
     def __repr__(self):
-        return self.to_str()
+        return self.to_str(self.repr_max_items)
 
     def __str__(self):
-        return self.to_str()
+        return self.to_str(self.repr_max_items)
 
     def contains(self, key):
         """
@@ -198,6 +584,34 @@ class CoupledValues(BaseCoupledValues):
         """
         return self._contains(key)
 
+    def contains_many(self, keys, stream=False):
+        """
+        Checks if each key in keys is in one of the pairs in the CoupledValues
+        object.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": "b"})
+            >>> my_cv.contains_many(["a", "z", "b"])
+            [True, False, True]
+
+        Parameters
+        ----------
+        keys: iterable of object
+
+        stream: bool = False
+            If True, return a generator instead of a list
+
+        Returns
+        -------
+        exists: list or generator of bool
+        """
+        results = self._contains_many(keys)
+        if stream:
+            return results
+        return list(results)
+
     def get_value(self, key):
         """
         Get the value of one of the items in a pair with the value of its
@@ -232,20 +646,118 @@ class CoupledValues(BaseCoupledValues):
             return None
         return pair.counterpart(key)
 
-    def to_str(self):
+    def get_many(self, keys, default=_MISSING, stream=False):
         """
-        Converts CoupledValues to string.
+        Get the counterparts of many keys at once. This is faster than calling
+        get_value on every key.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": "b", "c": "d"})
+            >>> my_cv.get_many(["a", "d", "z"], default="?")
+            ['b', 'c', '?']
+
+        Parameters
+        ----------
+        keys: iterable of object
+
+        default: object, optional
+            Returned for keys that do not exist. If not given, missing keys are
+            handled according to error_mode
+
+        stream: bool = False
+            If True, return a generator that looks up the keys as it is
+            consumed instead of a list
+
+        Raises
+        ------
+        KeyError
+            If a key does not exist, default is not given and error_mode is
+            ERROR_ON
+
+        Returns
+        -------
+        values: list or generator of object
+        """
+        values = self._get_many(keys, default)
+        if stream:
+            return values
+        return list(values)
+
+    def to_str(self, max_items=None):
+        """
+        Converts CoupledValues to string. repr() and str() show at most
+        repr_max_items pairs, which is DEFAULT_REPR_ITEMS unless changed on the
+        class or the object.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": "b", "c": "d", "e": "f"})
+            >>> my_cv.to_str(max_items=2)
+            "CoupledValues([('a', 'b'), ('c', 'd'), ... 1 more])"
+
+        Parameters
+        ----------
+        max_items: int, optional
+            The number of pairs to show before the rest are summarised as
+            "... N more". All pairs are shown if it is None
 
         Returns
         -------
         string
         """
-        string = "CoupledValues(["
-        for pair in self._pairs:
-            string += pair.to_mini_str() + ", "
-        string = string[:-2]
-        string += "])"
-        return string
+        return "".join(self._iterate_str_parts(max_items))
+
+    def write_to(self, fp, max_items=None):
+        """
+        Writes the same text as to_str to a file object, a few pairs at a time,
+        so that large sets can be written out without building the whole string
+        in memory.
+
+        Example
+        -------
+
+            >>> with open("table.txt", "w") as fp:
+            ...     my_cv.write_to(fp)
+
+        Parameters
+        ----------
+        fp: file object
+            Any object with a write method that accepts str
+
+        max_items: int, optional
+            See to_str
+
+        Returns
+        -------
+        None
+        """
+        parts = self._iterate_str_parts(max_items)
+        while True:
+            chunk = "".join(islice(parts, 1024))
+            if not chunk:
+                break
+            fp.write(chunk)
+        return None
+
+    def _iterate_str_parts(self, max_items=None):
+        yield "CoupledValues(["
+        pairs = self._iterate_pairs()
+        if max_items is not None:
+            pairs = islice(pairs, max_items)
+        shown = 0
+        for pair in pairs:
+            if shown:
+                yield ", "
+            yield pair.to_mini_str()
+            shown += 1
+        if max_items is not None and len(self) > shown:
+            if shown:
+                yield ", "
+            yield f"... {len(self) - shown} more"
+        yield "])"
 
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
@@ -279,6 +791,92 @@ class CoupledValues(BaseCoupledValues):
         self._add_or_update(key, value)
         return None
 
+    # - ## ~~~~~~~~~~~~~~~~~~~~ TRANSACTION SECTION ~~~~~~~~~~~~~~~~~~~~ ##
+
+    def transaction(self):
+        """
+        Starts a Transaction that stages updates, pushes and pops and applies
+        them all at once when it is committed. The pairs only have to be valid
+        after the last change, so values can be swapped between pairs or
+        renamed in chains. See Transaction for more information.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": 1, "b": 2})
+            >>> with my_cv.transaction() as batch:
+            ...     batch["a"] = 2
+            ...     batch["b"] = 1
+            >>> my_cv
+            CoupledValues([('a', 2), ('b', 1)])
+
+        Returns
+        -------
+        transaction: Transaction
+        """
+        from coupledvalues.coupledvalues.transaction import Transaction
+        return Transaction(self)
+
+    def apply_batch(self, operations):
+        """
+        Applies many operations at once, atomically. Each operation is a tuple
+        of the name of a method and its arguments:
+
+            ("update", key, value)
+            ("push", pairs)
+            ("pop", key)
+
+        Either every operation is applied or, if the final pairs would clash or
+        an operation fails, none of them is.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": 1, "b": 2})
+            >>> my_cv.apply_batch([("pop", "a"), ("update", "b", 1)])
+            [1]
+            >>> my_cv
+            CoupledValues([('b', 1)])
+
+        Parameters
+        ----------
+        operations: iterable of tuple
+
+        Raises
+        ------
+        ValueError
+            If an operation is not "update", "push" or "pop", or if key == value
+            in an update
+
+        KeyError
+            If a key to pop does not exist and error_mode is ERROR_ON
+
+        ClashingError
+            If a value would be in more than one pair
+
+        Returns
+        -------
+        popped_values: list
+            The values returned by the "pop" operations, in order
+        """
+        popped_values = []
+        with self.transaction() as batch:
+            for operation in operations:
+                name, arguments = operation[0], operation[1:]
+                if name == "update":
+                    batch.update(*arguments)
+                elif name == "push":
+                    batch.push(*arguments)
+                elif name == "pop":
+                    popped_values.append(batch.pop(*arguments))
+                else:
+                    raise ValueError(f"unknown batch operation {name!r}")
+        return popped_values
+
+    def _apply_transaction(self, transaction):
+        transaction._apply()
+        return None
+
     ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
 
     def clear(self):
@@ -310,3 +908,34 @@ class CoupledValues(BaseCoupledValues):
             Popped value, None if key not found and error_mode is ERROR_OFF
         """
         return self._remove_and_get_counterpart(key)
+
+    def pop_many(self, keys, default=_MISSING, stream=False):
+        """
+        Pops the pairs of many keys at once and returns their values.
+
+        Parameters
+        ----------
+        keys: iterable of object
+
+        default: object, optional
+            Returned for keys that do not exist. If not given, missing keys are
+            handled according to error_mode
+
+        stream: bool = False
+            If True, return a generator that pops the pairs as it is consumed
+            instead of a list
+
+        Raises
+        ------
+        KeyError
+            If a key does not exist, default is not given and error_mode is
+            ERROR_ON. Pairs popped before the missing key stay popped
+
+        Returns
+        -------
+        values: list or generator of object
+        """
+        values = self._pop_many(keys, default)
+        if stream:
+            return values
+        return list(values)
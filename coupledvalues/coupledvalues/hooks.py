@@ -0,0 +1,95 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+__all__ = []
+
+
+class _MethodHooks(object):
+    """
+    Wraps methods of one BaseCoupledValues for the features that need to see
+    its calls, such as Instrumentation and _MutationHook. Every feature adds
+    its own layer of wrappers and only ever removes that layer. The wrapped
+    methods are rebuilt from the methods of the class whenever a layer is
+    added or removed, so features can be attached and detached in any order
+    without restoring wrappers that belong to another feature.
+    """
+
+    def __init__(self, table):
+        self._table = table
+        # (owner, wrappers) for every layer, innermost first, where wrappers
+        # maps the name of a method to a function that wraps it
+        self._layers = []
+
+    def add(self, owner, wrappers):
+        self._layers.append((owner, wrappers))
+        self._rebuild(wrappers)
+        return None
+
+    def remove(self, owner):
+        names = set()
+        layers = []
+        for layer in self._layers:
+            if layer[0] is owner:
+                names.update(layer[1])
+            else:
+                layers.append(layer)
+        self._layers = layers
+        self._rebuild(names)
+        return None
+
+    def _rebuild(self, names):
+        table = self._table
+        for name in names:
+            table.__dict__.pop(name, None)
+            method = getattr(table, name, None)
+            if method is None:
+                continue
+            wrapped = False
+            for _, wrappers in self._layers:
+                wrap = wrappers.get(name)
+                if wrap is not None:
+                    method = wrap(method)
+                    wrapped = True
+            if wrapped:
+                setattr(table, name, method)
+        return None
+
+
+def _add_hooks(table, owner, wrappers):
+    # Wraps methods of table with wrappers, as a layer that belongs to owner
+    if table._method_hooks is None:
+        table._method_hooks = _MethodHooks(table)
+    table._method_hooks.add(owner, wrappers)
+    return None
+
+
+def _remove_hooks(table, owner):
+    # Removes the wrappers that owner added, and no others
+    hooks = table._method_hooks
+    if hooks is None:
+        return None
+    hooks.remove(owner)
+    if not hooks._layers:
+        table._method_hooks = None
+    return None
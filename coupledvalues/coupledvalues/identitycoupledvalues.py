@@ -0,0 +1,253 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import weakref
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import (
+    _flatten_pairs,
+    _restore_pairs
+)
+from coupledvalues.coupledvalues.keyedcoupledvalues import KeyedCoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "IdentityCoupledValues"
+]
+
+
+class _WeakIdentityPair(IdentityCoupledPair):
+    """
+    IdentityCoupledPair that only holds weak references to its values. A value
+    that has been garbage collected reads as None. callback is called with
+    the weak reference when either value is collected.
+    """
+
+    __slots__ = ("_first_ref", "_second_ref", "_callback", "__weakref__")
+
+    def __init__(self, first, second, callback=None):
+        self._callback = callback
+        super().__init__(first, second)
+
+    def __reduce__(self):
+        return IdentityCoupledPair, (self.first, self.second)
+
+    def _get_first(self):
+        return self._first_ref()
+
+    def _set_first(self, value):
+        self._first_ref = weakref.ref(value, self._callback)
+
+    def _get_second(self):
+        return self._second_ref()
+
+    def _set_second(self, value):
+        self._second_ref = weakref.ref(value, self._callback)
+
+    first = property(_get_first, _set_first)
+    second = property(_get_second, _set_second)
+
+
+class IdentityCoupledValues(KeyedCoupledValues):
+    """
+    CoupledValues that tells values apart by identity instead of equality, for
+    values that are expensive to compare or cannot be compared with ==, such
+    as dataframes or ORM entities. Values are indexed by id(), so looking up
+    any object takes O(1) time without ever calling __eq__ or __hash__ on it,
+    and two equal but distinct objects can be in different pairs. The pairs
+    are IdentityCoupledPair objects. This is a KeyedCoupledValues with id() as
+    its key function.
+
+    With weak=True, the set only holds weak references to the values, and a
+    pair is removed as soon as either of its values is garbage collected, so
+    the set never keeps objects alive on its own. Every value must then
+    support weak references, which rules out int, str and tuple, among
+    others. Pairs removed in this way are reported to change feeds and
+    snapshots of the set as popped pairs, with None in place of the value
+    that was collected. Such a set cannot be pickled.
+
+    Transactions and set operations still compare values with ==.
+
+    Example
+    -------
+
+        >>> frames = [pandas.DataFrame({"x": [i]}) for i in range(2)]
+        >>> names = IdentityCoupledValues(
+        ...     [(frames[0], "first"), (frames[1], "second")], weak=True
+        ... )
+        >>> names[frames[1]]
+        'second'
+        >>> del frames[0]
+        >>> len(names)
+        1
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    weak: bool = False
+        Whether to only hold weak references to the values
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    progress: callable, optional
+
+    Raises
+    ------
+    TypeError
+        If weak is True and a value does not support weak references
+
+    Returns
+    -------
+    IdentityCoupledValues
+    """
+
+    _pair_type = IdentityCoupledPair
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        init_values=[],
+        error_mode=ERROR_ON,
+        weak=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None
+    ):
+        self._weak = weak
+        self._collected = []
+        super().__init__(
+            init_values,
+            error_mode=error_mode,
+            key_func=id,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+
+    def __reduce__(self):
+        if self._weak:
+            raise TypeError("an IdentityCoupledValues with weak=True cannot "
+                            "be pickled")
+        return _restore_pairs, (
+            (type(self), self._error_mode)
+            + _flatten_pairs(self._iterate_pairs())
+        )
+
+    def _new_empty(self):
+        return type(self)(error_mode=self._error_mode, weak=self._weak)
+
+    def _convert_pair(self, pair):
+        if not self._weak:
+            if isinstance(pair, IdentityCoupledPair):
+                return pair
+            return IdentityCoupledPair(pair.first, pair.second)
+        collected = self._collected
+        pair_id = []
+
+        def callback(ref):
+            # Runs while the value is being collected, possibly in the middle
+            # of another operation on the set, so the pair is only queued for
+            # removal here
+            if pair_id:
+                collected.append(pair_id[0])
+        new_pair = _WeakIdentityPair(pair.first, pair.second, callback)
+        pair_id.append(id(new_pair))
+        return new_pair
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _remove_collected(self):
+        collected = self._collected
+        while collected:
+            pair = self._pairs.get(collected.pop())
+            if pair is not None and (pair.first is None or pair.second is None):
+                self._drop_pair(pair)
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __len__(self):
+        if self._collected:
+            self._remove_collected()
+        return len(self._pairs)
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ LOOKUP SECTION ~~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _find_pair(self, key):
+        if self._collected:
+            self._remove_collected()
+        pair = self._index.get(id(key))
+        if pair is not None and pair.has(key):
+            return pair
+        return None
+
+    def _lookup_cost(self, key):
+        # 1 probe of the index by id, then an identity check of each value
+        # of the pair found until one is key
+        pair = self._index.get(id(key))
+        if pair is None:
+            return 1, 0
+        return 1, 1 if pair.first is key else 2
+
+    def _iterate_pairs(self):
+        if self._collected:
+            self._remove_collected()
+        return iter(list(self._pairs.values()))
+
+    def _iterate_values(self):
+        return (
+            (pair.first, pair.second) for pair in self._iterate_pairs()
+        )
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _update(self, key, value):
+        if key is value:
+            raise ValueError("key cannot be the same as value")
+        pair = self._find_pair(key)
+        if pair is None:
+            raise KeyError(f"{type(key).__name__} object does not exist in "
+                           "the set")
+        if self._find_pair(value) is not None:
+            raise ClashingError(f"{type(value).__name__} object is already "
+                                "in the set.")
+        self._unindex_pair(pair)
+        try:
+            pair.modify(key, value)
+        finally:
+            self._index_pair(pair)
+            if self._changed is not None:
+                self._changed.pop(id(pair), None)
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _clear(self):
+        super()._clear()
+        del self._collected[:]
+        return None
@@ -0,0 +1,261 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+from functools import wraps
+from time import perf_counter
+
+from coupledvalues.coupledvalues.hooks import _add_hooks, _remove_hooks
+
+__all__ = [
+    "Instrumentation",
+    "OperationStats"
+]
+
+
+# Operations that are instrumented, by the name of the BaseCoupledValues method
+# that implements them. Lookups are instrumented as well, as the operation
+# find_pair for lookups of one key and find_many for lookups of many keys at
+# once, through the methods that the storage of the set names in
+# _lookup_methods and _bulk_lookup_methods.
+INSTRUMENTED_OPERATIONS = (
+    "_get_pair",
+    "_clashes",
+    "_find_clashes",
+    "_push_pair",
+    "_push_pairs",
+    "_update",
+    "_remove_and_get_pair",
+    "_remove_and_get_counterpart"
+)
+
+# Latencies are counted in buckets whose upper bounds are powers of two
+# nanoseconds, up to about 17 seconds.
+HISTOGRAM_BUCKETS = 35
+
+
+class OperationStats(object):
+    """
+    Counters for one instrumented operation: the number of calls, the time
+    spent in them, the number of index probes and equality comparisons they
+    made, and a histogram of their latencies.
+
+    Probes and comparisons are counted by the storage backend of the set,
+    which knows how its own lookups work: a hash index, a binary search of
+    sorted keys or the slots of a mapped file. See
+    BaseCoupledValues._lookup_cost. Every operation is charged with the
+    lookups it makes, including those made by the operations it calls.
+    """
+
+    __slots__ = (
+        "calls",
+        "seconds",
+        "probes",
+        "comparisons",
+        "histogram"
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.probes = 0
+        self.comparisons = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, seconds, probes=0, comparisons=0):
+        """
+        Adds one call to the counters.
+
+        Parameters
+        ----------
+        seconds: float
+
+        probes: int = 0
+
+        comparisons: int = 0
+
+        Returns
+        -------
+        None
+        """
+        self.calls += 1
+        self.seconds += seconds
+        self.probes += probes
+        self.comparisons += comparisons
+        bucket = int(seconds * 1e9).bit_length()
+        self.histogram[min(bucket, HISTOGRAM_BUCKETS - 1)] += 1
+        return None
+
+    def snapshot(self):
+        """
+        Returns the counters as a dict. The histogram maps the upper bound of
+        each non-empty bucket, in seconds, to the number of calls in it.
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "mean_seconds": self.seconds / self.calls if self.calls else 0.0,
+            "probes": self.probes,
+            "comparisons": self.comparisons,
+            "histogram": {
+                2 ** bucket / 1e9: count
+                for bucket, count in enumerate(self.histogram)
+                if count
+            }
+        }
+
+
+class Instrumentation(object):
+    """
+    Records statistics about the hot paths of a BaseCoupledValues. Attaching
+    it wraps the instrumented methods of that one set with timed wrappers,
+    and the lookup methods of its storage with timed wrappers that also count
+    their probes and comparisons. Detaching it removes only those wrappers
+    again, so sets that are not instrumented run exactly the same code as
+    before. Use
+    BaseCoupledValues.enable_stats rather than creating one directly.
+
+    Parameters
+    ----------
+    table: BaseCoupledValues
+
+    callback: callable, optional
+        Called as callback(operation, seconds, probes, comparisons) after
+        every instrumented call, where operation is the name of the method
+        without its leading underscore
+
+    Returns
+    -------
+    Instrumentation
+    """
+
+    def __init__(self, table, callback=None):
+        self._table = table
+        self._callback = callback
+        self._operations = {}
+        self._probes = 0
+        self._comparisons = 0
+        # Time spent counting lookups, which is left out of the timings
+        self._overhead = 0.0
+        self._counting = False
+
+    def attach(self):
+        table = self._table
+        wrappers = {}
+        for name in INSTRUMENTED_OPERATIONS:
+            operation = name.lstrip("_")
+            self._operations[operation] = OperationStats()
+            wrappers[name] = self._wrapper_for(operation)
+        self._operations["find_pair"] = OperationStats()
+        for name in table._lookup_methods:
+            wrappers[name] = self._lookup_wrapper_for(
+                "find_pair", table._lookup_cost
+            )
+        if table._bulk_lookup_methods:
+            self._operations["find_many"] = OperationStats()
+        for name in table._bulk_lookup_methods:
+            wrappers[name] = self._lookup_wrapper_for(
+                "find_many", table._bulk_lookup_cost
+            )
+        _add_hooks(table, self, wrappers)
+        return None
+
+    def detach(self):
+        # Wrappers added by a change feed or snapshot stay in place
+        _remove_hooks(self._table, self)
+        return None
+
+    def reset(self):
+        for operation in self._operations:
+            self._operations[operation] = OperationStats()
+        return None
+
+    def snapshot(self):
+        return {
+            operation: stats.snapshot()
+            for operation, stats in self._operations.items()
+        }
+
+    def _wrapper_for(self, operation):
+        def wrap(method):
+            return self._wrap(operation, method)
+        return wrap
+
+    def _lookup_wrapper_for(self, operation, cost):
+        def wrap(method):
+            return self._wrap_lookup(operation, cost, method)
+        return wrap
+
+    def _wrap(self, operation, method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            probes_before = self._probes
+            comparisons_before = self._comparisons
+            overhead_before = self._overhead
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = (
+                    perf_counter() - start
+                    - (self._overhead - overhead_before)
+                )
+                probes = self._probes - probes_before
+                comparisons = self._comparisons - comparisons_before
+                self._operations[operation].record(
+                    seconds, probes, comparisons
+                )
+                if self._callback is not None:
+                    self._callback(operation, seconds, probes, comparisons)
+        return wrapper
+
+    def _wrap_lookup(self, operation, cost, method):
+        # The cost is worked out before the lookup runs, from the same state.
+        # Lookups made by another lookup, such as the lookups of single keys
+        # that a batch lookup falls back on, are already part of it
+        def counted(keys):
+            start = perf_counter()
+            probes, comparisons = cost(keys)
+            self._probes += probes
+            self._comparisons += comparisons
+            self._overhead += perf_counter() - start
+            self._counting = True
+            try:
+                return method(keys)
+            finally:
+                self._counting = False
+
+        timed = self._wrap(operation, counted)
+
+        @wraps(method)
+        def wrapper(keys):
+            if self._counting:
+                return method(keys)
+            return timed(keys)
+        return wrapper
@@ -0,0 +1,280 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import (
+    _flatten_pairs,
+    _unflatten_pairs
+)
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "KeyedCoupledValues"
+]
+
+
+def _restore_keyed(cls, error_mode, key_func, firsts, seconds, pair_types):
+    new_cv = cls(error_mode=error_mode, key_func=key_func)
+    new_cv._insert_pairs(
+        new_cv._convert_pair(pair)
+        for pair in _unflatten_pairs(firsts, seconds, CoupledPair)
+    )
+    return new_cv
+
+
+class KeyedCoupledValues(CoupledValues):
+    """
+    CoupledValues that indexes every value by a canonical key computed with
+    key_func, while still storing and returning the original values. Two
+    values with the same key are treated as the same value, so a pair can be
+    looked up with any value that has the same key as one of its values.
+
+    This gives O(1) lookups for values that cannot be hashed, such as lists
+    and dicts, which CoupledValues otherwise has to find by comparing them
+    with every such value in the set, as well as lookups that ignore
+    differences such as case or whitespace. coupledpairs.freeze_value and
+    coupledpairs.normalize_text are ready-made key functions for these two
+    cases. The pairs are KeyedCoupledPair objects.
+
+    key_func must return a hashable key, and must give the same key for a
+    value for as long as the value is in the set. To be pickled, the set
+    needs a key_func that can be pickled, such as a function defined at the
+    top level of a module.
+
+    Example
+    -------
+
+        >>> users = KeyedCoupledValues(
+        ...     {"Alice Smith": "u-1"}, key_func=normalize_text
+        ... )
+        >>> users["alice  SMITH"]
+        'u-1'
+        >>> users["u-1"]
+        'Alice Smith'
+        >>> routes = KeyedCoupledValues(key_func=freeze_value)
+        >>> routes.push((["home", "docs"], "/home/docs"))
+        >>> routes[["home", "docs"]]
+        '/home/docs'
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    key_func: callable
+        Returns the canonical key of a value
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    progress: callable, optional
+
+    Raises
+    ------
+    TypeError
+        If key_func is not callable, or if it returns a key that cannot be
+        hashed
+
+    Returns
+    -------
+    KeyedCoupledValues
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        init_values=[],
+        error_mode=ERROR_ON,
+        key_func=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None
+    ):
+        if not callable(key_func):
+            raise TypeError("key_func must be callable")
+        self._index_key = key_func
+        self._keys = {}
+        super().__init__(
+            init_values,
+            error_mode=error_mode,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+
+    def __reduce__(self):
+        return _restore_keyed, (
+            (type(self), self._error_mode, self._index_key)
+            + _flatten_pairs(self._iterate_pairs())
+        )
+
+    def _new_empty(self):
+        return type(self)(
+            error_mode=self._error_mode, key_func=self._index_key
+        )
+
+    def _convert_pair(self, pair):
+        if (
+            isinstance(pair, KeyedCoupledPair)
+            and pair.key_func is self._index_key
+        ):
+            new_pair = pair
+        else:
+            new_pair = KeyedCoupledPair(
+                pair.first, pair.second, self._index_key
+            )
+        # Checked before anything is changed, so that a key that cannot be
+        # hashed leaves the set as it was
+        hash(self._index_key(new_pair.first))
+        hash(self._index_key(new_pair.second))
+        return new_pair
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _index_pair(self, pair):
+        keys = (self._index_key(pair.first), self._index_key(pair.second))
+        self._index[keys[0]] = pair
+        self._index[keys[1]] = pair
+        self._keys[id(pair)] = keys
+        return None
+
+    def _unindex_pair(self, pair):
+        # The keys are kept from when the pair was indexed, as the values of
+        # the pair may have changed since
+        for key in self._keys.pop(id(pair), ()):
+            if self._index.get(key) is pair:
+                del self._index[key]
+        return None
+
+    def _reindex(self):
+        self._index.clear()
+        self._keys.clear()
+        for pair in self._pairs.values():
+            self._index_pair(pair)
+        return None
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ LOOKUP SECTION ~~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _find_pair(self, key):
+        try:
+            return self._index.get(self._index_key(key))
+        except TypeError:
+            # A key that cannot be hashed cannot be in the set
+            return None
+
+    def _lookup_cost(self, key):
+        # 1 probe of the index by the key of key, with 1 comparison if it
+        # holds that key
+        try:
+            return 1, int(self._index_key(key) in self._index)
+        except TypeError:
+            return 0, 0
+
+    # - ## ~~~~~~~~~~~~~~~~~~~ VALIDATION SECTION ~~~~~~~~~~~~~~~~~~~ ##
+
+    def _unique_keys(self, values):
+        seen = set()
+        result = []
+        for value in values:
+            key = self._index_key(value)
+            if key not in seen:
+                seen.add(key)
+                result.append(value)
+        return result
+
+    def _find_clashes(self, pairs):
+        seen = set()
+        clashing_values = []
+        for pair in pairs:
+            for value in (pair.first, pair.second):
+                key = self._index_key(value)
+                if key in seen or self._find_pair(value) is not None:
+                    clashing_values.append(value)
+                seen.add(key)
+        return self._unique_keys(clashing_values)
+
+    def _find_duplicates(self):
+        seen = set()
+        duplicates = []
+        for first, second in self._iterate_values():
+            for value in (first, second):
+                key = self._index_key(value)
+                if key in seen:
+                    duplicates.append(value)
+                seen.add(key)
+        return self._unique_keys(duplicates)
+
+    def _validate_changed(self):
+        changed = self._changed
+        self._changed = {}
+        duplicates = []
+        for pair, _ in changed.values():
+            if id(pair) not in self._pairs:
+                continue
+            self._unindex_pair(pair)
+            keys = []
+            for value in (pair.first, pair.second):
+                other_pair = self._find_pair(value)
+                if other_pair is not None and other_pair is not pair:
+                    duplicates.append(value)
+                    continue
+                key = self._index_key(value)
+                self._index[key] = pair
+                keys.append(key)
+            self._keys[id(pair)] = tuple(keys)
+            if len(keys) < 2:
+                # Kept as changed so that it is reported until fixed
+                self._changed[id(pair)] = (pair, [])
+        return self._unique_keys(duplicates)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _update(self, key, value):
+        if self._index_key(key) == self._index_key(value):
+            raise ValueError("key cannot be the same as value")
+        pair = self._find_pair(key)
+        if pair is None:
+            raise KeyError(f"{key} does not exist in the set")
+        if self._find_pair(value) is not None:
+            raise ClashingError(f"{value} is already in the set.")
+        hash(self._index_key(value))
+        self._unindex_pair(pair)
+        try:
+            pair.modify(key, value)
+        finally:
+            self._index_pair(pair)
+            # The set keeps its own index up to date, so the pair only needs
+            # to be validated again if it is modified outside of the set
+            if self._changed is not None:
+                self._changed.pop(id(pair), None)
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _clear(self):
+        super()._clear()
+        self._keys.clear()
+        return None
@@ -0,0 +1,427 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import hashlib
+import mmap
+import struct
+from array import array
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import BaseCoupledValues
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "MappedCoupledValues",
+    "open_mapped",
+    "save_mapped"
+]
+
+
+### ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ FILE FORMAT ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+#
+# A mapped file is made of four sections, all little-endian:
+#
+#   header  magic, format version, number of pairs, number of hash table
+#           slots and the offsets of the other three sections
+#   pairs   for every pair, the heap offsets of its first and second value
+#   table   open-addressing hash table with linear probing. Every slot holds
+#           the 64-bit hash of a value and a reference to it, which is
+#           pair_index * 2 + side + 1, or 0 if the slot is empty
+#   heap    the values themselves, each stored as a type tag, a length and
+#           the encoded value
+#
+# Values are hashed with BLAKE2b instead of hash() so the hashes stay the same
+# across processes. Numbers that compare equal in Python, such as 1, 1.0 and
+# True, are hashed the same way so that any of them can be used as the key.
+
+_MAGIC = b"CPLDMAP\x00"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIxxxxQQQQQ")
+_PAIR = struct.Struct("<QQ")
+_SLOT = struct.Struct("<QQ")
+_ENTRY = struct.Struct("<BI")
+
+_TAG_NONE = 0
+_TAG_BOOL = 1
+_TAG_INT = 2
+_TAG_FLOAT = 3
+_TAG_STR = 4
+_TAG_BYTES = 5
+
+_FLOAT = struct.Struct("<d")
+
+
+def _int_to_bytes(value):
+    return value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+
+
+def _encode(value):
+    if value is None:
+        return _TAG_NONE, b""
+    elif isinstance(value, bool):
+        return _TAG_BOOL, bytes([value])
+    elif isinstance(value, int):
+        return _TAG_INT, _int_to_bytes(value)
+    elif isinstance(value, float):
+        return _TAG_FLOAT, _FLOAT.pack(value)
+    elif isinstance(value, str):
+        return _TAG_STR, value.encode("utf-8")
+    elif isinstance(value, bytes):
+        return _TAG_BYTES, value
+    raise TypeError(
+        "mapped files can only hold None, bool, int, float, str or bytes, "
+        + f"not {type(value).__name__}"
+    )
+
+
+def _decode(tag, payload):
+    if tag == _TAG_NONE:
+        return None
+    elif tag == _TAG_BOOL:
+        return bool(payload[0])
+    elif tag == _TAG_INT:
+        return int.from_bytes(payload, "little", signed=True)
+    elif tag == _TAG_FLOAT:
+        return _FLOAT.unpack(payload)[0]
+    elif tag == _TAG_STR:
+        return str(payload, "utf-8")
+    else:
+        return bytes(payload)
+
+
+def _hash_key(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (bool, int)):
+        canonical = b"\x02" + _int_to_bytes(int(value))
+    else:
+        try:
+            tag, payload = _encode(value)
+        except TypeError:
+            return None
+        canonical = bytes([tag]) + payload
+    digest = hashlib.blake2b(canonical, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _table_size(count):
+    size = 8
+    while size < count * 4:
+        size *= 2
+    return size
+
+
+### ~~~~~~~~~~~~~~~~~~~~~~~~~~ GENERAL FUNCTIONS ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+def save_mapped(values, path):
+    """
+    Writes a CoupledValues set to a file that can be opened with open_mapped.
+    The file contains a hash index of all the values, so it can be used without
+    reading it into memory first.
+
+    Example
+    -------
+
+        >>> save_mapped(CoupledValues({"a": "b"}), "table.cpv")
+        >>> with open_mapped("table.cpv") as table:
+        ...     print(table["b"])
+        a
+
+    Parameters
+    ----------
+    values: BaseCoupledValues
+
+    path: str or path-like
+
+    Raises
+    ------
+    TypeError
+        If values is not a BaseCoupledValues, or if one of its values is not
+        None, a bool, an int, a float, a str or bytes
+
+    Returns
+    -------
+    None
+    """
+    if not isinstance(values, BaseCoupledValues):
+        raise TypeError("values must be an instance of BaseCoupledValues")
+    pair_offsets = array("Q")
+    heap = bytearray()
+    hashes = []
+    for first, second in values._iterate_values():
+        for value in (first, second):
+            tag, payload = _encode(value)
+            pair_offsets.append(len(heap))
+            heap += _ENTRY.pack(tag, len(payload))
+            heap += payload
+            hashes.append(_hash_key(value))
+    count = len(hashes) // 2
+    size = _table_size(count)
+    table = array("Q", bytes(_SLOT.size * size))
+    mask = size - 1
+    for reference, value_hash in enumerate(hashes, 1):
+        slot = value_hash & mask
+        while table[slot * 2 + 1]:
+            slot = (slot + 1) & mask
+        table[slot * 2] = value_hash
+        table[slot * 2 + 1] = reference
+    pairs_offset = _HEADER.size
+    table_offset = pairs_offset + _PAIR.size * count
+    heap_offset = table_offset + _SLOT.size * size
+    if pair_offsets.itemsize != 8 or table.itemsize != 8:
+        raise RuntimeError("array('Q') must hold 64-bit integers")
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        pair_offsets.byteswap()
+        table.byteswap()
+    with open(path, "wb") as fh:
+        fh.write(_HEADER.pack(
+            _MAGIC, _VERSION, count, size,
+            pairs_offset, table_offset, heap_offset
+        ))
+        fh.write(pair_offsets.tobytes())
+        fh.write(table.tobytes())
+        fh.write(heap)
+    return None
+
+
+def open_mapped(path, error_mode=ERROR_ON):
+    """
+    Opens a file written by save_mapped as a read-only MappedCoupledValues.
+
+    Parameters
+    ----------
+    path: str or path-like
+
+    error_mode: str = ERROR_ON
+
+    Raises
+    ------
+    ValueError
+        If the file is not a mapped CoupledValues file
+
+    Returns
+    -------
+    MappedCoupledValues
+    """
+    return MappedCoupledValues(path, error_mode=error_mode)
+
+
+class MappedCoupledValues(CoupledValues):
+    """
+    Read-only CoupledValues backed by a memory-mapped file written by
+    save_mapped. Nothing is read from the file up front: lookups hash the key,
+    probe the hash table in the file and decode only the values they need, so
+    opening a file is instant and every process that opens the same file shares
+    one copy of it in the page cache.
+
+    Pushing, updating, popping and clearing raise TypeError. To change a mapped
+    set, use temporary_push, which layers a writable OverlayCoupledValues on top
+    of it, or copy it into a CoupledValues.
+
+    MappedCoupledValues can be used as a context manager, which closes the file
+    on exit.
+
+    Parameters
+    ----------
+    path: str or path-like
+
+    error_mode: str = ERROR_ON
+
+    Raises
+    ------
+    ValueError
+        If the file is not a mapped CoupledValues file
+
+    Returns
+    -------
+    MappedCoupledValues
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(self, path, error_mode=ERROR_ON):
+        BaseCoupledValues.__init__(self, error_mode=error_mode)
+        self._path = path
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = _HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self._map.close()
+            raise ValueError(f"{path} is not a mapped CoupledValues file")
+        if header[0] != _MAGIC or header[1] != _VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a mapped CoupledValues file")
+        (
+            self._count,
+            self._size,
+            self._pairs_offset,
+            self._table_offset,
+            self._heap_offset
+        ) = header[2:]
+
+    def __reduce__(self):
+        # Only the path is pickled. The file is mapped again when unpickled,
+        # so it must be readable at the same path by the receiving process.
+        return type(self), (self._path, self._error_mode)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return None
+
+    def close(self):
+        """
+        Closes the mapped file. The set cannot be used afterwards.
+
+        Returns
+        -------
+        None
+        """
+        self._map.close()
+        return None
+
+    def _new_empty(self):
+        return CoupledValues(error_mode=self._error_mode)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("MappedCoupledValues is read-only")
+
+    _insert_pair = _read_only
+    _insert_pairs = _read_only
+    _discard_pair = _read_only
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __len__(self):
+        return self._count
+
+    def _value_at(self, reference):
+        offset = _PAIR.unpack_from(
+            self._map, self._pairs_offset + ((reference - 1) >> 1) * _PAIR.size
+        )[(reference - 1) & 1] + self._heap_offset
+        tag, length = _ENTRY.unpack_from(self._map, offset)
+        start = offset + _ENTRY.size
+        return _decode(tag, self._map[start:start + length])
+
+    def _find_reference(self, key):
+        key_hash = _hash_key(key)
+        if key_hash is None:
+            return None
+        mask = self._size - 1
+        slot = key_hash & mask
+        while True:
+            slot_hash, reference = _SLOT.unpack_from(
+                self._map, self._table_offset + slot * _SLOT.size
+            )
+            if not reference:
+                return None
+            if slot_hash == key_hash and self._value_at(reference) == key:
+                return reference
+            slot = (slot + 1) & mask
+
+    _lookup_methods = ("_find_reference",)
+
+    def _lookup_cost(self, key):
+        # 1 probe for every slot of the hash table read, and 1 comparison
+        # for every value read because its hash matches
+        key_hash = _hash_key(key)
+        if key_hash is None:
+            return 0, 0
+        mask = self._size - 1
+        slot = key_hash & mask
+        probes = comparisons = 0
+        while True:
+            probes += 1
+            slot_hash, reference = _SLOT.unpack_from(
+                self._map, self._table_offset + slot * _SLOT.size
+            )
+            if not reference:
+                return probes, comparisons
+            if slot_hash == key_hash:
+                comparisons += 1
+                if self._value_at(reference) == key:
+                    return probes, comparisons
+            slot = (slot + 1) & mask
+
+    def _find_pair(self, key):
+        reference = self._find_reference(key)
+        if reference is None:
+            return None
+        first_reference = ((reference - 1) & ~1) + 1
+        return CoupledPair(
+            self._value_at(first_reference),
+            self._value_at(first_reference + 1)
+        )
+
+    def _contains(self, key):
+        return self._find_reference(key) is not None
+
+    def _iterate_pairs(self):
+        for first, second in self._iterate_values():
+            yield CoupledPair(first, second)
+
+    def _iterate_values(self):
+        for index in range(self._count):
+            yield (
+                self._value_at(index * 2 + 1),
+                self._value_at(index * 2 + 2)
+            )
+
+    def get_value(self, key):
+        """
+        Get the value of one of the items in a pair with the value of its
+        counterpart, reading only that value from the mapped file.
+
+        Parameters
+        ----------
+        key: object
+
+        Raises
+        ------
+        KeyError
+            If the key does not exist in the set and error_mode is ERROR_ON
+
+        Returns
+        -------
+        value: object
+        """
+        reference = self._find_reference(key)
+        if reference is None:
+            return self._missing_value(key)
+        return self._value_at(((reference - 1) ^ 1) + 1)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    _update = _read_only
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    _clear = _read_only
@@ -0,0 +1,739 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import _MISSING
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "NumericCoupledValues"
+]
+
+
+_INITIAL_CAPACITY = 16
+_MIN_PENDING = 1024
+_OVERFLOW_MESSAGE = "NumericCoupledValues only accepts 64-bit integers"
+
+
+def _as_int64(key):
+    try:
+        key = operator.index(key)
+    except TypeError:
+        return None
+    if not -2 ** 63 <= key < 2 ** 63:
+        return None
+    return key
+
+
+def _to_int64(value):
+    try:
+        value = operator.index(value)
+    except TypeError:
+        raise TypeError("NumericCoupledValues only accepts integers")
+    if not -2 ** 63 <= value < 2 ** 63:
+        raise OverflowError(_OVERFLOW_MESSAGE)
+    return value
+
+
+def _restore_numeric(cls, firsts, seconds, error_mode, missing):
+    new_cv = cls(error_mode=error_mode, missing=missing)
+    new_cv._append_rows(firsts, seconds)
+    return new_cv
+
+
+def _is_batch(key):
+    return isinstance(key, (list, np.ndarray))
+
+
+class NumericCoupledValues(CoupledValues):
+    """
+    CoupledValues for pairs of 64-bit integers, backed by NumPy. Instead of
+    keeping a CoupledPair for every pair, the two sides of all pairs are kept in
+    two contiguous int64 arrays, and the values are indexed by a sorted array
+    that is searched with numpy.searchsorted. Values added since the sorted
+    index was last built are kept in a small dictionary until there are enough
+    of them to make rebuilding the sorted index worthwhile.
+
+    get_value and contains also accept a list or NumPy array of keys and look
+    all of them up in a single vectorised call. When error_mode is ERROR_OFF,
+    keys that are missing are replaced by missing in the returned array, or
+    masked out if missing is None.
+
+    NumPy must be installed to use NumericCoupledValues.
+
+    Example
+    -------
+
+        >>> ids = NumericCoupledValues({10: 1000, 11: 1001, 12: 1002})
+        >>> ids.get_value(numpy.array([1001, 10]))
+        array([  11, 1000])
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple or dict, BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    missing: int or None = None
+        Value used in place of missing keys in arrays returned by get_value
+        when error_mode is ERROR_OFF. If None, a numpy.ma.MaskedArray is
+        returned instead, with the missing keys masked.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed
+
+    TypeError
+        If any of the values is not an integer
+
+    OverflowError
+        If any of the values does not fit in a 64-bit signed integer
+
+    Returns
+    -------
+    NumericCoupledValues
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        init_values=[],
+        error_mode=ERROR_ON,
+        missing=None
+    ):
+        if np is None:
+            raise ImportError("NumericCoupledValues requires numpy")
+        self._missing = missing
+        self._reset_columns()
+        super().__init__(init_values, error_mode=error_mode)
+
+    def __reduce__(self):
+        alive = self._alive[:self._rows]
+        return _restore_numeric, (
+            type(self),
+            self._firsts[:self._rows][alive],
+            self._seconds[:self._rows][alive],
+            self._error_mode,
+            self._missing
+        )
+
+    @classmethod
+    def from_arrays(cls, firsts, seconds, error_mode=ERROR_ON, missing=None):
+        """
+        Create a NumericCoupledValues from two arrays holding the first and
+        second values of every pair, without creating any CoupledPair.
+
+        Parameters
+        ----------
+        firsts: array-like of int
+
+        seconds: array-like of int
+
+        error_mode: str = ERROR_ON
+
+        missing: int or None = None
+
+        Raises
+        ------
+        ValueError
+            If firsts and seconds do not have the same length, or if both
+            values of a pair are the same
+
+        ClashingError
+            If two of the pairs clash
+
+        TypeError
+            If any of the values is not an integer
+
+        OverflowError
+            If any of the values does not fit in a 64-bit signed integer
+
+        Returns
+        -------
+        new_cv: NumericCoupledValues
+        """
+        new_cv = cls(error_mode=error_mode, missing=missing)
+        new_cv._push_arrays(firsts, seconds)
+        return new_cv
+
+    def _new_empty(self):
+        return type(self)(error_mode=self._error_mode, missing=self._missing)
+
+    def compose(self, other, how=JOIN_INNER, side=SIDE_SECOND):
+        if not isinstance(other, NumericCoupledValues):
+            return super().compose(other, how, side)
+        self._check_compose_options(how, side)
+        alive = self._alive[:self._rows]
+        firsts = self._firsts[:self._rows][alive]
+        seconds = self._seconds[:self._rows][alive]
+        if side == SIDE_SECOND:
+            kept, joined = firsts, seconds
+        else:
+            kept, joined = seconds, firsts
+        slots = other._find_slots(joined)
+        found = slots >= 0
+        other_rows = slots[found] >> 1
+        counterparts = np.where(
+            slots[found] & 1,
+            other._firsts[other_rows],
+            other._seconds[other_rows]
+        )
+        new_cv = self._new_empty()
+        new_cv._push_arrays(kept[found], counterparts)
+        if how == JOIN_INNER:
+            return new_cv
+        unmatched_self = [
+            CoupledPair(first, second)
+            for first, second in zip(
+                firsts[~found].tolist(), seconds[~found].tolist()
+            )
+        ]
+        unmatched = other._alive[:other._rows].copy()
+        unmatched[other_rows] = False
+        unmatched_other = [
+            CoupledPair(first, second)
+            for first, second in zip(
+                other._firsts[:other._rows][unmatched].tolist(),
+                other._seconds[:other._rows][unmatched].tolist()
+            )
+        ]
+        return new_cv, unmatched_self, unmatched_other
+
+    compose.__doc__ = CoupledValues.compose.__doc__
+
+    def _reset_columns(self):
+        self._firsts = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._seconds = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+        self._rows = 0
+        self._count = 0
+        self._sorted_keys = np.empty(0, dtype=np.int64)
+        self._sorted_slots = np.empty(0, dtype=np.int64)
+        self._pending = {}
+        self._pending_arrays = None
+        return None
+
+    def _reserve(self, extra):
+        needed = self._rows + extra
+        capacity = len(self._firsts)
+        if needed <= capacity:
+            return None
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_firsts", "_seconds", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._rows] = old[:self._rows]
+            setattr(self, name, new)
+        return None
+
+    def _push_arrays(self, firsts, seconds):
+        firsts = self._to_column(firsts)
+        seconds = self._to_column(seconds)
+        if len(firsts) != len(seconds):
+            raise ValueError("firsts and seconds must have the same length")
+        if np.any(firsts == seconds):
+            raise ValueError("pair values cannot be the same")
+        clashing_values = self._find_array_clashes(
+            np.concatenate((firsts, seconds))
+        )
+        if clashing_values:
+            raise ClashingError.from_values(clashing_values)
+        self._append_rows(firsts, seconds)
+        return None
+
+    def _push_pairs(self, pairs):
+        pairs = list(pairs)
+        self._push_arrays(
+            [pair.first for pair in pairs],
+            [pair.second for pair in pairs]
+        )
+        return None
+
+    @staticmethod
+    def _to_column(values):
+        column = np.asarray(values)
+        if column.size == 0:
+            return np.empty(0, dtype=np.int64)
+        kind = column.dtype.kind
+        if kind == "f" and not isinstance(values, np.ndarray):
+            # A list that mixes int64 values with larger integers is read as
+            # floats, so it is checked value by value instead
+            column = np.asarray(values, dtype=object)
+            kind = "O"
+        values = column
+        if kind == "O":
+            # Python integers too large for int64 end up in an object array
+            return np.array(
+                [_to_int64(value) for value in values.ravel().tolist()],
+                dtype=np.int64
+            )
+        if kind not in "biu":
+            raise TypeError("NumericCoupledValues only accepts integers")
+        if kind == "u" and values.max() > np.iinfo(np.int64).max:
+            raise OverflowError(_OVERFLOW_MESSAGE)
+        return values.astype(np.int64).ravel()
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _insert_pair(self, pair):
+        self._insert_pairs([pair])
+        return None
+
+    def _insert_pairs(self, pairs):
+        pairs = list(pairs)
+        self._append_rows(
+            self._to_column([pair.first for pair in pairs]),
+            self._to_column([pair.second for pair in pairs])
+        )
+        return None
+
+    def _append_rows(self, firsts, seconds):
+        start = self._rows
+        self._reserve(len(firsts))
+        stop = start + len(firsts)
+        self._firsts[start:stop] = firsts
+        self._seconds[start:stop] = seconds
+        self._alive[start:stop] = True
+        self._rows = stop
+        self._count += len(firsts)
+        if self._needs_rebuild(2 * len(firsts)):
+            self._rebuild_index()
+            return None
+        slots = np.arange(start, stop, dtype=np.int64) * 2
+        self._pending.update(
+            zip(self._firsts[start:stop].tolist(), slots.tolist())
+        )
+        self._pending.update(
+            zip(self._seconds[start:stop].tolist(), (slots + 1).tolist())
+        )
+        self._pending_arrays = None
+        return None
+
+    def _discard_pair(self, pair):
+        row = self._find_row(pair.first)
+        if row is None:
+            raise KeyError(f"{pair} does not exist in the set")
+        self._discard_row(row)
+        return None
+
+    def _discard_row(self, row):
+        self._alive[row] = False
+        self._count -= 1
+        self._pending.pop(int(self._firsts[row]), None)
+        self._pending.pop(int(self._seconds[row]), None)
+        return None
+
+    def _needs_rebuild(self, extra=0):
+        stale = len(self._pending) + self._rows - self._count + extra
+        return stale > max(_MIN_PENDING, self._count // 4)
+
+    def _rebuild_index(self):
+        alive = np.flatnonzero(self._alive[:self._rows])
+        count = len(alive)
+        capacity = max(_INITIAL_CAPACITY, len(self._firsts))
+        firsts = np.zeros(capacity, dtype=np.int64)
+        seconds = np.zeros(capacity, dtype=np.int64)
+        firsts[:count] = self._firsts[alive]
+        seconds[:count] = self._seconds[alive]
+        self._firsts = firsts
+        self._seconds = seconds
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[:count] = True
+        self._rows = count
+        self._count = count
+        keys = np.concatenate((firsts[:count], seconds[:count]))
+        rows = np.arange(count, dtype=np.int64)
+        slots = np.concatenate((rows * 2, rows * 2 + 1))
+        order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[order]
+        self._sorted_slots = slots[order]
+        self._pending = {}
+        self._pending_arrays = None
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __len__(self):
+        return self._count
+
+    def _slot_holds(self, slot, key):
+        row = slot >> 1
+        if row >= self._rows or not self._alive[row]:
+            return False
+        column = self._seconds if slot & 1 else self._firsts
+        return column[row] == key
+
+    def _find_slot(self, key):
+        key = _as_int64(key)
+        if key is None:
+            return None
+        slot = self._pending.get(key)
+        if slot is not None and self._slot_holds(slot, key):
+            return slot
+        position = np.searchsorted(self._sorted_keys, key)
+        if (
+            position < len(self._sorted_keys)
+            and self._sorted_keys[position] == key
+        ):
+            slot = int(self._sorted_slots[position])
+            if self._slot_holds(slot, key):
+                return slot
+        return None
+
+    def _find_row(self, key):
+        slot = self._find_slot(key)
+        if slot is None:
+            return None
+        return slot >> 1
+
+    def _find_slots(self, keys):
+        array = np.asarray(keys)
+        if array.dtype.kind not in "biu":
+            if not isinstance(keys, np.ndarray):
+                array = np.asarray(keys, dtype=object)
+            return np.array(
+                [
+                    -1 if slot is None else slot
+                    for slot in map(self._find_slot, array.ravel().tolist())
+                ],
+                dtype=np.int64
+            ).reshape(array.shape)
+        keys = array.astype(np.int64)
+        slots, found = self._find_sorted_slots(keys)
+        if self._pending and not found.all():
+            pending_keys, pending_slots = self._pending_index()
+            missing = ~found
+            positions = np.searchsorted(pending_keys, keys[missing])
+            positions = np.minimum(positions, len(pending_keys) - 1)
+            matched = pending_keys[positions] == keys[missing]
+            slots[missing] = np.where(matched, pending_slots[positions], -1)
+            self._check_slots(slots, keys)
+        return slots
+
+    def _find_sorted_slots(self, keys):
+        # Slots of int64 keys in the sorted index, and which keys were found
+        slots = np.full(keys.shape, -1, dtype=np.int64)
+        if len(self._sorted_keys):
+            positions = np.searchsorted(self._sorted_keys, keys)
+            positions = np.minimum(positions, len(self._sorted_keys) - 1)
+            found = self._sorted_keys[positions] == keys
+            slots[found] = self._sorted_slots[positions[found]]
+        return slots, self._check_slots(slots, keys)
+
+    def _check_slots(self, slots, keys):
+        # Entries of the index may be out of date, so a slot only counts if
+        # its row is alive and still holds the key
+        found = slots >= 0
+        rows = np.where(found, slots >> 1, 0)
+        found &= self._alive[rows]
+        stored = np.where(
+            slots & 1, self._seconds[rows], self._firsts[rows]
+        )
+        found &= stored == keys
+        slots[~found] = -1
+        return found
+
+    def _pending_index(self):
+        # Sorted copy of _pending for batch lookups, made again only after
+        # _pending has gained entries
+        if self._pending_arrays is None:
+            keys = np.fromiter(
+                self._pending.keys(), dtype=np.int64, count=len(self._pending)
+            )
+            slots = np.fromiter(
+                self._pending.values(),
+                dtype=np.int64,
+                count=len(self._pending)
+            )
+            order = np.argsort(keys, kind="stable")
+            self._pending_arrays = (keys[order], slots[order])
+        return self._pending_arrays
+
+    _lookup_methods = ("_find_slot",)
+    _bulk_lookup_methods = ("_find_slots",)
+
+    def _lookup_cost(self, key):
+        # Follows _find_slot: 1 probe of the dict of pending keys, with 1
+        # comparison if it holds key and 1 with the slot it leads to, then a
+        # binary search of the sorted keys, with 1 probe and 1 comparison per
+        # step, 1 comparison with the key it ends on and 1 with its slot
+        key = _as_int64(key)
+        if key is None:
+            return 0, 0
+        probes = 1
+        comparisons = 0
+        slot = self._pending.get(key)
+        if slot is not None:
+            comparisons += 2
+            if self._slot_holds(slot, key):
+                return probes, comparisons
+        steps = len(self._sorted_keys).bit_length()
+        probes += steps
+        comparisons += steps
+        position = np.searchsorted(self._sorted_keys, key)
+        if position < len(self._sorted_keys):
+            comparisons += 1
+            if self._sorted_keys[position] == key:
+                comparisons += 1
+        return probes, comparisons
+
+    def _bulk_lookup_cost(self, keys):
+        # Follows _find_slots: a binary search of the sorted keys for every
+        # key, and one of the pending keys for the keys not found there, each
+        # with 1 probe and 1 comparison per step and 1 comparison with the
+        # key it ends on. The slot of every key is checked after each search
+        array = np.asarray(keys)
+        if array.dtype.kind not in "biu":
+            if not isinstance(keys, np.ndarray):
+                array = np.asarray(keys, dtype=object)
+            return super()._bulk_lookup_cost(array.ravel().tolist())
+        keys = array.astype(np.int64)
+        count = keys.size
+        probes = 0
+        comparisons = count
+        if len(self._sorted_keys):
+            steps = len(self._sorted_keys).bit_length()
+            probes += count * steps
+            comparisons += count * (steps + 1)
+        if self._pending:
+            missing = count - int(self._find_sorted_slots(keys)[1].sum())
+            if missing:
+                steps = len(self._pending).bit_length()
+                probes += missing * steps
+                comparisons += missing * (steps + 1) + count
+        return probes, comparisons
+
+    def _find_pair(self, key):
+        slot = self._find_slot(key)
+        if slot is None:
+            return None
+        return self._pair_at(slot >> 1)
+
+    def _pair_at(self, row):
+        return CoupledPair(int(self._firsts[row]), int(self._seconds[row]))
+
+    def _iterate_pairs(self):
+        for first, second in self._iterate_values():
+            yield CoupledPair(first, second)
+
+    def _iterate_values(self):
+        alive = self._alive[:self._rows]
+        firsts = self._firsts[:self._rows][alive].tolist()
+        seconds = self._seconds[:self._rows][alive].tolist()
+        return zip(firsts, seconds)
+
+    def contains(self, key):
+        """
+        Checks if a key, or each key in an array of keys, is in one of the
+        pairs in the set.
+
+        Parameters
+        ----------
+        key: int, or list or numpy.ndarray of int
+
+        Returns
+        -------
+        exists: bool, or numpy.ndarray of bool
+        """
+        if _is_batch(key):
+            return self._find_slots(key) >= 0
+        return self._find_slot(key) is not None
+
+    def contains_many(self, keys, stream=False):
+        """
+        Like CoupledValues.contains_many, but looks up all the keys in a single
+        vectorised call unless stream is True.
+
+        Parameters
+        ----------
+        keys: iterable of int
+
+        stream: bool = False
+
+        Returns
+        -------
+        exists: list or generator of bool
+        """
+        if stream:
+            return super().contains_many(keys, stream=True)
+        return (self._find_slots(list(keys)) >= 0).tolist()
+
+    def get_many(self, keys, default=_MISSING, stream=False):
+        """
+        Like CoupledValues.get_many, but looks up all the keys in a single
+        vectorised call unless stream is True.
+
+        Parameters
+        ----------
+        keys: iterable of int
+
+        default: object, optional
+
+        stream: bool = False
+
+        Raises
+        ------
+        KeyError
+            If a key does not exist, default is not given and error_mode is
+            ERROR_ON
+
+        Returns
+        -------
+        values: list or generator of int
+        """
+        if stream:
+            return super().get_many(keys, default, stream=True)
+        keys = list(keys)
+        slots = self._find_slots(keys)
+        found = slots >= 0
+        rows = np.where(found, slots >> 1, 0)
+        values = np.where(
+            slots & 1, self._firsts[rows], self._seconds[rows]
+        ).tolist()
+        for position in np.flatnonzero(~found).tolist():
+            values[position] = self._missing_value(keys[position], default)
+        return values
+
+    def get_value(self, key):
+        """
+        Get the counterpart of a key, or the counterparts of an array of keys
+        in a single vectorised lookup.
+
+        Parameters
+        ----------
+        key: int, or list or numpy.ndarray of int
+
+        Raises
+        ------
+        KeyError
+            If a key does not exist in the set and error_mode is ERROR_ON
+
+        Returns
+        -------
+        value: int or numpy.ndarray of int
+            When error_mode is ERROR_OFF, None for a single missing key. For an
+            array of keys, missing keys are replaced with missing, or masked
+            out if missing is None.
+        """
+        if not _is_batch(key):
+            slot = self._find_slot(key)
+            if slot is None:
+                if self._error_mode == ERROR_ON:
+                    raise KeyError(f"{key} does not exist in the set")
+                return None
+            column = self._firsts if slot & 1 else self._seconds
+            return int(column[slot >> 1])
+        slots = self._find_slots(key)
+        found = slots >= 0
+        if self._error_mode == ERROR_ON and not found.all():
+            missing_key = np.asarray(key)[~found].ravel()[0]
+            raise KeyError(f"{missing_key} does not exist in the set")
+        rows = np.where(found, slots >> 1, 0)
+        values = np.where(
+            slots & 1, self._firsts[rows], self._seconds[rows]
+        )
+        if found.all():
+            return values
+        if self._missing is None:
+            return np.ma.masked_array(values, mask=~found)
+        values[~found] = self._missing
+        return values
+
+    # - ## ~~~~~~~~~~~~~~~~~~~ VALIDATION SECTION ~~~~~~~~~~~~~~~~~~~ ##
+
+    def _find_clashes(self, pairs):
+        values = []
+        for pair in pairs:
+            values.append(pair.first)
+            values.append(pair.second)
+        return self._find_array_clashes(self._to_column(values))
+
+    def _find_array_clashes(self, values):
+        clashing = self._find_slots(values) >= 0
+        unique_values, first_positions, counts = np.unique(
+            values, return_index=True, return_counts=True
+        )
+        repeated = np.zeros(len(values), dtype=bool)
+        repeated[first_positions[counts > 1]] = True
+        clashing |= repeated
+        clashing_values = values[clashing].tolist()
+        return list(dict.fromkeys(clashing_values))
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _update(self, key, value):
+        if key == value:
+            raise ValueError("key cannot be the same as value")
+        slot = self._find_slot(key)
+        if slot is None:
+            raise KeyError(f"{key} does not exist in the set")
+        new_value = _to_int64(value)
+        if self._find_slot(new_value) is not None:
+            raise ClashingError(f"{value} is already in the set.")
+        row = slot >> 1
+        counterpart_slot = slot ^ 1
+        column = self._seconds if counterpart_slot & 1 else self._firsts
+        column[row] = new_value
+        self._pending[new_value] = counterpart_slot
+        self._pending_arrays = None
+        if self._needs_rebuild():
+            self._rebuild_index()
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _remove_and_get_pair(self, key):
+        slot = self._find_slot(key)
+        if slot is not None:
+            pair = self._pair_at(slot >> 1)
+            self._discard_row(slot >> 1)
+            return pair
+        if self._error_mode == ERROR_ON:
+            raise KeyError(f"{key} does not exist in the set")
+        else:
+            return None
+
+    def _remove_and_get_counterpart(self, key):
+        pair = self._remove_and_get_pair(key)
+        if pair is None:
+            return None
+        return pair.counterpart(key)
+
+    def _clear(self):
+        self._reset_columns()
+        return None
@@ -0,0 +1,212 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import (
+    _flatten_pairs,
+    _unflatten_pairs,
+    BaseCoupledValues
+)
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "OverlayCoupledValues"
+]
+
+
+def _restore_overlay(cls, base, error_mode, own_pairs, hidden_pairs):
+    overlay = cls(base, error_mode=error_mode)
+    overlay._insert_pairs(_unflatten_pairs(*own_pairs))
+    overlay._hidden._insert_pairs(_unflatten_pairs(*hidden_pairs))
+    return overlay
+
+
+class OverlayCoupledValues(CoupledValues):
+    """
+    CoupledValues that is layered on top of another set without copying it.
+    Only the pairs that were added, changed or removed since the overlay was
+    created are stored in the overlay itself, so creating one takes time
+    proportional to the number of pairs pushed into it rather than the size of
+    the underlying set. Lookups check the overlay first and then fall back to
+    the underlying set.
+
+    The underlying set is never modified through the overlay. A pair from the
+    underlying set is copied into the overlay before it is updated, and popping
+    it only hides it from the overlay. However, changes made directly to the
+    underlying set afterwards are visible through the overlay and are not
+    checked for clashes with the pairs in the overlay, so the underlying set
+    should be left alone while the overlay is in use. Call materialize to get
+    an independent CoupledValues.
+
+    CoupledValues.temporary_push, and therefore cv + pairs, returns an
+    OverlayCoupledValues.
+
+    Parameters
+    ----------
+    base: BaseCoupledValues
+        The set the overlay is layered on
+
+    init_values: CoupledPair, list, set, tuple or dict, BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    Raises
+    ------
+    ClashingError
+        If the pairs in init_values clash with each other or with base
+
+    Returns
+    -------
+    OverlayCoupledValues
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        base,
+        init_values=[],
+        error_mode=ERROR_ON
+    ):
+        if not isinstance(base, BaseCoupledValues):
+            raise TypeError("base must be an instance of BaseCoupledValues")
+        self._base = base
+        self._hidden = BaseCoupledValues()
+        super().__init__(init_values, error_mode=error_mode)
+
+    def __reduce__(self):
+        return _restore_overlay, (
+            type(self),
+            self._base,
+            self._error_mode,
+            _flatten_pairs(super()._iterate_pairs()),
+            _flatten_pairs(self._hidden._iterate_pairs())
+        )
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _discard_pair(self, pair):
+        if self._owns(pair):
+            super()._discard_pair(pair)
+        else:
+            self._hidden._insert_pair(pair)
+        return None
+
+    def _owns(self, pair):
+        return id(pair) in self._pairs
+
+    def _shadow(self, pair):
+        new_pair = pair.copy()
+        self._hidden._insert_pair(pair)
+        self._insert_pair(new_pair)
+        return new_pair
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __len__(self):
+        return len(self._base) - len(self._hidden) + len(self._pairs)
+
+    def _find_pair(self, key):
+        pair = super()._find_pair(key)
+        if pair is not None:
+            return pair
+        pair = self._base._find_pair(key)
+        if pair is None or self._hidden._has(pair):
+            return None
+        return pair
+
+    def _lookup_cost(self, key):
+        # The lookup in the overlay, then on a miss the lookup in the base
+        # and, if the base has key, the lookup of its pair among the hidden
+        # pairs and the comparison with the pair found there. The lookups are
+        # made through the classes, so that the base and the hidden pairs do
+        # not count them again if they are instrumented themselves
+        probes, comparisons = super()._lookup_cost(key)
+        if super()._find_pair(key) is not None:
+            return probes, comparisons
+        base, hidden = self._base, self._hidden
+        base_probes, base_comparisons = base._lookup_cost(key)
+        probes += base_probes
+        comparisons += base_comparisons
+        pair = type(base)._find_pair(base, key)
+        if pair is None:
+            return probes, comparisons
+        hidden_probes, hidden_comparisons = hidden._lookup_cost(pair.first)
+        probes += hidden_probes
+        comparisons += hidden_comparisons
+        if type(hidden)._find_pair(hidden, pair.first) is not None:
+            comparisons += 1
+        return probes, comparisons
+
+    def _iterate_pairs(self):
+        for pair in self._base._iterate_pairs():
+            if not self._hidden._has(pair):
+                yield pair
+        for pair in super()._iterate_pairs():
+            yield pair
+
+    def _iterate_values(self):
+        for pair in self._iterate_pairs():
+            yield pair.first, pair.second
+
+    def _new_empty(self):
+        return CoupledValues(error_mode=self._error_mode)
+
+    def materialize(self):
+        """
+        Copies the overlay and the set underneath it into a new, independent
+        CoupledValues.
+
+        Returns
+        -------
+        new_cv: CoupledValues
+        """
+        new_cv = CoupledValues(error_mode=self._error_mode)
+        new_cv._insert_pairs(pair.copy() for pair in self._iterate_pairs())
+        return new_cv
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _update(self, key, value):
+        pair = self._find_pair(key)
+        if (
+            pair is not None
+            and not self._owns(pair)
+            and key != value
+            and not self._contains(value)
+        ):
+            self._shadow(pair)
+        return super()._update(key, value)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _clear(self):
+        super()._clear()
+        self._base = BaseCoupledValues()
+        self._hidden = BaseCoupledValues()
+        return None
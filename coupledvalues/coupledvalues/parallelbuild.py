@@ -0,0 +1,227 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import _unique_values
+from coupledvalues.coupledvalues.coupledvalues import (
+    CoupledValues,
+    create_pairs
+)
+from coupledvalues.errors import *
+
+__all__ = [
+    "build_parallel"
+]
+
+
+# Values being validated by build_parallel. Worker processes that are forked
+# inherit this list instead of receiving a pickled copy of it.
+_SHARED_VALUES = None
+
+
+def _partition_positions(start, stop, partitions):
+    values = _SHARED_VALUES
+    buckets = [array("Q") for _ in range(partitions)]
+    unhashable = False
+    for position in range(start, stop):
+        try:
+            buckets[hash(values[position]) % partitions].append(position)
+        except TypeError:
+            unhashable = True
+    return buckets, unhashable
+
+
+def _duplicate_positions(position_arrays):
+    values = _SHARED_VALUES
+    seen = {}
+    duplicates = array("Q")
+    for positions in position_arrays:
+        for position in positions:
+            if seen.setdefault(values[position], position) != position:
+                duplicates.append(position)
+    return duplicates
+
+
+def _duplicate_values(values):
+    seen = set()
+    duplicates = []
+    for value in values:
+        if value in seen:
+            duplicates.append(value)
+        seen.add(value)
+    return duplicates
+
+
+def _find_clashes_forked(values, executor, workers, partitions):
+    global _SHARED_VALUES
+    _SHARED_VALUES = values
+    try:
+        step = -(-len(values) // workers)
+        partitioned = list(executor.map(
+            _partition_positions,
+            range(0, len(values), step),
+            [min(start + step, len(values))
+             for start in range(0, len(values), step)],
+            [partitions] * workers
+        ))
+        if any(unhashable for _, unhashable in partitioned):
+            return None
+        duplicates = executor.map(
+            _duplicate_positions,
+            [
+                [buckets[partition] for buckets, _ in partitioned]
+                for partition in range(partitions)
+            ]
+        )
+        return [
+            values[position]
+            for positions in duplicates
+            for position in positions
+        ]
+    finally:
+        _SHARED_VALUES = None
+
+
+def _find_clashes_spawned(values, executor, partitions):
+    buckets = [[] for _ in range(partitions)]
+    for value in values:
+        try:
+            buckets[hash(value) % partitions].append(value)
+        except TypeError:
+            return None
+    return [
+        value
+        for duplicates in executor.map(_duplicate_values, buckets)
+        for value in duplicates
+    ]
+
+
+def build_parallel(
+    values,
+    workers=None,
+    partitions=None,
+    error_mode=ERROR_ON,
+    cls=CoupledValues
+):
+    """
+    Builds a CoupledValues from a large number of pairs, checking them for
+    clashes in several processes at once.
+
+    Only the clash check runs in other processes. The pairs are created,
+    converted and added to the new set in this process, since the objects in
+    an index cannot be shared between processes, and pickling a finished
+    index back from a worker costs more than building it here. The clash
+    check is about half of the work of building a set, so this takes at best
+    about half as long as creating the set directly, however many workers
+    are used, and is only worth it for large loads on a machine with idle
+    CPUs.
+
+    The values of all the pairs are split into partitions by their hash, so
+    that equal values always end up in the same partition, and every partition
+    is checked for duplicates by a worker in a ProcessPoolExecutor. Where the
+    fork start method is available, the workers also do the partitioning and
+    read the values from memory inherited from this process instead of having
+    them pickled. Only the positions of the values are sent between processes,
+    as arrays of 8 bytes per value, once back from the workers that partition
+    them and once out to the workers that check each partition. Once no
+    clashes are found, the pairs are added to the new set without checking
+    them again.
+
+    Values that cannot be hashed cannot be partitioned. If any are found, the
+    clash check falls back to the usual single-process one.
+
+    Example
+    -------
+
+        >>> sources = [load_pairs(path) for path in paths]
+        >>> my_cv = build_parallel(sources, workers=8)
+
+    Parameters
+    ----------
+    values: CoupledPair, list, set, tuple, dict, iterable or BaseCoupledValues
+
+    workers: int, optional
+        Number of worker processes, the number of CPUs by default
+
+    partitions: int, optional
+        Number of partitions the values are split into, workers by default
+
+    error_mode: str = ERROR_ON
+
+    cls: type = CoupledValues
+        Class of the new set, CoupledValues or a subclass that can be created
+        with only error_mode
+
+    Raises
+    ------
+    ClashingError
+        If two of the pairs clash. Every clashing value is listed in
+        ClashingError.values
+
+    Returns
+    -------
+    new_cv: cls
+    """
+    new_cv = cls(error_mode=error_mode)
+    pairs = [
+        new_cv._convert_pair(pair)
+        for pair in create_pairs(values, new_cv._pair_type)
+    ]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if partitions is None:
+        partitions = workers
+    if workers < 1 or partitions < 1:
+        raise ValueError("workers and partitions must be at least 1")
+    flat_values = []
+    for pair in pairs:
+        flat_values.append(pair.first)
+        flat_values.append(pair.second)
+    clashing_values = None
+    if workers > 1 and flat_values:
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(workers, mp_context=context) as executor:
+                clashing_values = _find_clashes_forked(
+                    flat_values, executor, workers, partitions
+                )
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                clashing_values = _find_clashes_spawned(
+                    flat_values, executor, partitions
+                )
+    if clashing_values is None:
+        clashing_values = new_cv._find_clashes(pairs)
+    if clashing_values:
+        raise ClashingError.from_values(_unique_values(clashing_values))
+    new_cv._insert_pairs(pairs)
+    return new_cv
@@ -0,0 +1,257 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import struct
+import zlib
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import BaseCoupledValues
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.coupledvalues.mappedcoupledvalues import (
+    _decode,
+    _encode,
+    _ENTRY,
+    _TAG_STR
+)
+from coupledvalues.errors import *
+
+__all__ = [
+    "dump",
+    "dumps",
+    "load",
+    "loads"
+]
+
+
+### ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ FILE FORMAT ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+#
+# A dump is a header followed by a body, both little-endian:
+#
+#   header  magic, format version, number of pairs and the CRC-32 of the body
+#   body    for every pair, a byte giving the pair type, followed by the first
+#           and second value of every pair, each stored as a type tag, a
+#           length and the encoded value in the same way as in mapped files
+#
+# Unlike mapped files, dumps hold no index. They are meant to be read back into
+# memory in one go, and are smaller and faster to write than mapped files.
+
+_MAGIC = b"CPLDDUMP"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIQI")
+
+_PAIR_TYPES = (CoupledPair, FrozenCoupledPair)
+_PAIR_KINDS = {pair_type: kind for kind, pair_type in enumerate(_PAIR_TYPES)}
+
+
+def _encode_pairs(values):
+    kinds = bytearray()
+    heap = bytearray()
+    for pair in values._iterate_pairs():
+        try:
+            kinds.append(_PAIR_KINDS[type(pair)])
+        except KeyError:
+            raise TypeError(
+                "dumps can only hold CoupledPair and FrozenCoupledPair, "
+                + f"not {type(pair).__name__}"
+            )
+        for value in (pair.first, pair.second):
+            tag, payload = _encode(value)
+            heap += _ENTRY.pack(tag, len(payload))
+            heap += payload
+    return len(kinds), kinds + heap
+
+
+def _decode_pairs(body, count):
+    unpack_entry = _ENTRY.unpack_from
+    entry_size = _ENTRY.size
+    values = []
+    append = values.append
+    offset = count
+    try:
+        for _ in range(2 * count):
+            tag, length = unpack_entry(body, offset)
+            start = offset + entry_size
+            offset = start + length
+            if tag == _TAG_STR:
+                append(str(body[start:offset], "utf-8"))
+            else:
+                append(_decode(tag, body[start:offset]))
+        if offset != len(body):
+            raise ValueError("data is not a dumped CoupledValues")
+        pair_types = [_PAIR_TYPES[kind] for kind in body[:count]]
+    except (struct.error, IndexError):
+        # A count that does not match the body reads past its end
+        raise ValueError("data is not a dumped CoupledValues")
+    return [
+        pair_type(first, second)
+        for pair_type, first, second in zip(
+            pair_types, values[0::2], values[1::2]
+        )
+    ]
+
+
+### ~~~~~~~~~~~~~~~~~~~~~~~~~~ GENERAL FUNCTIONS ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+def dumps(values):
+    """
+    Converts a CoupledValues set to bytes that can be read back with loads.
+
+    Example
+    -------
+
+        >>> data = dumps(CoupledValues({"a": "b"}))
+        >>> loads(data)
+        CoupledValues([('a', 'b')])
+
+    Parameters
+    ----------
+    values: BaseCoupledValues
+
+    Raises
+    ------
+    TypeError
+        If values is not a BaseCoupledValues, if one of its pairs is not a
+        CoupledPair or FrozenCoupledPair, or if one of its values is not None,
+        a bool, an int, a float, a str or bytes
+
+    Returns
+    -------
+    data: bytes
+    """
+    if not isinstance(values, BaseCoupledValues):
+        raise TypeError("values must be an instance of BaseCoupledValues")
+    count, body = _encode_pairs(values)
+    header = _HEADER.pack(_MAGIC, _VERSION, count, zlib.crc32(body))
+    return header + bytes(body)
+
+
+def dump(values, fp):
+    """
+    Writes a CoupledValues set to a binary file object. See dumps.
+
+    Example
+    -------
+
+        >>> with open("table.cpd", "wb") as fp:
+        ...     dump(CoupledValues({"a": "b"}), fp)
+
+    Parameters
+    ----------
+    values: BaseCoupledValues
+
+    fp: file object
+        Opened in binary mode
+
+    Returns
+    -------
+    None
+    """
+    fp.write(dumps(values))
+    return None
+
+
+def loads(data, error_mode=ERROR_ON, trusted=False, cls=CoupledValues):
+    """
+    Reads a CoupledValues set from bytes written by dumps. The checksum of the
+    data is always verified. The pairs are checked for clashes unless trusted
+    is True, which should only be used for data written by dumps from a valid
+    set.
+
+    Parameters
+    ----------
+    data: bytes-like
+
+    error_mode: str = ERROR_ON
+
+    trusted: bool = False
+        Whether to skip checking the pairs for clashes
+
+    cls: type = CoupledValues
+        The class of the set to create. It must accept error_mode as a keyword
+        argument
+
+    Raises
+    ------
+    ValueError
+        If data is not a dump, was written by an unsupported version, or does
+        not match its checksum
+
+    ClashingError
+        If trusted is False and two of the pairs clash
+
+    Returns
+    -------
+    new_cv: BaseCoupledValues
+    """
+    data = memoryview(data)
+    try:
+        magic, version, count, checksum = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise ValueError("data is not a dumped CoupledValues")
+    if magic != _MAGIC:
+        raise ValueError("data is not a dumped CoupledValues")
+    if version != _VERSION:
+        raise ValueError(f"unsupported dump version {version}")
+    body = bytes(data[_HEADER.size:])
+    if zlib.crc32(body) != checksum:
+        raise ValueError("dump checksum does not match, the data is corrupted")
+    pairs = _decode_pairs(body, count)
+    new_cv = cls(error_mode=error_mode)
+    if trusted:
+        new_cv._insert_pairs(new_cv._convert_pair(pair) for pair in pairs)
+    else:
+        new_cv._push_pairs(pairs)
+    return new_cv
+
+
+def load(fp, error_mode=ERROR_ON, trusted=False, cls=CoupledValues):
+    """
+    Reads a CoupledValues set from a binary file object written by dump. See
+    loads.
+
+    Example
+    -------
+
+        >>> with open("table.cpd", "rb") as fp:
+        ...     my_cv = load(fp)
+
+    Parameters
+    ----------
+    fp: file object
+        Opened in binary mode
+
+    error_mode: str = ERROR_ON
+
+    trusted: bool = False
+
+    cls: type = CoupledValues
+
+    Returns
+    -------
+    new_cv: BaseCoupledValues
+    """
+    return loads(fp.read(), error_mode=error_mode, trusted=trusted, cls=cls)
@@ -0,0 +1,310 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from contextlib import contextmanager
+import weakref
+
+from coupledvalues.constants import *
+from coupledvalues.errors import *
+
+__all__ = [
+    "Snapshot"
+]
+
+
+_MISSING = object()
+
+
+@contextmanager
+def _reading(table):
+    lock = getattr(table, "lock", None)
+    if lock is None:
+        yield None
+    else:
+        with lock.reading():
+            yield lock
+
+
+def _forward_change(snapshot_ref):
+    # The set only holds a weak reference to the snapshot, so that a snapshot
+    # that is no longer used stops recording changes when it is collected
+    def listener(operation, a, b, old):
+        snapshot = snapshot_ref()
+        if snapshot is not None:
+            snapshot._on_change(operation, a, b, old)
+        return None
+    return listener
+
+
+class Snapshot(object):
+    """
+    Read-only view of a BaseCoupledValues as it was when the snapshot was
+    taken. Use BaseCoupledValues.snapshot rather than creating one directly.
+
+    Taking a snapshot does not copy the set. Instead, the first time a value
+    is touched by a push, update, pop, clear or CoupledPair.modify after the
+    snapshot was taken, the pair it belonged to at that time is kept by the
+    snapshot, and lookups of that value are answered from it. Values that were
+    not touched are looked up in the set itself. Taking a snapshot is
+    therefore O(1), and it uses memory in proportion to the number of values
+    written since, until it is closed.
+
+    Iterating over a snapshot yields the (first, second) values of its pairs.
+    The pairs are gathered when iteration starts, so the set can be changed
+    freely while the snapshot is being iterated over.
+
+    Parameters
+    ----------
+    table: BaseCoupledValues
+
+    Returns
+    -------
+    Snapshot
+    """
+
+    def __init__(self, table):
+        self._table = table
+        self._length = len(table)
+        self._before = {}
+        self._unhashable_before = []
+        self._listener = None
+        self._closed = False
+
+    def _open(self):
+        self._listener = _forward_change(weakref.ref(self))
+        self._table._add_mutation_listener(self._listener)
+        weakref.finalize(
+            self, self._table._remove_mutation_listener, self._listener
+        )
+        return None
+
+    def _on_change(self, operation, a, b, old):
+        if operation == DELTA_PUSH:
+            self._record(a, None)
+            self._record(b, None)
+        elif operation == DELTA_CLEAR:
+            for values in old:
+                self._record(values[0], values)
+                self._record(values[1], values)
+        else:
+            if old is not None:
+                self._record(old[0], old)
+                self._record(old[1], old)
+            if operation == DELTA_UPDATE:
+                self._record(b, None)
+        return None
+
+    def _canonical(self, value):
+        # Values are recorded under the same key that the set indexes them by
+        key_func = self._table._index_key
+        if key_func is None:
+            return value
+        return key_func(value)
+
+    def _record(self, value, values):
+        # Only the first change to a value is kept, as it holds the pair the
+        # value belonged to when the snapshot was taken
+        value = self._canonical(value)
+        try:
+            self._before.setdefault(value, values)
+        except TypeError:
+            if not any(value == other for other, _ in self._unhashable_before):
+                self._unhashable_before.append((value, values))
+        return None
+
+    def _recorded(self, key):
+        key = self._canonical(key)
+        try:
+            return self._before.get(key, _MISSING)
+        except TypeError:
+            for value, values in self._unhashable_before:
+                if value == key:
+                    return values
+            return _MISSING
+
+    def _lookup(self, key):
+        values = self._recorded(key)
+        if values is not _MISSING:
+            return values
+        pair = self._table._find_pair(key)
+        if pair is None:
+            return None
+        return (pair.first, pair.second)
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("the snapshot has been closed")
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.get_value(key)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def contains(self, key):
+        """
+        Checks whether key was in the set when the snapshot was taken.
+
+        Parameters
+        ----------
+        key: object
+
+        Raises
+        ------
+        ValueError
+            If the snapshot has been closed
+
+        Returns
+        -------
+        exists: bool
+        """
+        self._check_open()
+        with _reading(self._table):
+            return self._lookup(key) is not None
+
+    def get_value(self, key):
+        """
+        Returns the counterpart that key had when the snapshot was taken.
+
+        Example
+        -------
+
+            >>> my_cv = CoupledValues({"a": "b"})
+            >>> snapshot = my_cv.snapshot()
+            >>> my_cv.update("a", "c")
+            >>> snapshot.get_value("a"), my_cv.get_value("a")
+            ('b', 'c')
+
+        Parameters
+        ----------
+        key: object
+
+        Raises
+        ------
+        KeyError
+            If key was not in the set and error_mode is ERROR_ON
+
+        ValueError
+            If the snapshot has been closed
+
+        Returns
+        -------
+        value: object
+            Counterpart of key, None if key was not in the set and error_mode
+            is ERROR_OFF
+        """
+        self._check_open()
+        with _reading(self._table):
+            values = self._lookup(key)
+        if values is None:
+            return self._table._missing_value(key)
+        if self._canonical(values[0]) == self._canonical(key):
+            return values[1]
+        return values[0]
+
+    def to_list(self):
+        """
+        Returns the (first, second) values of every pair in the snapshot.
+
+        Raises
+        ------
+        ValueError
+            If the snapshot has been closed
+
+        Returns
+        -------
+        pairs: list of tuple
+        """
+        self._check_open()
+        recorded = self._recorded
+        with _reading(self._table):
+            pairs = [
+                values for values in self._table._iterate_values()
+                if recorded(values[0]) is _MISSING
+                and recorded(values[1]) is _MISSING
+            ]
+            seen = set()
+            kept = list(self._before.values())
+            kept.extend(values for _, values in self._unhashable_before)
+        for values in kept:
+            if values is not None and id(values) not in seen:
+                seen.add(id(values))
+                pairs.append(values)
+        return pairs
+
+    def to_coupled_values(self):
+        """
+        Copies the snapshot into a new set of the same kind as the one it was
+        taken from, or into a CoupledValues if that set cannot be written to.
+
+        Raises
+        ------
+        ValueError
+            If the snapshot has been closed
+
+        Returns
+        -------
+        new_cv: CoupledValues
+        """
+        new_cv = self._table._new_empty()
+        new_cv._insert_pairs(
+            new_cv._convert_pair(new_cv._pair_type(first, second))
+            for first, second in self.to_list()
+        )
+        return new_cv
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def close(self):
+        """
+        Stops keeping the values that are changed in the set, and frees the
+        ones that were kept. A snapshot that is no longer referenced is closed
+        automatically when it is garbage collected.
+
+        Returns
+        -------
+        None
+        """
+        if not self._closed:
+            self._closed = True
+            self._table._remove_mutation_listener(self._listener)
+            self._before = {}
+            self._unhashable_before = []
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return None
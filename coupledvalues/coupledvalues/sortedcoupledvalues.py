@@ -0,0 +1,393 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.coupledvalues import CoupledValues
+from coupledvalues.errors import *
+
+__all__ = [
+    "SortedCoupledValues"
+]
+
+
+def _remove_sorted(values, value):
+    index = bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        del values[index]
+    return None
+
+
+class SortedCoupledValues(CoupledValues):
+    """
+    CoupledValues that also keeps the first values and the second values of
+    its pairs in two sorted lists, so pairs can be found by ranges of values in
+    O(log n + k) time. Lookups by exact value still use the hash index. Adding
+    or removing a single pair takes O(n) time to keep the lists sorted, but
+    that only moves memory, and pushing many pairs at once sorts them together.
+
+    Every value must be hashable and comparable with the values on the same
+    side of the other pairs, for example timestamps as first values and strings
+    as second values. Queries over both sides at once also compare first values
+    with second values.
+
+    Example
+    -------
+
+        >>> events = SortedCoupledValues({1000: "start", 1500: "lunch",
+        ...                               2000: "stop"})
+        >>> events.range_pairs(1200, 2000, side=SIDE_FIRST)
+        [CoupledPair(1500, 'lunch'), CoupledPair(2000, 'stop')]
+        >>> events.nearest(1400, side=SIDE_FIRST)
+        1500
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    progress: callable, optional
+
+    Raises
+    ------
+    TypeError
+        If a value is not hashable or cannot be compared with the other values
+
+    Returns
+    -------
+    SortedCoupledValues
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        init_values=[],
+        error_mode=ERROR_ON,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None
+    ):
+        self._firsts = []
+        self._seconds = []
+        super().__init__(
+            init_values,
+            error_mode=error_mode,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    @staticmethod
+    def _check_values(values, sorted_values):
+        # Called before anything is changed, so that a value that cannot be
+        # hashed or sorted leaves the set as it was
+        for value in values:
+            hash(value)
+            bisect_left(sorted_values, value)
+        sorted(values)
+        return None
+
+    def _insert_pair(self, pair):
+        self._insert_pairs((pair,))
+        return None
+
+    def _insert_pairs(self, pairs):
+        pairs = list(pairs)
+        firsts = [pair.first for pair in pairs]
+        seconds = [pair.second for pair in pairs]
+        if len(pairs) * 16 < len(self._firsts):
+            self._check_values(firsts, self._firsts)
+            self._check_values(seconds, self._seconds)
+            for pair in pairs:
+                super()._insert_pair(pair)
+                insort(self._firsts, pair.first)
+                insort(self._seconds, pair.second)
+            return None
+        for value in firsts + seconds:
+            hash(value)
+        firsts = sorted(self._firsts + firsts)
+        seconds = sorted(self._seconds + seconds)
+        for pair in pairs:
+            super()._insert_pair(pair)
+        self._firsts = firsts
+        self._seconds = seconds
+        return None
+
+    def _discard_pair(self, pair):
+        super()._discard_pair(pair)
+        _remove_sorted(self._firsts, pair.first)
+        _remove_sorted(self._seconds, pair.second)
+        return None
+
+    def _reindex(self):
+        super()._reindex()
+        self._sort_values()
+        return None
+
+    def _sort_values(self):
+        self._firsts = sorted(pair.first for pair in self._pairs.values())
+        self._seconds = sorted(pair.second for pair in self._pairs.values())
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _sides(self, side):
+        if side is None:
+            return (self._firsts, self._seconds)
+        elif side == SIDE_FIRST:
+            return (self._firsts,)
+        elif side == SIDE_SECOND:
+            return (self._seconds,)
+        raise ValueError("side must be None, SIDE_FIRST or SIDE_SECOND")
+
+    def _iterate_range(self, values, low, high, inclusive, reverse):
+        if low is None:
+            start = 0
+        elif inclusive[0]:
+            start = bisect_left(values, low)
+        else:
+            start = bisect_right(values, low)
+        if high is None:
+            stop = len(values)
+        elif inclusive[1]:
+            stop = bisect_right(values, high)
+        else:
+            stop = bisect_left(values, high)
+        if reverse:
+            positions = range(stop - 1, start - 1, -1)
+        else:
+            positions = range(start, stop)
+        for position in positions:
+            yield values[position]
+
+    def _iterate_range_pairs(self, low, high, side, inclusive, reverse):
+        ranges = [
+            self._iterate_range(values, low, high, inclusive, reverse)
+            for values in self._sides(side)
+        ]
+        values = ranges[0] if len(ranges) == 1 else merge(
+            *ranges, reverse=reverse
+        )
+        for value in values:
+            yield self._index[value].copy()
+
+    def range_pairs(
+        self,
+        low=None,
+        high=None,
+        side=None,
+        inclusive=(True, True),
+        reverse=False,
+        stream=False
+    ):
+        """
+        Returns the pairs with a value between low and high, ordered by that
+        value. Without low and high, every pair is returned in sorted order.
+
+        Example
+        -------
+
+            >>> my_cv = SortedCoupledValues({1: "one", 5: "five", 9: "nine"})
+            >>> my_cv.range_pairs(2, 9, side=SIDE_FIRST)
+            [CoupledPair(5, 'five'), CoupledPair(9, 'nine')]
+            >>> my_cv.range_pairs(side=SIDE_SECOND, reverse=True)
+            [CoupledPair(1, 'one'), CoupledPair(9, 'nine'), ...]
+
+        Parameters
+        ----------
+        low: object, optional
+            Lower bound, or None for no lower bound
+
+        high: object, optional
+            Upper bound, or None for no upper bound
+
+        side: str, optional
+            SIDE_FIRST or SIDE_SECOND to only look at the first or second
+            values of the pairs. If None, a pair is returned once for each of
+            its values in the range
+
+        inclusive: tuple of bool = (True, True)
+            Whether low and high themselves are in the range
+
+        reverse: bool = False
+            Whether to return the pairs from the highest value to the lowest
+
+        stream: bool = False
+            If True, return a generator instead of a list
+
+        Raises
+        ------
+        ValueError
+            If side is not None, SIDE_FIRST or SIDE_SECOND
+
+        Returns
+        -------
+        pairs: list or generator of CoupledPair
+        """
+        self._sides(side)
+        pairs = self._iterate_range_pairs(low, high, side, inclusive, reverse)
+        if stream:
+            return pairs
+        return list(pairs)
+
+    def floor(self, key, side=None):
+        """
+        Returns the greatest value in the set that is less than or equal to
+        key.
+
+        Parameters
+        ----------
+        key: object
+
+        side: str, optional
+            SIDE_FIRST or SIDE_SECOND to only look at the first or second
+            values of the pairs
+
+        Raises
+        ------
+        KeyError
+            If there is no such value and error_mode is ERROR_ON
+
+        Returns
+        -------
+        value: object
+        """
+        candidates = []
+        for values in self._sides(side):
+            position = bisect_right(values, key)
+            if position:
+                candidates.append(values[position - 1])
+        if not candidates:
+            return self._missing_value(key)
+        return max(candidates)
+
+    def ceiling(self, key, side=None):
+        """
+        Returns the smallest value in the set that is greater than or equal to
+        key.
+
+        Parameters
+        ----------
+        key: object
+
+        side: str, optional
+            SIDE_FIRST or SIDE_SECOND to only look at the first or second
+            values of the pairs
+
+        Raises
+        ------
+        KeyError
+            If there is no such value and error_mode is ERROR_ON
+
+        Returns
+        -------
+        value: object
+        """
+        candidates = []
+        for values in self._sides(side):
+            position = bisect_left(values, key)
+            if position < len(values):
+                candidates.append(values[position])
+        if not candidates:
+            return self._missing_value(key)
+        return min(candidates)
+
+    def nearest(self, key, side=None):
+        """
+        Returns the value in the set that is closest to key, which must support
+        subtraction, such as a number or a datetime. If two values are equally
+        close, the smaller one is returned.
+
+        Parameters
+        ----------
+        key: object
+
+        side: str, optional
+            SIDE_FIRST or SIDE_SECOND to only look at the first or second
+            values of the pairs
+
+        Raises
+        ------
+        KeyError
+            If the set is empty and error_mode is ERROR_ON
+
+        Returns
+        -------
+        value: object
+        """
+        candidates = []
+        for values in self._sides(side):
+            position = bisect_left(values, key)
+            if position < len(values):
+                candidates.append(values[position])
+            if position:
+                candidates.append(values[position - 1])
+        if not candidates:
+            return self._missing_value(key)
+        return min(candidates, key=lambda value: (abs(value - key), value))
+
+    # - ## ~~~~~~~~~~~~~~~~~~~ VALIDATION SECTION ~~~~~~~~~~~~~~~~~~~ ##
+
+    def _validate_changed(self):
+        changed = bool(self._changed)
+        duplicates = super()._validate_changed()
+        if changed:
+            self._sort_values()
+        return duplicates
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _update(self, key, value):
+        pair = self._find_pair(key)
+        if pair is None or isinstance(pair, FrozenCoupledPair):
+            # Frozen pairs are replaced through _discard_pair and _insert_pair
+            return super()._update(key, value)
+        if pair.first == key:
+            values = self._seconds
+        else:
+            values = self._firsts
+        self._check_values((value,), values)
+        old_value = pair.counterpart(key)
+        super()._update(key, value)
+        _remove_sorted(values, old_value)
+        insort(values, value)
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _clear(self):
+        super()._clear()
+        self._firsts = []
+        self._seconds = []
+        return None
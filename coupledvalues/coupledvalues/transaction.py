@@ -0,0 +1,409 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import _unique_values
+from coupledvalues.coupledvalues.coupledvalues import create_pairs
+from coupledvalues.errors import *
+
+__all__ = [
+    "Transaction"
+]
+
+
+class _StagedPair(object):
+    # The future state of one pair. origin is the pair of the set it replaces,
+    # or None for a new pair.
+
+    __slots__ = ("first", "second", "origin")
+
+    def __init__(self, first, second, origin=None):
+        self.first = first
+        self.second = second
+        self.origin = origin
+
+
+class Transaction(object):
+    """
+    Batch of updates, pushes and pops that is applied to a CoupledValues all at
+    once. Changes are staged in the transaction without touching the set, and
+    lookups through the transaction see the staged changes. Pairs only have to
+    be valid once every change has been staged, so values can be swapped
+    between pairs or renamed in chains, such as a -> b followed by b -> c.
+
+    commit checks the staged pairs in a single pass, using the index of the set
+    for the pairs that were not changed, and then applies every change, or none
+    of them if a pair would clash or the set rejects a pair. rollback drops the
+    staged changes. Used as a context manager, the transaction is committed
+    when the block exits normally and rolled back if it raises.
+
+    Use CoupledValues.transaction or CoupledValues.apply_batch rather than
+    creating one directly.
+
+    Example
+    -------
+
+        >>> my_cv = CoupledValues({"a": 1, "b": 2})
+        >>> with my_cv.transaction() as batch:
+        ...     batch["a"] = 2  # Would clash with ("b", 2) on its own
+        ...     batch["b"] = 1
+        >>> my_cv
+        CoupledValues([('a', 2), ('b', 1)])
+
+    Parameters
+    ----------
+    values: BaseCoupledValues
+
+    Returns
+    -------
+    Transaction
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(self, values):
+        self._values = values
+        self._staged = {}
+        self._index = {}
+        self._replaced = {}
+        self._replaced_pairs = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._closed:
+            return False
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def push(self, pairs):
+        """
+        Stages new pairs. See CoupledValues.push.
+
+        Parameters
+        ----------
+        pairs: CoupledPair, list, set, tuple, dict, iterable or
+        BaseCoupledValues
+
+        Returns
+        -------
+        None
+        """
+        self._check_open()
+        for pair in create_pairs(pairs):
+            self._add(_StagedPair(pair.first, pair.second))
+        return None
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STAGING SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("the transaction is already closed")
+        return None
+
+    def _key(self, value):
+        # Values are compared under the same key that the set indexes them by,
+        # so that a KeyedCoupledValues finds "ALICE" in the pair of "Alice"
+        key_func = self._values._index_key
+        if key_func is None:
+            return value
+        return key_func(value)
+
+    def _same(self, value, other):
+        return self._key(value) == self._key(other)
+
+    def _add(self, staged):
+        self._staged[id(staged)] = staged
+        self._index_value(staged.first, staged)
+        self._index_value(staged.second, staged)
+        return None
+
+    def _index_value(self, value, staged):
+        try:
+            self._index[self._key(value)] = staged
+        except TypeError:
+            pass
+        return None
+
+    def _unindex_value(self, value, staged):
+        key = self._key(value)
+        try:
+            if self._index.get(key) is staged:
+                del self._index[key]
+        except TypeError:
+            pass
+        return None
+
+    def _is_replaced(self, pair):
+        # Typed sets build a new pair on every lookup, so pairs of the set are
+        # told apart by their first value
+        try:
+            return self._key(pair.first) in self._replaced
+        except TypeError:
+            return any(
+                self._same(pair.first, other.first)
+                for other in self._replaced_pairs
+            )
+
+    def _replace(self, pair):
+        try:
+            self._replaced[self._key(pair.first)] = pair
+        except TypeError:
+            pass
+        self._replaced_pairs.append(pair)
+        staged = _StagedPair(pair.first, pair.second, pair)
+        self._add(staged)
+        return staged
+
+    def _find(self, key):
+        try:
+            staged = self._index.get(self._key(key))
+        except TypeError:
+            staged = None
+            for other in self._staged.values():
+                if (
+                    self._same(other.first, key)
+                    or self._same(other.second, key)
+                ):
+                    staged = other
+        if staged is not None:
+            return staged
+        pair = self._values._find_pair(key)
+        if pair is None or self._is_replaced(pair):
+            return None
+        return self._replace(pair)
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.get_value(key)
+
+    def contains(self, key):
+        """
+        Checks if a key is in one of the pairs of the set, with the staged
+        changes applied.
+
+        Parameters
+        ----------
+        key: object
+
+        Returns
+        -------
+        exists: bool
+        """
+        self._check_open()
+        return self._find(key) is not None
+
+    def get_value(self, key):
+        """
+        Gets the counterpart of key, with the staged changes applied.
+
+        Parameters
+        ----------
+        key: object
+
+        Raises
+        ------
+        KeyError
+            If the key does not exist and the error_mode of the set is ERROR_ON
+
+        Returns
+        -------
+        value: object
+        """
+        self._check_open()
+        staged = self._find(key)
+        if staged is None:
+            return self._values._missing_value(key)
+        return staged.second if self._same(staged.first, key) else staged.first
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __setitem__(self, key, value):
+        self.update(key, value)
+        return None
+
+    def update(self, key, value):
+        """
+        Stages replacing the counterpart of key with value, or adding the pair
+        (key, value) if key does not exist. See CoupledValues.update.
+
+        Parameters
+        ----------
+        key: object
+
+        value: object
+
+        Raises
+        ------
+        ValueError
+            If key == value
+
+        Returns
+        -------
+        None
+        """
+        self._check_open()
+        if self._same(key, value):
+            raise ValueError("key cannot be the same as value")
+        staged = self._find(key)
+        if staged is None:
+            self._add(_StagedPair(key, value))
+            return None
+        if self._same(staged.first, key):
+            self._unindex_value(staged.second, staged)
+            staged.second = value
+        else:
+            self._unindex_value(staged.first, staged)
+            staged.first = value
+        self._index_value(value, staged)
+        return None
+
+    def commit(self):
+        """
+        Checks the staged pairs and applies every staged change to the set.
+
+        Raises
+        ------
+        ClashingError
+            If a value would be in more than one pair. Nothing is changed
+
+        Returns
+        -------
+        None
+        """
+        self._check_open()
+        self._values._apply_transaction(self)
+        self._closed = True
+        return None
+
+    def _find_clashes(self):
+        seen = set()
+        unhashable_values = []
+        clashing_values = []
+        for staged in self._staged.values():
+            for value in (staged.first, staged.second):
+                key = self._key(value)
+                try:
+                    if key in seen:
+                        clashing_values.append(value)
+                        continue
+                    seen.add(key)
+                except TypeError:
+                    if any(key == other for other in unhashable_values):
+                        clashing_values.append(value)
+                        continue
+                    unhashable_values.append(key)
+                pair = self._values._find_pair(value)
+                if pair is not None and not self._is_replaced(pair):
+                    clashing_values.append(value)
+        return _unique_values(clashing_values)
+
+    def _apply(self):
+        clashing_values = self._find_clashes()
+        if clashing_values:
+            raise ClashingError.from_values(clashing_values)
+        # The new pairs are made the way the set makes its own pairs, so a
+        # set that converts its pairs rejects a pair before anything changes.
+        # Frozen pairs stay frozen.
+        values = self._values
+        new_pairs = []
+        for staged in self._staged.values():
+            if isinstance(staged.origin, FrozenCoupledPair):
+                pair_type = type(staged.origin)
+            else:
+                pair_type = values._pair_type
+            new_pairs.append(
+                values._convert_pair(pair_type(staged.first, staged.second))
+            )
+        discarded = []
+        inserted = []
+        try:
+            for pair in self._replaced_pairs:
+                self._values._discard_pair(pair)
+                discarded.append(pair)
+            for pair in new_pairs:
+                self._values._insert_pair(pair)
+                inserted.append(pair)
+        except BaseException:
+            for pair in reversed(inserted):
+                self._values._discard_pair(pair)
+            for pair in discarded:
+                self._values._insert_pair(pair)
+            raise
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def pop(self, key):
+        """
+        Stages removing the pair of key and returns its counterpart.
+
+        Parameters
+        ----------
+        key: object
+
+        Raises
+        ------
+        KeyError
+            If key does not exist and the error_mode of the set is ERROR_ON
+
+        Returns
+        -------
+        value: object
+            Popped value, None if key not found and error_mode is ERROR_OFF
+        """
+        self._check_open()
+        staged = self._find(key)
+        if staged is None:
+            return self._values._missing_value(key)
+        del self._staged[id(staged)]
+        self._unindex_value(staged.first, staged)
+        self._unindex_value(staged.second, staged)
+        return staged.second if self._same(staged.first, key) else staged.first
+
+    def rollback(self):
+        """
+        Drops every staged change. The set is left as it was.
+
+        Returns
+        -------
+        None
+        """
+        self._check_open()
+        self._staged.clear()
+        self._index.clear()
+        self._closed = True
+        return None
@@ -0,0 +1,364 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import operator
+import sys
+
+from coupledpairs import *
+from coupledvalues.constants import *
+from coupledvalues.coupledvalues.basecoupledvalues import _MISSING
+from coupledvalues.coupledvalues.coupledvalues import (
+    _iterate_created_pairs,
+    CoupledValues
+)
+from coupledvalues.errors import *
+
+__all__ = [
+    "build_typed",
+    "IntCoupledValues",
+    "StrCoupledValues"
+]
+
+
+def build_typed(
+    init_values=[],
+    error_mode=ERROR_ON,
+    value_type=None,
+    chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Creates the most specialised set for init_values: a StrCoupledValues if
+    every value is a str, an IntCoupledValues if every value is an int, or a
+    CoupledValues otherwise.
+
+    Example
+    -------
+
+        >>> type(build_typed({"en": "English", "fr": "French"})).__name__
+        'StrCoupledValues'
+        >>> type(build_typed({1: "one"})).__name__
+        'CoupledValues'
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    value_type: type, optional
+        str or int to choose the set without looking at the values, or None to
+        detect it
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    Raises
+    ------
+    ValueError
+        If value_type is not None, str or int
+
+    TypeError
+        If value_type is given and one of the values is not of that type
+
+    Returns
+    -------
+    new_cv: CoupledValues
+    """
+    if value_type not in {None, str, int}:
+        raise ValueError("value_type must be None, str or int")
+    if value_type is None:
+        init_values = list(_iterate_created_pairs(init_values))
+        value_types = set()
+        for pair in init_values:
+            value_types.add(type(pair.first))
+            value_types.add(type(pair.second))
+            if len(value_types) > 1:
+                break
+        if value_types == {str} or value_types == {int}:
+            value_type = value_types.pop()
+    cls = {str: StrCoupledValues, int: IntCoupledValues}.get(
+        value_type, CoupledValues
+    )
+    return cls(init_values, error_mode=error_mode, chunk_size=chunk_size)
+
+
+class _TypedCoupledValues(CoupledValues):
+    """
+    Base class of the sets that only hold values of one type. No CoupledPair is
+    kept: the pairs are stored in two dictionaries, one mapping the first value
+    of every pair to its second value and one mapping the second value to the
+    first, so lookups are a single dictionary lookup on a value of a known type
+    and each pair costs two dictionary entries. Pairs are created on the fly
+    when they are handed out, so modifying them does not change the set.
+
+    Updating the first value of a pair moves the pair to the end of the set.
+    """
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ CREATE rud ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __init__(
+        self,
+        init_values=[],
+        error_mode=ERROR_ON,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None
+    ):
+        self._forward = {}
+        self._backward = {}
+        super().__init__(
+            init_values,
+            error_mode=error_mode,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+
+    @classmethod
+    def _convert(cls, value):
+        return value
+
+    def _convert_pair(self, pair):
+        return CoupledPair(
+            self._convert(pair.first), self._convert(pair.second)
+        )
+
+    # - ## ~~~~~~~~~~~~~~~~~~~~~ STORAGE SECTION ~~~~~~~~~~~~~~~~~~~~~ ##
+
+    # Pairs are converted with _convert_pair before they get here, so their
+    # values are stored as they are
+
+    def _insert_pair(self, pair):
+        self._forward[pair.first] = pair.second
+        self._backward[pair.second] = pair.first
+        return None
+
+    def _insert_pairs(self, pairs):
+        forward = self._forward
+        backward = self._backward
+        for pair in pairs:
+            forward[pair.first] = pair.second
+            backward[pair.second] = pair.first
+        return None
+
+    def _discard_pair(self, pair):
+        second = self._forward.pop(pair.first)
+        del self._backward[second]
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ c READ ud ~~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def __len__(self):
+        return len(self._forward)
+
+    def _lookup(self, key):
+        try:
+            value = self._forward.get(key, _MISSING)
+            if value is _MISSING:
+                value = self._backward.get(key, _MISSING)
+        except TypeError:
+            return _MISSING
+        return value
+
+    def _find_pair(self, key):
+        # The pair is built from the stored values rather than from key, which
+        # may only be equal to the stored value, such as 1.0 for 1
+        try:
+            second = self._forward.get(key, _MISSING)
+            if second is not _MISSING:
+                return CoupledPair(self._backward[second], second)
+            first = self._backward.get(key, _MISSING)
+            if first is not _MISSING:
+                return CoupledPair(first, self._forward[first])
+        except TypeError:
+            pass
+        return None
+
+    _lookup_methods = ("_lookup", "_find_pair")
+
+    def _lookup_cost(self, key):
+        # 1 probe of the dict of first values, then 1 of the dict of second
+        # values if key is not a first value, with 1 comparison for the one
+        # that holds key. Reading the other value of the pair is not counted
+        try:
+            if key in self._forward:
+                return 1, 1
+            return 2, int(key in self._backward)
+        except TypeError:
+            return 0, 0
+
+    def _contains(self, key):
+        return self._lookup(key) is not _MISSING
+
+    def _get_many(self, keys, default=_MISSING):
+        lookup = self._lookup
+        for key in keys:
+            value = lookup(key)
+            if value is _MISSING:
+                yield self._missing_value(key, default)
+            else:
+                yield value
+
+    def _contains_many(self, keys):
+        lookup = self._lookup
+        for key in keys:
+            yield lookup(key) is not _MISSING
+
+    def _iterate_pairs(self):
+        for first, second in self._forward.items():
+            yield CoupledPair(first, second)
+
+    def _iterate_values(self):
+        return iter(self._forward.items())
+
+    def get_value(self, key):
+        value = self._lookup(key)
+        if value is _MISSING:
+            return self._missing_value(key)
+        return value
+
+    get_value.__doc__ = CoupledValues.get_value.__doc__
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~ cr UPDATE d ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _update(self, key, value):
+        if key == value:
+            raise ValueError("key cannot be the same as value")
+        if self._lookup(key) is _MISSING:
+            raise KeyError(f"{key} does not exist")
+        value = self._convert(value)
+        if self._contains(value):
+            raise ClashingError(f"{value} is already in the set.")
+        if key in self._forward:
+            self._forward[key], old_value = value, self._forward[key]
+            del self._backward[old_value]
+            self._backward[value] = key
+        else:
+            self._backward[key], old_value = value, self._backward[key]
+            del self._forward[old_value]
+            self._forward[value] = key
+        return None
+
+    ### ~~~~~~~~~~~~~~~~~~~~~~~~~~ cru DELETE ~~~~~~~~~~~~~~~~~~~~~~~~~~ ###
+
+    def _clear(self):
+        super()._clear()
+        self._forward.clear()
+        self._backward.clear()
+        return None
+
+
+class StrCoupledValues(_TypedCoupledValues):
+    """
+    CoupledValues that only holds str values. Every value is interned with
+    sys.intern, so equal strings from different sources share one object, and
+    looking up an interned string usually matches on identity without comparing
+    characters. The pairs are kept in two dictionaries instead of as
+    CoupledPair objects, which uses much less memory than CoupledValues. See
+    build_typed to choose between this and CoupledValues automatically.
+
+    Example
+    -------
+
+        >>> locales = StrCoupledValues({"en": "English", "fr": "French"})
+        >>> locales["French"]
+        'fr'
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    progress: callable, optional
+
+    Raises
+    ------
+    TypeError
+        If any of the values is not a str
+
+    Returns
+    -------
+    StrCoupledValues
+    """
+
+    @classmethod
+    def _convert(cls, value):
+        if not isinstance(value, str):
+            raise TypeError(
+                f"StrCoupledValues only accepts str, not {type(value).__name__}"
+            )
+        return sys.intern(str(value))
+
+
+class IntCoupledValues(_TypedCoupledValues):
+    """
+    CoupledValues that only holds int values. Any integer type, such as a NumPy
+    integer, is converted to int when it is added, so lookups only ever compare
+    ints. The pairs are kept in two dictionaries instead of as CoupledPair
+    objects, which uses much less memory than CoupledValues. See build_typed to
+    choose between this and CoupledValues automatically, and
+    NumericCoupledValues for vectorised lookups with NumPy.
+
+    Example
+    -------
+
+        >>> ids = IntCoupledValues({10: 1000, 11: 1001})
+        >>> ids[1001]
+        11
+
+    Parameters
+    ----------
+    init_values: CoupledPair, list, set, tuple, dict, iterable or
+    BaseCoupledValues
+
+    error_mode: str = ERROR_ON
+
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    progress: callable, optional
+
+    Raises
+    ------
+    TypeError
+        If any of the values is not an integer, or is a bool
+
+    Returns
+    -------
+    IntCoupledValues
+    """
+
+    @classmethod
+    def _convert(cls, value):
+        if isinstance(value, bool):
+            raise TypeError("IntCoupledValues does not accept bool")
+        try:
+            return operator.index(value)
+        except TypeError:
+            raise TypeError(
+                f"IntCoupledValues only accepts int, not {type(value).__name__}"
+            )
@@ -31,3 +31,4 @@ from coupledvalues.errors.existenceerrors import (
     AlreadyExistsError,
     ClashingError
 )
+from coupledvalues.errors.replicationerrors import SequenceGapError
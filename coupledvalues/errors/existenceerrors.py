@@ -31,4 +31,27 @@ class AlreadyExistsError(BaseExistenceError):
 
 
 class ClashingError(BaseExistenceError):
-    pass
+    """
+    Raised when a pair shares a value with another pair. The values that
+    caused the clash are kept in the values attribute.
+    """
+
+    def __init__(self, message="", values=()):
+        super().__init__(message)
+        self.values = list(values)
+
+    @classmethod
+    def from_values(cls, values, limit=10):
+        """
+        Build a ClashingError reporting every value in values. Only the first
+        limit values are written into the message.
+        """
+        values = list(values)
+        shown = ", ".join(repr(value) for value in values[:limit])
+        if len(values) > limit:
+            shown += f" and {len(values) - limit} more"
+        return cls(
+            f"{len(values)} value(s) clash with other pairs in the set: "
+            + shown,
+            values
+        )
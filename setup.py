@@ -12,7 +12,7 @@ with open("README.md", "r") as fh:
 
 setup(
     name="coupled-values",
-    version="1.0.0",
+    version="1.1.0",
     author="GrayChrysTea",
 
     packages=[
@@ -24,6 +24,9 @@ setup(
     ],
 
     install_requires=[],
+    extras_require={
+        "numpy": ["numpy"]
+    },
 
     description="A set of coupled values where either side can be the key.",
     long_description=long_description,
@@ -0,0 +1,86 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import types
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestBatchQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.my_cv = CoupledValues({"a": "b", "c": "d", "e": ["f"]})
+
+    def test_get_many(self):
+        self.assertEqual(
+            self.my_cv.get_many(["a", "d", ["f"]]), ["b", "c", "e"]
+        )
+        self.assertEqual(
+            self.my_cv.get_many(["a", "z"], default="?"), ["b", "?"]
+        )
+        with self.assertRaises(KeyError):
+            self.my_cv.get_many(["a", "z"])
+
+    def test_contains_many(self):
+        self.assertEqual(
+            self.my_cv.contains_many(["a", "z", "d", ["f"], {"z": 1}]),
+            [True, False, True, True, False]
+        )
+
+    def test_stream_is_lazy(self):
+        values = self.my_cv.get_many(["a", "z"], stream=True)
+        self.assertIsInstance(values, types.GeneratorType)
+        self.assertEqual(next(values), "b")
+        with self.assertRaises(KeyError):
+            next(values)
+        exists = self.my_cv.contains_many(iter(["a"]), stream=True)
+        self.assertEqual(list(exists), [True])
+
+    def test_pop_many(self):
+        self.assertEqual(self.my_cv.pop_many(["a", "d"]), ["b", "c"])
+        self.assertEqual(len(self.my_cv), 1)
+        self.assertEqual(self.my_cv.pop_many(["a"], default=None), [None])
+
+    def test_pop_many_keeps_earlier_pops_on_error(self):
+        with self.assertRaises(KeyError):
+            self.my_cv.pop_many(["a", "z", "c"])
+        self.assertNotIn("a", self.my_cv)
+        self.assertIn("c", self.my_cv)
+
+    def test_pop_many_stream_pops_as_consumed(self):
+        values = self.my_cv.pop_many(["a", "c"], stream=True)
+        self.assertEqual(len(self.my_cv), 3)
+        self.assertEqual(next(values), "b")
+        self.assertEqual(len(self.my_cv), 2)
+
+    def test_error_off(self):
+        my_cv = CoupledValues({"a": "b"}, error_mode=ERROR_OFF)
+        self.assertEqual(my_cv.get_many(["a", "z"]), ["b", None])
+        self.assertEqual(my_cv.pop_many(["z", "a"]), [None, "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"
+))
+
+import suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def setUp(self):
+        self._items = suite.ITEMS_PER_MEASUREMENT
+        suite.ITEMS_PER_MEASUREMENT = 20
+
+    def tearDown(self):
+        suite.ITEMS_PER_MEASUREMENT = self._items
+
+    def test_calls_for(self):
+        self.assertEqual(suite.calls_for(5, True, False), 4)
+        self.assertEqual(suite.calls_for(50, True, False), 1)
+        self.assertEqual(suite.calls_for(5, False, True), 5)
+        self.assertEqual(suite.calls_for(5, False, False), 20)
+
+    def test_run_every_benchmark(self):
+        results = suite.run([10], ["int", "tuple"], log=io.StringIO())
+        names = {result["name"] for result in results["results"]}
+        self.assertEqual(names, {name for name, *_ in suite.BENCHMARKS})
+        self.assertEqual(len(results["results"]), 2 * len(suite.BENCHMARKS))
+
+    def test_temporary_push_is_measured_per_pushed_item(self):
+        results = suite.run([10], ["int"], ["temporary_push"],
+                            log=io.StringIO())["results"]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["calls"], 20)
+
+    def test_sets_are_built_before_timing(self):
+        fixture = suite.Fixture(5, suite.KEY_TYPES["int"])
+        sets = fixture.fresh_sets()
+        self.assertEqual(len(sets), 4)
+        self.assertEqual(len({id(my_cv) for my_cv in sets}), 4)
+        self.assertTrue(all(len(my_cv) == 5 for my_cv in sets))
+        for name in ("CoupledValues.clear", "CoupledValues.pop_many"):
+            factory = next(
+                function for other, *_, function in suite.BENCHMARKS
+                if other == name
+            )
+            call = factory(fixture)
+            for index in range(4):
+                call(index)
+
+    def test_compare_flags_regressions(self):
+        def result(items_per_second):
+            return {"results": [{
+                "name": "bench", "key_type": "int", "size": 10,
+                "items_per_second": items_per_second
+            }]}
+
+        out = io.StringIO()
+        regressions = suite.compare(result(100.0), result(50.0), 0.1, out)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("REGRESSION", out.getvalue())
+        self.assertEqual(suite.compare(result(100.0), result(95.0), 0.1, out),
+                         [])
+
+
+if __name__ == "__main__":
+    unittest.main()
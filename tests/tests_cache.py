@@ -0,0 +1,136 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def pairs_of(my_cv):
+    return sorted((pair.first, pair.second) for pair in my_cv._iterate_pairs())
+
+
+class TestCacheCoupledValues(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        my_cv = CacheCoupledValues(max_size=2)
+        my_cv.push([("t1", "ann"), ("t2", "bob")])
+        self.assertEqual(my_cv["ann"], "t1")
+        my_cv.push(("t3", "cid"))
+        self.assertFalse(my_cv.contains("bob"))
+        self.assertTrue(my_cv.contains("t1"))
+        self.assertEqual(my_cv.cache_info()["evictions"], 1)
+
+    def test_expiry(self):
+        clock = Clock()
+        my_cv = CacheCoupledValues(
+            {"a": 1, "b": 2}, ttl=10, clock=clock, error_mode=ERROR_OFF
+        )
+        clock.now = 5
+        my_cv.set_ttl("b", 100)
+        clock.now = 12
+        self.assertIsNone(my_cv.get_value("a"))
+        self.assertEqual(my_cv.get_value(2), "b")
+        clock.now = 200
+        self.assertEqual(my_cv.expire(), 1)
+        self.assertEqual(len(my_cv), 0)
+        self.assertEqual(my_cv.cache_info()["expirations"], 2)
+
+
+class TestCacheReporting(unittest.TestCase):
+
+    def test_snapshot_keeps_evicted_pairs(self):
+        my_cv = CacheCoupledValues({"a": "b", "c": "d"}, max_size=2)
+        with my_cv.snapshot() as snapshot:
+            my_cv.push(("e", "f"))
+            self.assertEqual(len(snapshot), 2)
+            self.assertEqual(sorted(snapshot.to_list()),
+                             [("a", "b"), ("c", "d")])
+            self.assertEqual(snapshot["a"], "b")
+
+    def test_feed_reports_evictions(self):
+        my_cv = CacheCoupledValues({"a": "b", "c": "d"}, max_size=2)
+        replica = CoupledValues(my_cv)
+        feed = my_cv.change_feed()
+        my_cv.push(("e", "f"))
+        deltas = feed.drain()
+        self.assertEqual(deltas, [
+            (1, DELTA_POP, "a", None),
+            (2, DELTA_PUSH, "e", "f")
+        ])
+        replica.apply_deltas(deltas)
+        my_cv.push([("g", "h"), ("i", "j"), ("k", "l")])
+        replica.apply_deltas(feed.drain())
+        self.assertEqual(pairs_of(replica), pairs_of(my_cv))
+
+    def test_cache_replica(self):
+        my_cv = CacheCoupledValues({"a": "b", "c": "d"}, max_size=2)
+        replica = CacheCoupledValues(my_cv, max_size=2)
+        feed = my_cv.change_feed()
+        my_cv.push(("e", "f"))
+        my_cv["c"]
+        my_cv.push(("g", "h"))
+        replica.apply_deltas(feed.drain())
+        self.assertEqual(pairs_of(replica), pairs_of(my_cv))
+
+    def test_feed_reports_expiry(self):
+        clock = Clock()
+        my_cv = CacheCoupledValues({"a": "b"}, ttl=10, clock=clock)
+        feed = my_cv.change_feed()
+        clock.now = 20
+        self.assertFalse(my_cv.contains("a"))
+        my_cv.push(("c", "d"))
+        clock.now = 40
+        my_cv.push(("a", "e"))
+        self.assertEqual(feed.drain(), [
+            (1, DELTA_POP, "a", None),
+            (2, DELTA_PUSH, "c", "d"),
+            (3, DELTA_POP, "c", None),
+            (4, DELTA_PUSH, "a", "e")
+        ])
+
+    def test_transaction(self):
+        my_cv = CacheCoupledValues({"a": "b", "c": "d"}, max_size=2)
+        replica = CoupledValues(my_cv)
+        feed = my_cv.change_feed()
+        with my_cv.transaction() as transaction:
+            transaction.update("a", "x")
+            transaction.push(("e", "f"))
+        replica.apply_deltas(feed.drain())
+        self.assertEqual(pairs_of(replica), pairs_of(my_cv))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+def pairs_of(my_cv):
+    return sorted((pair.first, pair.second) for pair in my_cv._iterate_pairs())
+
+
+class TestChangeFeed(unittest.TestCase):
+
+    def test_deltas(self):
+        my_cv = CoupledValues({"a": "b", "x": "y"})
+        feed = my_cv.change_feed()
+        my_cv.update("a", "c")
+        my_cv.push(("d", "e"))
+        my_cv.pop("x")
+        self.assertEqual(feed.drain(), [
+            (1, DELTA_UPDATE, "a", "c"),
+            (2, DELTA_PUSH, "d", "e"),
+            (3, DELTA_POP, "x", None)
+        ])
+        self.assertEqual(feed.drain(), [])
+        feed.close()
+        my_cv.push(("f", "g"))
+        self.assertEqual(feed.drain(), [])
+        self.assertNotIn("_push_pair", vars(my_cv))
+
+    def test_replica(self):
+        my_cv = CoupledValues({"a": "b", "x": "y"})
+        replica = CoupledValues(my_cv)
+        feed = my_cv.change_feed()
+        my_cv.update("a", "c")
+        my_cv.push([("d", "e"), ("f", "g")])
+        my_cv.pop("f")
+        with my_cv.transaction() as transaction:
+            transaction.update("d", "q")
+        replica.apply_deltas(feed.drain())
+        self.assertEqual(pairs_of(replica), pairs_of(my_cv))
+        my_cv.clear()
+        replica.apply_deltas(feed.drain())
+        self.assertEqual(len(replica), 0)
+
+    def test_reset_delta(self):
+        my_cv = CoupledValues({1: 2})
+        feed = my_cv.change_feed()
+        my_cv.push((3, 4))
+        replica = CoupledValues()
+        replica.apply_deltas([feed.reset_delta()])
+        self.assertEqual(pairs_of(replica), pairs_of(my_cv))
+
+    def test_sequence_gap(self):
+        my_cv = CoupledValues({"a": "b"})
+        replica = CoupledValues(my_cv)
+        feed = my_cv.change_feed()
+        my_cv.pop("a")
+        my_cv.push(("c", "d"))
+        my_cv.push(("e", "f"))
+        deltas = feed.drain()
+        replica.apply_deltas(deltas[:1])
+        with self.assertRaises(SequenceGapError):
+            replica.apply_deltas(deltas[2:])
+        self.assertFalse(replica.contains("e"))
+
+
+class TestDetachOrder(unittest.TestCase):
+
+    def test_stats_disabled_before_feed(self):
+        my_cv = CoupledValues({"a": "b"})
+        my_cv.enable_stats()
+        feed = my_cv.change_feed()
+        my_cv.disable_stats()
+        my_cv.push(("c", "d"))
+        my_cv.pop("a")
+        self.assertEqual(feed.drain(), [
+            (1, DELTA_PUSH, "c", "d"),
+            (2, DELTA_POP, "a", None)
+        ])
+        self.assertEqual(my_cv.stats(), {})
+        feed.close()
+        self.assertEqual(vars(my_cv).keys() & {"_push_pair", "_update"}, set())
+
+    def test_stats_disabled_before_snapshot(self):
+        my_cv = CoupledValues({"a": "b"})
+        my_cv.enable_stats()
+        snapshot = my_cv.snapshot()
+        my_cv.disable_stats()
+        my_cv.pop("a")
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(snapshot.to_list(), [("a", "b")])
+        snapshot.close()
+
+    def test_feed_closed_before_stats(self):
+        my_cv = CoupledValues({"a": "b"})
+        feed = my_cv.change_feed()
+        my_cv.enable_stats()
+        feed.close()
+        my_cv.push(("c", "d"))
+        my_cv["c"]
+        self.assertEqual(feed.drain(), [])
+        self.assertEqual(my_cv.stats()["get_pair"]["calls"], 1)
+        my_cv.disable_stats()
+        self.assertEqual(vars(my_cv).keys() & {"_push_pair", "_update"}, set())
+        self.assertIsNone(my_cv._method_hooks)
+
+    def test_modified_pairs_after_detach(self):
+        my_cv = CoupledValues({"a": "b"})
+        feed = my_cv.change_feed()
+        my_cv.enable_stats()
+        feed.close()
+        pair = my_cv._find_pair("a")
+        pair.modify("a", "c")
+        self.assertEqual(my_cv["a"], "c")
+        self.assertEqual(feed.drain(), [])
+        my_cv.disable_stats()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestCompose(unittest.TestCase):
+
+    def setUp(self):
+        self.ids = CoupledValues({1: "v-1", 2: "v-2", 3: "v-3"})
+        self.skus = CoupledValues({"SKU-A": "v-1", "SKU-C": "v-3",
+                                   "SKU-Z": "v-9"})
+
+    def test_inner_join(self):
+        composed = self.ids.compose(self.skus)
+        self.assertEqual(composed.to_str(),
+                         "CoupledValues([(1, 'SKU-A'), (3, 'SKU-C')])")
+
+    def test_outer_join(self):
+        composed, left, right = self.ids.compose(self.skus, JOIN_OUTER)
+        self.assertEqual(len(composed), 2)
+        self.assertEqual(left, [CoupledPair(2, "v-2")])
+        self.assertEqual(right, [CoupledPair("SKU-Z", "v-9")])
+
+    def test_join_on_first_values(self):
+        names = CoupledValues({1: "one", 3: "three"})
+        composed = self.ids.compose(names, side=SIDE_FIRST)
+        self.assertEqual(composed["v-3"], "three")
+        self.assertEqual(len(composed), 2)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            self.ids.compose(self.skus, how="JOIN_LEFT")
+        with self.assertRaises(ValueError):
+            self.ids.compose(self.skus, side="SIDE_BOTH")
+
+    def test_invalid_results(self):
+        with self.assertRaises(ValueError):
+            CoupledValues({1: "x"}).compose({"x": 1})
+        with self.assertRaises(ClashingError):
+            CoupledValues({1: "x", "y": 2}).compose({"x": "y", 2: "z"})
+
+    def test_class_of_result(self):
+        self.assertIs(type(self.ids.compose(self.skus)), CoupledValues)
+        left = ConcurrentCoupledValues({1: "v-1"}, error_mode=ERROR_OFF)
+        composed = left.compose(ConcurrentCoupledValues({"v-1": "a"}))
+        self.assertIsInstance(composed, ConcurrentCoupledValues)
+        self.assertIsNone(composed["missing"])
+        composed = left.compose(self.skus)
+        self.assertIs(type(composed), CoupledValues)
+        self.assertIsNone(composed["missing"])
+
+    def test_keyed_result_has_keyed_pairs(self):
+        users = KeyedCoupledValues({"Alice": "u-1"}, key_func=normalize_text)
+        emails = KeyedCoupledValues({"U-1": "alice@example.com"},
+                                    key_func=normalize_text)
+        composed = users.compose(emails)
+        self.assertIsInstance(composed, KeyedCoupledValues)
+        self.assertEqual(composed["ALICE"], "alice@example.com")
+        for pair in composed._iterate_pairs():
+            self.assertIsInstance(pair, KeyedCoupledPair)
+
+    def test_identity_result_has_identity_pairs(self):
+        composed = IdentityCoupledValues({"a": "b"}).compose(
+            IdentityCoupledValues({"b": "c"})
+        )
+        self.assertEqual(composed["a"], "c")
+        for pair in composed._iterate_pairs():
+            self.assertIsInstance(pair, IdentityCoupledPair)
+
+    def test_typed_result(self):
+        composed = StrCoupledValues({"a": "b"}).compose(
+            StrCoupledValues({"b": "c"})
+        )
+        self.assertIsInstance(composed, StrCoupledValues)
+        self.assertEqual(composed["c"], "a")
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numeric(self):
+        left = NumericCoupledValues({1: 10, 2: 20, 3: 30})
+        right = NumericCoupledValues({10: 100, 30: 300, 40: 400})
+        composed, unmatched_left, unmatched_right = left.compose(
+            right, JOIN_OUTER
+        )
+        self.assertIsInstance(composed, NumericCoupledValues)
+        self.assertEqual(composed[1], 100)
+        self.assertEqual(composed[300], 3)
+        self.assertEqual(unmatched_left, [CoupledPair(2, 20)])
+        self.assertEqual(unmatched_right, [CoupledPair(40, 400)])
+        self.assertIs(type(left.compose({10: "x"})), CoupledValues)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestReadWriteLock(unittest.TestCase):
+
+    def test_locks_are_reentrant(self):
+        lock = ReadWriteLock()
+        with lock.reading():
+            with lock.reading():
+                pass
+        with lock.writing():
+            with lock.writing():
+                with lock.reading():
+                    pass
+        # The lock is free again, so another thread can write
+        def write():
+            with lock.writing():
+                pass
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+
+    def test_read_lock_cannot_be_upgraded(self):
+        lock = ReadWriteLock()
+        with lock.reading():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+        with lock.writing():
+            pass
+
+    def test_release_without_holding(self):
+        lock = ReadWriteLock()
+        with self.assertRaises(RuntimeError):
+            lock.release_read()
+        with self.assertRaises(RuntimeError):
+            lock.release_write()
+
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def read():
+            with lock.reading():
+                both_inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(both_inside.broken)
+
+
+class TestConcurrentCoupledValues(unittest.TestCase):
+
+    def test_behaves_like_coupled_values(self):
+        my_cv = ConcurrentCoupledValues({"a": 1, "b": 2})
+        self.assertEqual(my_cv["a"], 1)
+        self.assertEqual(my_cv[2], "b")
+        my_cv["a"] = 3
+        self.assertEqual(my_cv.pop("b"), 2)
+        self.assertEqual(len(my_cv), 1)
+        self.assertEqual(my_cv.get_many(["a", 3], stream=True).__next__(), 3)
+
+    def test_lock_is_reentrant(self):
+        my_cv = ConcurrentCoupledValues({"a": 1})
+        with my_cv.lock.reading():
+            with my_cv.lock.writing():
+                my_cv["a"] = 2
+                self.assertEqual(my_cv["a"], 2)
+        with self.assertRaises(RuntimeError):
+            my_cv.lock.release_write()
+
+    def test_read_write_lock(self):
+        lock = ReadWriteLock()
+        my_cv = ConcurrentCoupledValues({"a": 1}, lock=lock)
+        self.assertIs(my_cv.lock, lock)
+        with lock.reading():
+            self.assertEqual(my_cv["a"], 1)
+            self.assertTrue(my_cv.contains(1))
+        my_cv["a"] = 2
+        self.assertEqual(my_cv.pop("a"), 2)
+        self.assertEqual(len(my_cv), 0)
+
+    def test_update_if(self):
+        my_cv = ConcurrentCoupledValues({"a": 1})
+        self.assertFalse(my_cv.update_if("a", 2, 3))
+        self.assertFalse(my_cv.update_if("z", 1, 3))
+        self.assertTrue(my_cv.update_if("a", 1, 3))
+        self.assertEqual(my_cv["a"], 3)
+        with self.assertRaises(ClashingError):
+            ConcurrentCoupledValues({"a": 1, "b": 2}).update_if("a", 1, "b")
+
+    def test_pop_if(self):
+        my_cv = ConcurrentCoupledValues({"a": 1})
+        self.assertFalse(my_cv.pop_if("a", 2))
+        self.assertFalse(my_cv.pop_if("z", 1))
+        self.assertTrue(my_cv.pop_if(1, "a"))
+        self.assertEqual(len(my_cv), 0)
+
+    def test_pop_if_is_reported(self):
+        my_cv = ConcurrentCoupledValues({"a": 1, "b": 2})
+        feed = my_cv.change_feed()
+        snapshot = my_cv.snapshot()
+        self.assertTrue(my_cv.pop_if("a", 1))
+        self.assertEqual([delta[1:3] for delta in feed.drain()],
+                         [(DELTA_POP, "a")])
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot["a"], 1)
+        feed.close()
+
+    def test_concurrent_writers(self):
+        my_cv = ConcurrentCoupledValues()
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(offset, offset + 200):
+                    my_cv.push((i, -i - 1))
+                    my_cv.update_if(i, -i - 1, f"v{i}")
+                    if i % 2:
+                        my_cv.pop_if(f"v{i}", i)
+                    len(my_cv)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [
+            threading.Thread(target=work, args=(offset,))
+            for offset in range(0, 800, 200)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(my_cv), 400)
+        self.assertEqual(my_cv[0], "v0")
+        self.assertNotIn(1, my_cv)
+
+
+if __name__ == "__main__":
+    unittest.main()
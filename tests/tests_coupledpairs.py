@@ -0,0 +1,112 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import pickle
+import unittest
+
+from coupledpairs import *
+from coupledvalues import CoupledValues
+
+
+class TestCoupledPair(unittest.TestCase):
+
+    def test_slots(self):
+        pair = CoupledPair("a", "b")
+        self.assertFalse(hasattr(pair, "__dict__"))
+        with self.assertRaises(AttributeError):
+            pair.extra = 1
+
+    def test_counterpart_and_modify(self):
+        pair = CoupledPair("a", "b")
+        self.assertEqual(pair.counterpart("a"), "b")
+        self.assertEqual(pair.counterpart("b"), "a")
+        pair.modify("a", "c")
+        self.assertEqual((pair.first, pair.second), ("a", "c"))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            CoupledPair("a", "a")
+        pair = CoupledPair("a", "b")
+        with self.assertRaises(KeyError):
+            pair.counterpart("z")
+        with self.assertRaises(KeyError):
+            pair.modify("z", "c")
+        with self.assertRaises(ValueError):
+            pair.modify("a", "a")
+
+    def test_pickle_and_copy(self):
+        pair = CoupledPair("a", [1])
+        for other in (pickle.loads(pickle.dumps(pair)), pair.copy()):
+            self.assertEqual(other, pair)
+            self.assertIsNot(other, pair)
+
+
+class TestFrozenCoupledPair(unittest.TestCase):
+
+    def test_hash_ignores_order(self):
+        pairs = {FrozenCoupledPair("a", "b"), FrozenCoupledPair("b", "a")}
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual(
+            hash(FrozenCoupledPair("a", "b")), hash(FrozenCoupledPair("b", "a"))
+        )
+
+    def test_immutable(self):
+        pair = FrozenCoupledPair("a", "b")
+        with self.assertRaises(AttributeError):
+            pair.first = "c"
+        with self.assertRaises(AttributeError):
+            del pair.second
+        with self.assertRaises(TypeError):
+            pair.modify("a", "c")
+
+    def test_replace_returns_new_pair(self):
+        pair = FrozenCoupledPair("a", "b")
+        new_pair = pair.replace("a", "c")
+        self.assertIsInstance(new_pair, FrozenCoupledPair)
+        self.assertEqual((new_pair.first, new_pair.second), ("a", "c"))
+        self.assertEqual((pair.first, pair.second), ("a", "b"))
+        with self.assertRaises(KeyError):
+            pair.replace("z", "c")
+        with self.assertRaises(ValueError):
+            pair.replace("a", "a")
+        with self.assertRaises(ValueError):
+            FrozenCoupledPair(1, 1)
+
+    def test_pickle(self):
+        pair = FrozenCoupledPair("a", "b")
+        other = pickle.loads(pickle.dumps(pair))
+        self.assertIsInstance(other, FrozenCoupledPair)
+        self.assertEqual(hash(other), hash(pair))
+
+    def test_frozen_pairs_in_a_set(self):
+        my_cv = CoupledValues([FrozenCoupledPair("a", "b")])
+        my_cv.update("a", "c")
+        pair = my_cv._find_pair("a")
+        self.assertIsInstance(pair, FrozenCoupledPair)
+        self.assertEqual(pair.second, "c")
+        self.assertNotIn("b", my_cv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import gc
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class Token(object):
+    """
+    Object that cannot be compared with ==, so that tests fail if the set
+    ever compares values instead of telling them apart by identity.
+    """
+
+    def __eq__(self, other):
+        raise AssertionError("== called on a Token")
+
+    __hash__ = None
+
+
+class TestIdentityCoupledPair(unittest.TestCase):
+
+    def test_is_similar_to(self):
+        first, second = Token(), Token()
+        pair = IdentityCoupledPair(first, second)
+        self.assertTrue(pair.is_similar_to(IdentityCoupledPair(second, first)))
+        self.assertFalse(
+            pair.is_similar_to(IdentityCoupledPair(first, Token()))
+        )
+
+    def test_same_values(self):
+        token = Token()
+        with self.assertRaises(ValueError) as context:
+            IdentityCoupledPair(token, token)
+        self.assertEqual(str(context.exception),
+                         "pair values cannot be the same")
+
+
+class TestIdentityCoupledValues(unittest.TestCase):
+
+    def test_lookups_by_identity(self):
+        tokens = [Token() for _ in range(4)]
+        my_cv = IdentityCoupledValues(
+            [(tokens[0], tokens[1]), (tokens[2], tokens[3])]
+        )
+        self.assertIs(my_cv[tokens[0]], tokens[1])
+        self.assertIs(my_cv[tokens[3]], tokens[2])
+        self.assertFalse(my_cv.contains(Token()))
+        with self.assertRaises(ClashingError):
+            my_cv.push((tokens[2], Token()))
+
+    def test_equal_values_in_different_pairs(self):
+        my_cv = IdentityCoupledValues([([1], "a"), ([1], "b")])
+        self.assertEqual(len(my_cv), 2)
+
+    def test_update(self):
+        first, second, third = Token(), Token(), Token()
+        my_cv = IdentityCoupledValues([(first, second)])
+        my_cv.update(first, third)
+        self.assertIs(my_cv[first], third)
+        self.assertFalse(my_cv.contains(second))
+        with self.assertRaises(ValueError) as context:
+            my_cv._update(first, first)
+        self.assertEqual(str(context.exception),
+                         "key cannot be the same as value")
+
+
+class TestWeakIdentityCoupledValues(unittest.TestCase):
+
+    def test_collected_pairs_are_removed(self):
+        tokens = [Token() for _ in range(4)]
+        my_cv = IdentityCoupledValues(
+            [(tokens[0], tokens[1]), (tokens[2], tokens[3])], weak=True
+        )
+        del tokens[0]
+        gc.collect()
+        self.assertEqual(len(my_cv), 1)
+        self.assertFalse(my_cv.contains(tokens[0]))
+
+    def test_feed_reports_collected_pairs(self):
+        tokens = [Token() for _ in range(4)]
+        my_cv = IdentityCoupledValues(
+            [(tokens[0], tokens[1]), (tokens[2], tokens[3])], weak=True
+        )
+        feed = my_cv.change_feed()
+        survivor = tokens[1]
+        del tokens[0]
+        gc.collect()
+        len(my_cv)
+        deltas = feed.drain()
+        self.assertEqual(len(deltas), 1)
+        self.assertEqual(deltas[0][:2], (1, DELTA_POP))
+        self.assertIs(deltas[0][2], survivor)
+
+    def test_collected_during_push(self):
+        tokens = [Token() for _ in range(4)]
+        my_cv = IdentityCoupledValues([(tokens[0], tokens[1])], weak=True)
+        feed = my_cv.change_feed()
+        del tokens[0]
+        gc.collect()
+        my_cv.push((tokens[1], tokens[2]))
+        self.assertEqual(
+            [delta[1] for delta in feed.drain()], [DELTA_POP, DELTA_PUSH]
+        )
+
+    def test_snapshot_length(self):
+        tokens = [Token() for _ in range(4)]
+        my_cv = IdentityCoupledValues(
+            [(tokens[0], tokens[1]), (tokens[2], tokens[3])], weak=True
+        )
+        with my_cv.snapshot() as snapshot:
+            del tokens[0]
+            gc.collect()
+            self.assertEqual(len(my_cv), 1)
+            self.assertEqual(len(snapshot), 2)
+            self.assertEqual(len(snapshot.to_list()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from coupledpairs import *
+from coupledvalues import *
+from coupledvalues.coupledvalues.instrumentation import (
+    INSTRUMENTED_OPERATIONS,
+    OperationStats
+)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_counts_calls(self):
+        my_cv = CoupledValues({"a": "b", "c": "d"})
+        my_cv.enable_stats()
+        my_cv["a"]
+        my_cv["d"]
+        my_cv.push(("e", "f"))
+        stats = my_cv.stats()
+        self.assertEqual(stats["get_pair"]["calls"], 2)
+        self.assertEqual(stats["find_clashes"]["calls"], 1)
+        self.assertEqual(sum(stats["get_pair"]["histogram"].values()), 2)
+        self.assertGreater(stats["get_pair"]["seconds"], 0)
+
+    def lookup_counts(self, my_cv, key, operation="find_pair"):
+        my_cv.enable_stats()
+        my_cv.get_value(key)
+        stats = my_cv.stats()[operation]
+        my_cv.disable_stats()
+        return stats["probes"], stats["comparisons"]
+
+    def test_counts_of_lookups(self):
+        my_cv = CoupledValues([("a", "b"), (["x"], "y"), (["z"], "w")])
+        self.assertEqual(self.lookup_counts(my_cv, "a"), (1, 1))
+        # Unhashable keys skip the index and try each value in turn
+        self.assertEqual(self.lookup_counts(my_cv, ["z"]), (2, 3))
+        # Operations are charged with the lookups they make
+        self.assertEqual(self.lookup_counts(my_cv, ["z"], "get_pair"), (2, 3))
+
+    def test_counts_of_other_storages(self):
+        keyed = KeyedCoupledValues({"Alice": "u-1"}, key_func=normalize_text)
+        self.assertEqual(self.lookup_counts(keyed, " alice "), (1, 1))
+        first, second = ["a"], ["b"]
+        identity = IdentityCoupledValues([(first, second)])
+        self.assertEqual(self.lookup_counts(identity, second), (1, 2))
+        typed = StrCoupledValues({"a": "b"}, error_mode=ERROR_OFF)
+        self.assertEqual(self.lookup_counts(typed, "a"), (1, 1))
+        self.assertEqual(self.lookup_counts(typed, "b"), (2, 1))
+        self.assertEqual(self.lookup_counts(typed, "c"), (2, 0))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_counts_of_numeric_storage(self):
+        my_cv = NumericCoupledValues({i: -i for i in range(1, 1000)})
+        # A binary search of the 1998 sorted keys, after the pending keys
+        self.assertEqual(self.lookup_counts(my_cv, 5), (12, 13))
+        my_cv.push((5000, 6000))
+        # The key is pending, so its slot is found without a search
+        self.assertEqual(self.lookup_counts(my_cv, 5000), (1, 2))
+        my_cv.enable_stats()
+        my_cv.contains_many([5, 5000, 7])
+        stats = my_cv.stats()["find_many"]
+        # 3 searches of the sorted keys, then 1 of the 2 pending keys
+        self.assertEqual((stats["probes"], stats["comparisons"]), (35, 45))
+
+    def test_callback(self):
+        calls = []
+        my_cv = CoupledValues({"a": "b"})
+        my_cv.enable_stats(callback=lambda *args: calls.append(args))
+        my_cv.contains("a")
+        operation, seconds, probes, comparisons = calls[0]
+        self.assertEqual((operation, probes, comparisons),
+                         ("find_pair", 1, 1))
+        self.assertGreaterEqual(seconds, 0)
+
+    def test_failed_calls_are_recorded(self):
+        my_cv = CoupledValues({"a": "b"})
+        my_cv.enable_stats()
+        with self.assertRaises(KeyError):
+            my_cv["missing"]
+        self.assertEqual(my_cv.stats()["get_pair"]["calls"], 1)
+
+    def test_reset_and_disable(self):
+        my_cv = CoupledValues({"a": "b"})
+        self.assertEqual(my_cv.stats(), {})
+        my_cv.reset_stats()
+        my_cv.enable_stats()
+        my_cv["a"]
+        my_cv.reset_stats()
+        self.assertEqual(my_cv.stats()["get_pair"]["calls"], 0)
+        my_cv.disable_stats()
+        self.assertEqual(my_cv.stats(), {})
+        for name in INSTRUMENTED_OPERATIONS:
+            self.assertNotIn(name, vars(my_cv))
+        self.assertEqual(my_cv["a"], "b")
+
+    def test_operation_stats(self):
+        stats = OperationStats()
+        stats.record(0.5, probes=3, comparisons=4)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["calls"], 1)
+        self.assertEqual(snapshot["mean_seconds"], 0.5)
+        self.assertEqual(snapshot["probes"], 3)
+        self.assertEqual(snapshot["comparisons"], 4)
+        self.assertEqual(sum(snapshot["histogram"].values()), 1)
+        self.assertEqual(OperationStats().snapshot()["mean_seconds"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
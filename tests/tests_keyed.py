@@ -0,0 +1,125 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+def users():
+    return KeyedCoupledValues(
+        {"Alice": "u-1", "Bob": "u-2"}, key_func=str.lower
+    )
+
+
+class TestKeyedCoupledPair(unittest.TestCase):
+
+    def test_same_keys(self):
+        with self.assertRaises(ValueError) as context:
+            KeyedCoupledPair("a", "A", str.lower)
+        self.assertEqual(str(context.exception),
+                         "pair values cannot be the same")
+
+
+class TestKeyedCoupledValues(unittest.TestCase):
+
+    def test_lookups_by_key(self):
+        my_cv = users()
+        self.assertEqual(my_cv["ALICE"], "u-1")
+        self.assertEqual(my_cv["U-2"], "Bob")
+        self.assertTrue(my_cv.contains("bob"))
+        with self.assertRaises(ClashingError):
+            my_cv.push(("alice", "u-3"))
+
+    def test_update(self):
+        my_cv = users()
+        my_cv.update("alice", "u-9")
+        self.assertEqual(my_cv["Alice"], "u-9")
+        with self.assertRaises(ValueError) as context:
+            my_cv._update("alice", "ALICE")
+        self.assertEqual(str(context.exception),
+                         "key cannot be the same as value")
+
+    def test_key_func_must_be_callable(self):
+        with self.assertRaises(TypeError):
+            KeyedCoupledValues(key_func=None)
+
+
+class TestKeyedTransaction(unittest.TestCase):
+
+    def test_update_keeps_stored_value(self):
+        my_cv = users()
+        with my_cv.transaction() as transaction:
+            transaction["ALICE"] = "u-9"
+            self.assertEqual(transaction["alice"], "u-9")
+            self.assertEqual(transaction["U-9"], "Alice")
+        self.assertEqual(
+            sorted(my_cv._iterate_values()),
+            [("Alice", "u-9"), ("Bob", "u-2")]
+        )
+
+    def test_update_twice(self):
+        my_cv = users()
+        with my_cv.transaction() as transaction:
+            transaction["alice"] = "u-8"
+            transaction["ALICE"] = "u-9"
+        self.assertEqual(my_cv["Alice"], "u-9")
+        self.assertFalse(my_cv.contains("u-8"))
+
+    def test_pop(self):
+        my_cv = users()
+        with my_cv.transaction() as transaction:
+            self.assertEqual(transaction.pop("BOB"), "u-2")
+            self.assertNotIn("bob", transaction)
+        self.assertFalse(my_cv.contains("Bob"))
+
+    def test_update_to_same_key(self):
+        my_cv = users()
+        with self.assertRaises(ValueError):
+            with my_cv.transaction() as transaction:
+                transaction.update("alice", "ALICE")
+
+    def test_clashes_by_key(self):
+        my_cv = users()
+        with self.assertRaises(ClashingError):
+            with my_cv.transaction() as transaction:
+                transaction.push([("Carol", "u-3"), ("CAROL", "u-4")])
+        with self.assertRaises(ClashingError):
+            with my_cv.transaction() as transaction:
+                transaction.push(("BOB", "u-5"))
+        self.assertEqual(len(my_cv), 2)
+
+    def test_swap(self):
+        my_cv = users()
+        with my_cv.transaction() as transaction:
+            transaction["alice"] = "U-2"
+            transaction["bob"] = "u-1"
+        self.assertEqual(my_cv["Alice"], "U-2")
+        self.assertEqual(my_cv["Bob"], "u-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
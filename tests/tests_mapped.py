@@ -0,0 +1,137 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import os
+import pickle
+import tempfile
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestMappedCoupledValues(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "table.cpv")
+        self.source = CoupledValues([
+            ("a", 1), (b"raw", 2.5), (None, False), (-(2 ** 70), "big")
+        ])
+        save_mapped(self.source, self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookups_from_either_side(self):
+        with open_mapped(self.path) as table:
+            self.assertEqual(len(table), 4)
+            self.assertEqual(table["a"], 1)
+            self.assertEqual(table[1], "a")
+            self.assertEqual(table[2.5], b"raw")
+            self.assertIsNone(table[False])
+            self.assertEqual(table["big"], -(2 ** 70))
+            self.assertIn(b"raw", table)
+            self.assertNotIn("z", table)
+            self.assertNotIn(["a"], table)
+            self.assertEqual(
+                list(table._iterate_values()),
+                list(self.source._iterate_values())
+            )
+
+    def test_equal_numbers_are_found(self):
+        with open_mapped(self.path) as table:
+            self.assertEqual(table[1.0], "a")
+
+    def test_many_values(self):
+        source = CoupledValues([(i, str(i)) for i in range(2000)])
+        save_mapped(source, self.path)
+        with open_mapped(self.path) as table:
+            self.assertEqual(table["1999"], 1999)
+            self.assertEqual(table.get_many([0, "7"]), ["0", 7])
+
+    def test_missing_keys(self):
+        with open_mapped(self.path) as table:
+            with self.assertRaises(KeyError):
+                table["z"]
+        with open_mapped(self.path, error_mode=ERROR_OFF) as table:
+            self.assertIsNone(table["z"])
+
+    def test_stats_count_slots_read(self):
+        with open_mapped(self.path, error_mode=ERROR_OFF) as table:
+            table.enable_stats()
+            self.assertIn("a", table)
+            table["z"]
+            stats = table.stats()["find_pair"]
+            self.assertEqual(stats["calls"], 2)
+            self.assertGreaterEqual(stats["probes"], 2)
+            # Only the value whose hash matches "a" is read and compared
+            self.assertEqual(stats["comparisons"], 1)
+
+    def test_read_only(self):
+        with open_mapped(self.path) as table:
+            with self.assertRaises(TypeError):
+                table.push(("b", 3))
+            with self.assertRaises(TypeError):
+                table.update("a", 5)
+            with self.assertRaises(TypeError):
+                table.pop("a")
+            with self.assertRaises(TypeError):
+                table.clear()
+            self.assertEqual(table["a"], 1)
+
+    def test_temporary_push(self):
+        with open_mapped(self.path) as table:
+            overlay = table + ("b", 3)
+            overlay.update("a", 5)
+            self.assertEqual(overlay["a"], 5)
+            self.assertEqual(overlay["b"], 3)
+            self.assertEqual(table["a"], 1)
+
+    def test_pickle_reopens_path(self):
+        with open_mapped(self.path) as table:
+            copy = pickle.loads(pickle.dumps(table))
+        with copy:
+            self.assertEqual(copy["a"], 1)
+
+    def test_unsupported_values(self):
+        with self.assertRaises(TypeError):
+            save_mapped(CoupledValues([("a", [1])]), self.path)
+        with self.assertRaises(TypeError):
+            save_mapped({"a": 1}, self.path)
+
+    def test_invalid_files(self):
+        bad_path = os.path.join(self.directory.name, "bad.cpv")
+        with open(bad_path, "wb") as fh:
+            fh.write(b"short")
+        with self.assertRaises(ValueError):
+            open_mapped(bad_path)
+        with open(bad_path, "wb") as fh:
+            fh.write(b"x" * 128)
+        with self.assertRaises(ValueError):
+            open_mapped(bad_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import pickle
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestNumericCoupledValues(unittest.TestCase):
+
+    def test_single_lookups(self):
+        ids = NumericCoupledValues({10: 1000, 11: 1001})
+        self.assertEqual(ids[10], 1000)
+        self.assertEqual(ids[1001], 11)
+        self.assertIn(11, ids)
+        self.assertNotIn(12, ids)
+        self.assertNotIn("10", ids)
+
+    def test_batch_lookup(self):
+        ids = NumericCoupledValues.from_arrays(
+            np.arange(5000), np.arange(5000) + 100000
+        )
+        keys = np.array([100004, 3, 104999])
+        self.assertEqual(ids.get_value(keys).tolist(), [4, 100003, 4999])
+        self.assertEqual(
+            ids.contains([1, -1, 100000]).tolist(), [True, False, True]
+        )
+        self.assertEqual(ids.get_many([0, 100001]), [100000, 1])
+        self.assertEqual(ids.contains_many([0, 7, -5]), [True, True, False])
+
+    def test_batch_lookup_of_pending_values(self):
+        ids = NumericCoupledValues.from_arrays(
+            np.arange(5000), np.arange(5000) + 100000
+        )
+        # Few enough changes to stay in the pending index
+        ids.push([(-1, -2), (-3, -4)])
+        ids.update(0, 7777777)
+        ids.pop(1)
+        self.assertTrue(ids._pending)
+        self.assertEqual(
+            ids.get_value(np.array([-2, -3, 0, 7777777])).tolist(),
+            [-1, -4, 7777777, 0]
+        )
+        self.assertEqual(
+            ids.contains(np.array([100000, 1, 100001, -1])).tolist(),
+            [False, False, False, True]
+        )
+        ids.push((-5, -6))
+        self.assertEqual(ids.get_many([-5, -6]), [-6, -5])
+
+    def test_batch_lookup_of_missing_keys(self):
+        ids = NumericCoupledValues({1: 2}, error_mode=ERROR_OFF)
+        values = ids.get_value(np.array([1, 5]))
+        self.assertEqual(values.mask.tolist(), [False, True])
+        filled = NumericCoupledValues({1: 2}, ERROR_OFF, missing=-1)
+        self.assertEqual(filled.get_value([5, 2]).tolist(), [-1, 1])
+        strict = NumericCoupledValues({1: 2})
+        with self.assertRaises(KeyError):
+            strict.get_value(np.array([1, 5]))
+
+    def test_update_and_pop(self):
+        ids = NumericCoupledValues({1: 2, 3: 4})
+        ids.update(1, 5)
+        self.assertEqual(ids[5], 1)
+        self.assertNotIn(2, ids)
+        self.assertEqual(ids.pop(4), 3)
+        self.assertEqual(len(ids), 1)
+        ids.update(9, 10)
+        self.assertEqual(ids[10], 9)
+        with self.assertRaises(ClashingError):
+            ids.update(1, 5)
+        with self.assertRaises(ValueError):
+            ids.update(1, 1)
+
+    def test_rejects_values_that_are_not_int64(self):
+        with self.assertRaises(OverflowError):
+            NumericCoupledValues.from_arrays(
+                np.array([2 ** 63 + 5], dtype=np.uint64), [1]
+            )
+        with self.assertRaises(OverflowError):
+            NumericCoupledValues({2 ** 63 + 5: 1})
+        with self.assertRaises(OverflowError):
+            NumericCoupledValues({2 ** 70: 1})
+        with self.assertRaises(TypeError):
+            NumericCoupledValues.from_arrays(np.array([1.5]), [1])
+        with self.assertRaises(TypeError):
+            NumericCoupledValues({"a": 1})
+        ids = NumericCoupledValues({1: 2})
+        with self.assertRaises(OverflowError):
+            ids.update(1, 2 ** 64)
+        with self.assertRaises(TypeError):
+            ids.update(1, "b")
+        self.assertEqual(ids[1], 2)
+        unsigned = NumericCoupledValues.from_arrays(
+            np.array([2 ** 63 - 1], dtype=np.uint64), [1]
+        )
+        self.assertEqual(unsigned[1], 2 ** 63 - 1)
+
+    def test_clashes(self):
+        with self.assertRaises(ValueError):
+            NumericCoupledValues.from_arrays([1, 2], [1, 3])
+        with self.assertRaises(ValueError):
+            NumericCoupledValues.from_arrays([1, 2], [3])
+        with self.assertRaises(ClashingError) as context:
+            NumericCoupledValues.from_arrays([1, 2, 3], [4, 1, 5])
+        self.assertEqual(context.exception.values, [1])
+
+    def test_pickle(self):
+        ids = NumericCoupledValues({1: 2, 3: 4}, ERROR_OFF, missing=0)
+        ids.pop(1)
+        copy = pickle.loads(pickle.dumps(ids))
+        self.assertEqual(list(copy._iterate_values()), [(3, 4)])
+        self.assertEqual(copy.get_value([9]).tolist(), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
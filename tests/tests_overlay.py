@@ -0,0 +1,103 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import pickle
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestOverlayCoupledValues(unittest.TestCase):
+
+    def setUp(self):
+        self.base = CoupledValues({"a": 1, "b": 2})
+
+    def test_temporary_push_does_not_change_base(self):
+        overlay = self.base + ("c", 3)
+        self.assertIsInstance(overlay, OverlayCoupledValues)
+        self.assertEqual(overlay["c"], 3)
+        self.assertEqual(overlay["a"], 1)
+        self.assertEqual(len(overlay), 3)
+        self.assertNotIn("c", self.base)
+        self.assertEqual(len(overlay._pairs), 1)
+
+    def test_update_copies_pair_into_overlay(self):
+        overlay = self.base.temporary_push([])
+        overlay.update("a", 10)
+        self.assertEqual(overlay["a"], 10)
+        self.assertNotIn(1, overlay)
+        self.assertEqual(self.base["a"], 1)
+        self.assertEqual(len(overlay), 2)
+
+    def test_pop_hides_base_pair(self):
+        overlay = self.base.temporary_push([("c", 3)])
+        self.assertEqual(overlay.pop("a"), 1)
+        self.assertEqual(overlay.pop(3), "c")
+        self.assertNotIn("a", overlay)
+        self.assertIn("a", self.base)
+        self.assertEqual(len(overlay), 1)
+        self.assertEqual(list(overlay._iterate_values()), [("b", 2)])
+
+    def test_clashes_with_base(self):
+        with self.assertRaises(ClashingError):
+            self.base + ("a", 5)
+        overlay = self.base + ("c", 3)
+        with self.assertRaises(ClashingError):
+            overlay.push(("d", 2))
+        with self.assertRaises(ClashingError):
+            overlay.update("c", 1)
+
+    def test_materialize(self):
+        overlay = self.base + ("c", 3)
+        overlay.pop("b")
+        new_cv = overlay.materialize()
+        self.assertIs(type(new_cv), CoupledValues)
+        self.assertEqual(
+            list(new_cv._iterate_values()), [("a", 1), ("c", 3)]
+        )
+        new_cv.update("a", 9)
+        self.assertEqual(self.base["a"], 1)
+
+    def test_clear(self):
+        overlay = self.base + ("c", 3)
+        overlay.clear()
+        self.assertEqual(len(overlay), 0)
+        self.assertEqual(len(self.base), 2)
+
+    def test_pickle(self):
+        overlay = self.base + ("c", 3)
+        overlay.pop("a")
+        copy = pickle.loads(pickle.dumps(overlay))
+        self.assertEqual(len(copy), 2)
+        self.assertNotIn("a", copy)
+        self.assertEqual(copy["c"], 3)
+
+    def test_base_must_be_a_set(self):
+        with self.assertRaises(TypeError):
+            OverlayCoupledValues({"a": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+from coupledvalues.coupledvalues.parallelbuild import (
+    _find_clashes_spawned,
+    _find_clashes_forked
+)
+
+
+class TestBuildParallel(unittest.TestCase):
+
+    def test_builds_the_same_set(self):
+        values = [(i, f"id-{i}") for i in range(500)]
+        my_cv = build_parallel(values, workers=2, partitions=3)
+        self.assertIsInstance(my_cv, CoupledValues)
+        self.assertEqual(len(my_cv), 500)
+        self.assertEqual(my_cv["id-42"], 42)
+        self.assertEqual(my_cv[499], "id-499")
+
+    def test_single_worker(self):
+        my_cv = build_parallel({"a": 1, "b": 2}, workers=1)
+        self.assertEqual(my_cv["b"], 2)
+
+    def test_every_clash_is_reported(self):
+        values = [(i, f"id-{i}") for i in range(100)]
+        values += [(5, "x"), ("y", "id-7"), ("z", "id-7")]
+        with self.assertRaises(ClashingError) as context:
+            build_parallel(values, workers=2)
+        self.assertEqual(sorted(context.exception.values, key=str),
+                         [5, "id-7"])
+
+    def test_unhashable_values_fall_back(self):
+        values = [(["a"], 1), (["b"], 2)]
+        my_cv = build_parallel(values, workers=2)
+        self.assertEqual(my_cv[2], ["b"])
+        with self.assertRaises(ClashingError) as context:
+            build_parallel(values + [(["a"], 3)], workers=2)
+        self.assertEqual(context.exception.values, [["a"]])
+
+    def test_cls_and_error_mode(self):
+        my_cv = build_parallel(
+            {"a": 1}, workers=2, error_mode=ERROR_OFF,
+            cls=ConcurrentCoupledValues
+        )
+        self.assertIsInstance(my_cv, ConcurrentCoupledValues)
+        self.assertIsNone(my_cv["missing"])
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            build_parallel({"a": 1}, workers=0)
+        with self.assertRaises(ValueError):
+            build_parallel({"a": 1}, workers=2, partitions=0)
+
+
+class _SerialExecutor(object):
+
+    def map(self, function, *iterables):
+        return map(function, *iterables)
+
+
+class TestClashSearch(unittest.TestCase):
+
+    def test_forked_and_spawned_agree(self):
+        values = ["a", 1, "b", 2, "c", 1, "a", 3]
+        executor = _SerialExecutor()
+        self.assertEqual(
+            sorted(_find_clashes_forked(values, executor, 2, 3), key=str),
+            [1, "a"]
+        )
+        self.assertEqual(
+            sorted(_find_clashes_spawned(values, executor, 3), key=str),
+            [1, "a"]
+        )
+        self.assertIsNone(_find_clashes_spawned([["a"]], executor, 2))
+        self.assertIsNone(_find_clashes_forked([["a"]], executor, 1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
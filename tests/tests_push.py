@@ -0,0 +1,75 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestBulkPush(unittest.TestCase):
+
+    def test_push_many_pairs(self):
+        my_cv = CoupledValues()
+        my_cv.push([(i, str(i)) for i in range(1000)])
+        self.assertEqual(len(my_cv), 1000)
+        self.assertEqual(my_cv["999"], 999)
+
+    def test_every_clash_is_reported(self):
+        my_cv = CoupledValues({"a": 1, "b": 2})
+        with self.assertRaises(ClashingError) as context:
+            my_cv.push([("a", 10), ("c", 2), ("d", 3), ("e", 3)])
+        self.assertEqual(sorted(context.exception.values, key=str),
+                         [2, 3, "a"])
+
+    def test_clash_within_batch(self):
+        my_cv = CoupledValues()
+        with self.assertRaises(ClashingError) as context:
+            my_cv.push([("a", 1), ("b", 1), ("a", 2)])
+        self.assertEqual(sorted(context.exception.values, key=str),
+                         [1, "a"])
+
+    def test_failed_push_leaves_set_unchanged(self):
+        my_cv = CoupledValues({"a": 1})
+        with self.assertRaises(ClashingError):
+            my_cv.push([("b", 2), ("c", 3), ("a", 4)])
+        self.assertEqual(len(my_cv), 1)
+        self.assertNotIn("b", my_cv)
+        self.assertNotIn(3, my_cv)
+
+    def test_unhashable_clashes(self):
+        my_cv = CoupledValues([(["a"], 1)])
+        with self.assertRaises(ClashingError) as context:
+            my_cv.push([(["a"], 2), (["b"], 3), (["b"], 4)])
+        self.assertEqual(context.exception.values, [["a"], ["b"]])
+
+    def test_message_is_bounded(self):
+        error = ClashingError.from_values(range(25), limit=10)
+        self.assertEqual(error.values, list(range(25)))
+        self.assertIn("25 value(s)", str(error))
+        self.assertIn("and 15 more", str(error))
+
+
+if __name__ == "__main__":
+    unittest.main()
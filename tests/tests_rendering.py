@@ -0,0 +1,75 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import io
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestRendering(unittest.TestCase):
+
+    def test_to_str(self):
+        my_cv = CoupledValues([("a", "b"), ("c", "d")])
+        self.assertEqual(my_cv.to_str(),
+                         "CoupledValues([('a', 'b'), ('c', 'd')])")
+        self.assertEqual(CoupledValues().to_str(), "CoupledValues([])")
+
+    def test_max_items(self):
+        my_cv = CoupledValues([("a", "b"), ("c", "d"), ("e", "f")])
+        self.assertEqual(my_cv.to_str(max_items=2),
+                         "CoupledValues([('a', 'b'), ('c', 'd'), ... 1 more])")
+        self.assertEqual(my_cv.to_str(max_items=0),
+                         "CoupledValues([... 3 more])")
+        self.assertEqual(my_cv.to_str(max_items=3), my_cv.to_str())
+
+    def test_repr_is_bounded(self):
+        my_cv = CoupledValues(
+            (i, -i - 1) for i in range(DEFAULT_REPR_ITEMS + 5)
+        )
+        self.assertTrue(repr(my_cv).endswith(", ... 5 more])"))
+        self.assertEqual(str(my_cv), repr(my_cv))
+        my_cv.repr_max_items = 1
+        self.assertEqual(repr(my_cv),
+                         "CoupledValues([(0, -1), ... 104 more])")
+        my_cv.repr_max_items = None
+        self.assertEqual(repr(my_cv), my_cv.to_str())
+
+    def test_write_to(self):
+        my_cv = CoupledValues((i, -i - 1) for i in range(3000))
+        fp = io.StringIO()
+        my_cv.write_to(fp)
+        self.assertEqual(fp.getvalue(), my_cv.to_str())
+        fp = io.StringIO()
+        my_cv.write_to(fp, max_items=1)
+        self.assertEqual(fp.getvalue(),
+                         "CoupledValues([(0, -1), ... 2999 more])")
+        fp = io.StringIO()
+        CoupledValues().write_to(fp)
+        self.assertEqual(fp.getvalue(), "CoupledValues([])")
+
+
+if __name__ == "__main__":
+    unittest.main()
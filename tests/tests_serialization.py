@@ -0,0 +1,118 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import io
+import pickle
+import struct
+import unittest
+import zlib
+
+from coupledpairs import *
+from coupledvalues import *
+from coupledvalues.coupledvalues.serialization import _HEADER, _MAGIC
+
+
+def _rebuild(data, count):
+    # Gives the body of data a header with another pair count and a matching
+    # checksum
+    body = data[_HEADER.size:]
+    return _HEADER.pack(_MAGIC, 1, count, zlib.crc32(body)) + body
+
+
+class TestPickle(unittest.TestCase):
+
+    def test_round_trip(self):
+        my_cv = CoupledValues(
+            [("a", "one"), (2.5, None), (b"x", True), (["u"], ("v", 0))],
+            error_mode=ERROR_OFF
+        )
+        copy = pickle.loads(pickle.dumps(my_cv))
+        self.assertIsInstance(copy, CoupledValues)
+        self.assertEqual(len(copy), 4)
+        self.assertEqual(copy["a"], "one")
+        self.assertEqual(copy[("v", 0)], ["u"])
+        self.assertIsNone(copy["missing"])
+        self.assertEqual(copy.validate(), [])
+
+    def test_frozen_pairs_stay_frozen(self):
+        my_cv = CoupledValues([FrozenCoupledPair("a", "b"), ("c", "d")])
+        copy = pickle.loads(pickle.dumps(my_cv))
+        types = {pair.first: type(pair) for pair in copy._iterate_pairs()}
+        self.assertEqual(types, {"a": FrozenCoupledPair, "c": CoupledPair})
+
+
+class TestDump(unittest.TestCase):
+
+    def test_round_trip(self):
+        my_cv = CoupledValues(
+            [("a", "one"), (2.5, None), (b"x", True), (-2 ** 70, "big")]
+        )
+        copy = loads(dumps(my_cv))
+        self.assertEqual(len(copy), 4)
+        self.assertEqual(copy[-2 ** 70], "big")
+        self.assertEqual(copy[b"x"], True)
+        self.assertEqual(copy[None], 2.5)
+        self.assertEqual(loads(dumps(CoupledValues())).to_str(),
+                         "CoupledValues([])")
+
+    def test_file_round_trip_keeps_pair_types(self):
+        fp = io.BytesIO()
+        dump(CoupledValues([FrozenCoupledPair("a", "b")]), fp)
+        fp.seek(0)
+        copy = load(fp, error_mode=ERROR_OFF, cls=ConcurrentCoupledValues)
+        self.assertIsInstance(copy, ConcurrentCoupledValues)
+        self.assertIsInstance(copy._find_pair("a"), FrozenCoupledPair)
+        self.assertIsNone(copy["missing"])
+
+    def test_unsupported_values(self):
+        with self.assertRaises(TypeError):
+            dumps(CoupledValues([(("a",), 1)]))
+        with self.assertRaises(TypeError):
+            dumps({"a": 1})
+
+    def test_corrupted_data(self):
+        data = dumps(CoupledValues({"a": "b"}))
+        with self.assertRaises(ValueError):
+            loads(b"short")
+        with self.assertRaises(ValueError):
+            loads(b"X" + data[1:])
+        with self.assertRaises(ValueError):
+            loads(data[:-1] + bytes([data[-1] ^ 1]))
+        with self.assertRaises(ValueError):
+            loads(data[:8] + struct.pack("<I", 99) + data[12:])
+        for count in (0, 2, 5):
+            with self.assertRaises(ValueError):
+                loads(_rebuild(data, count))
+
+    def test_clashes_are_checked_unless_trusted(self):
+        data = dumps(CoupledValues([("a", "b"), ("c", "d")]))
+        clashing = data.replace(b"c", b"a")
+        clashing = _rebuild(clashing, 2)
+        with self.assertRaises(ClashingError):
+            loads(clashing)
+        self.assertEqual(len(loads(clashing, trusted=True)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
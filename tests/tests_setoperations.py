@@ -0,0 +1,125 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestSetOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.left = CoupledValues({"a": "b", "c": "d"})
+
+    def test_union(self):
+        union = self.left | {"b": "a", "e": "f"}
+        self.assertEqual(len(union), 3)
+        self.assertEqual(union["e"], "f")
+        self.assertEqual(len(self.left), 2)
+        with self.assertRaises(ClashingError) as context:
+            self.left.union({"a": "x", "y": "d", "e": "f"})
+        self.assertEqual(context.exception.values, ["a", "d"])
+
+    def test_intersection(self):
+        self.assertEqual(
+            (self.left & {"b": "a", "c": "e"}).to_str(),
+            "CoupledValues([('a', 'b')])"
+        )
+        self.assertEqual(len(self.left & []), 0)
+
+    def test_difference(self):
+        self.assertEqual(
+            (self.left - {"b": "a", "c": "e"}).to_str(),
+            "CoupledValues([('c', 'd')])"
+        )
+
+    def test_symmetric_difference(self):
+        result = self.left ^ {"b": "a", "e": "f"}
+        self.assertEqual(result.to_str(),
+                         "CoupledValues([('c', 'd'), ('e', 'f')])")
+        with self.assertRaises(ClashingError):
+            self.left ^ {"a": "x"}
+
+    def test_results_are_independent(self):
+        result = self.left & self.left
+        result._find_pair("a").modify("a", "z")
+        self.assertEqual(self.left["a"], "b")
+
+    def test_keeps_error_mode_and_class(self):
+        left = ConcurrentCoupledValues({"a": "b"}, error_mode=ERROR_OFF)
+        result = left | {"c": "d"}
+        self.assertIsInstance(result, ConcurrentCoupledValues)
+        self.assertIsNone(result["missing"])
+
+
+class TestMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.left = CoupledValues({"a": "b", "c": "d"})
+
+    def test_keep_left(self):
+        merged = self.left.merge({"a": "z", "e": "f"}, MERGE_KEEP_LEFT)
+        self.assertEqual(merged["a"], "b")
+        self.assertEqual(merged["e"], "f")
+        self.assertNotIn("z", merged)
+
+    def test_keep_right(self):
+        merged = self.left.merge({"a": "d", "e": "f"}, MERGE_KEEP_RIGHT)
+        self.assertEqual(
+            merged.to_str(), "CoupledValues([('a', 'd'), ('e', 'f')])"
+        )
+
+    def test_collect(self):
+        merged, conflicts = self.left.merge({"a": "z", "e": "f"},
+                                            MERGE_COLLECT)
+        self.assertEqual(len(merged), 3)
+        self.assertEqual(
+            conflicts, [(CoupledPair("a", "b"), CoupledPair("a", "z"))]
+        )
+
+    def test_raise_lists_every_value(self):
+        with self.assertRaises(ClashingError) as context:
+            self.left.merge({"a": "x", "y": "d"})
+        self.assertEqual(context.exception.values, ["a", "d"])
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            self.left.merge({}, "MERGE_SOMETIMES")
+
+    def test_pairs_of_other_are_converted(self):
+        users = KeyedCoupledValues({"Alice": "u-1"}, key_func=normalize_text)
+        merged = users.merge({"Bob": "u-2", "ALICE": "u-1"})
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(merged["bob"], "u-2")
+        for pair in merged._iterate_pairs():
+            self.assertIsInstance(pair, KeyedCoupledPair)
+        merged = users.merge({"ALICE": "u-3"}, MERGE_KEEP_RIGHT)
+        self.assertEqual(merged["alice"], "u-3")
+        with self.assertRaises(TypeError):
+            StrCoupledValues({"a": "b"}).merge({1: 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class Token(object):
+    pass
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_unchanged_by_writes(self):
+        my_cv = CoupledValues({"a": "b", "c": "d", "e": "f"})
+        with my_cv.snapshot() as snapshot:
+            my_cv.pop("a")
+            my_cv.update("c", "x")
+            my_cv.push(("g", "h"))
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(
+                sorted(snapshot.to_list()),
+                [("a", "b"), ("c", "d"), ("e", "f")]
+            )
+            self.assertEqual(snapshot["a"], "b")
+            self.assertEqual(snapshot.get_value("d"), "c")
+            self.assertNotIn("g", snapshot)
+            self.assertNotIn("x", snapshot)
+            my_cv.clear()
+            self.assertEqual(sorted(snapshot), sorted(snapshot.to_list()))
+            self.assertEqual(len(snapshot.to_list()), 3)
+
+    def test_modified_pairs(self):
+        my_cv = CoupledValues({"a": "b"})
+        with my_cv.snapshot() as snapshot:
+            my_cv._find_pair("a").modify("a", "z")
+            self.assertEqual(snapshot["a"], "b")
+            self.assertEqual(snapshot.to_list(), [("a", "b")])
+
+    def test_pop_while_iterating(self):
+        my_cv = CoupledValues({i: -i - 1 for i in range(10)})
+        with my_cv.snapshot() as snapshot:
+            for first, second in snapshot:
+                my_cv.pop(first)
+            self.assertEqual(len(my_cv), 0)
+            self.assertEqual(len(snapshot.to_list()), 10)
+
+    def test_close(self):
+        my_cv = CoupledValues({"a": "b"})
+        snapshot = my_cv.snapshot()
+        snapshot.close()
+        with self.assertRaises(ValueError):
+            snapshot.to_list()
+        my_cv.pop("a")
+        self.assertIsNone(my_cv._mutation_hook)
+        self.assertNotIn("_remove_and_get_pair", vars(my_cv))
+
+    def test_to_coupled_values(self):
+        my_cv = SortedCoupledValues({3: "c", 1: "a"})
+        with my_cv.snapshot() as snapshot:
+            my_cv.pop(1)
+            copied = snapshot.to_coupled_values()
+        self.assertIsInstance(copied, SortedCoupledValues)
+        self.assertEqual(
+            sorted(copied._iterate_values()), [(1, "a"), (3, "c")]
+        )
+        self.assertEqual(copied._firsts, [1, 3])
+
+    def test_to_coupled_values_keyed(self):
+        my_cv = KeyedCoupledValues({"Alice": "u-1"}, key_func=str.lower)
+        with my_cv.snapshot() as snapshot:
+            copied = snapshot.to_coupled_values()
+        self.assertTrue(all(
+            isinstance(pair, KeyedCoupledPair)
+            for pair in copied._iterate_pairs()
+        ))
+        self.assertEqual(copied["ALICE"], "u-1")
+        copied.update("alice", "u-2")
+        self.assertEqual(copied["Alice"], "u-2")
+
+    def test_to_coupled_values_identity(self):
+        first, second = Token(), Token()
+        my_cv = IdentityCoupledValues([(first, second)], weak=True)
+        with my_cv.snapshot() as snapshot:
+            copied = snapshot.to_coupled_values()
+        self.assertTrue(all(
+            isinstance(pair, IdentityCoupledPair)
+            for pair in copied._iterate_pairs()
+        ))
+        self.assertIs(copied[first], second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestSortedCoupledValues(unittest.TestCase):
+
+    def setUp(self):
+        self.events = SortedCoupledValues(
+            {1000: "start", 1500: "lunch", 2000: "stop"}
+        )
+
+    def test_range_pairs(self):
+        self.assertEqual(
+            self.events.range_pairs(1200, 2000, side=SIDE_FIRST),
+            [CoupledPair(1500, "lunch"), CoupledPair(2000, "stop")]
+        )
+        self.assertEqual(
+            self.events.range_pairs(1000, 2000, side=SIDE_FIRST,
+                                    inclusive=(False, False)),
+            [CoupledPair(1500, "lunch")]
+        )
+        self.assertEqual(
+            [pair.first for pair in self.events.range_pairs(side=SIDE_FIRST)],
+            [1000, 1500, 2000]
+        )
+        self.assertEqual(
+            [pair.second
+             for pair in self.events.range_pairs(side=SIDE_SECOND,
+                                                 reverse=True)],
+            ["stop", "start", "lunch"]
+        )
+        pairs = self.events.range_pairs("l", "m", side=SIDE_SECOND,
+                                        stream=True)
+        self.assertEqual(list(pairs), [CoupledPair(1500, "lunch")])
+
+    def test_range_over_both_sides(self):
+        my_cv = SortedCoupledValues({1: 4, 3: 2, 5: 6})
+        self.assertEqual(
+            [pair.first for pair in my_cv.range_pairs(2, 4)], [3, 3, 1]
+        )
+        self.assertEqual(my_cv.floor(4), 4)
+        self.assertEqual(my_cv.ceiling(4.5), 5)
+
+    def test_floor_ceiling_nearest(self):
+        self.assertEqual(self.events.floor(1400, side=SIDE_FIRST), 1000)
+        self.assertEqual(self.events.ceiling(1400, side=SIDE_FIRST), 1500)
+        self.assertEqual(self.events.nearest(1400, side=SIDE_FIRST), 1500)
+        self.assertEqual(self.events.nearest(1250, side=SIDE_FIRST), 1000)
+        self.assertEqual(self.events.floor(1500, side=SIDE_FIRST), 1500)
+        with self.assertRaises(KeyError):
+            self.events.floor(10, side=SIDE_FIRST)
+        with self.assertRaises(KeyError):
+            self.events.ceiling(3000, side=SIDE_FIRST)
+        with self.assertRaises(KeyError):
+            SortedCoupledValues().nearest(1)
+        my_cv = SortedCoupledValues({1: 2}, error_mode=ERROR_OFF)
+        self.assertIsNone(my_cv.floor(0, side=SIDE_FIRST))
+
+    def test_invalid_side(self):
+        with self.assertRaises(ValueError):
+            self.events.range_pairs(side="SIDE_BOTH")
+        with self.assertRaises(ValueError):
+            self.events.floor(1, side="SIDE_BOTH")
+
+    def test_changes_keep_values_sorted(self):
+        self.events.push([(1200, "break"), (500, "wake")])
+        self.events[1200] = "nap"
+        self.events.pop("lunch")
+        self.assertEqual(
+            [pair.first for pair in self.events.range_pairs(side=SIDE_FIRST)],
+            [500, 1000, 1200, 2000]
+        )
+        self.assertEqual(self.events.ceiling("m", side=SIDE_SECOND), "nap")
+        self.events.clear()
+        self.assertEqual(self.events.range_pairs(), [])
+
+    def test_frozen_pairs_and_validate(self):
+        my_cv = SortedCoupledValues([FrozenCoupledPair(1, 10), (2, 20)])
+        my_cv[1] = 15
+        self.assertEqual(my_cv.floor(16, side=SIDE_SECOND), 15)
+        my_cv._find_pair(2).modify(2, 30)
+        self.assertEqual(my_cv.validate(), [])
+        self.assertEqual(my_cv.ceiling(16, side=SIDE_SECOND), 30)
+
+    def test_unsortable_values_leave_set_unchanged(self):
+        big = SortedCoupledValues((i, -i - 1) for i in range(100))
+        with self.assertRaises(TypeError):
+            big.push(("a", "b"))
+        with self.assertRaises(TypeError):
+            big.push([(1000 + i, -1000 - i) for i in range(20)] + [("a", 5000)])
+        with self.assertRaises(TypeError):
+            big.push(([1], 5000))
+        with self.assertRaises(TypeError):
+            big[0] = "a"
+        self.assertEqual(len(big), 100)
+        self.assertNotIn(1000, big)
+        self.assertEqual(big[0], -1)
+        self.assertEqual(len(big.range_pairs(side=SIDE_FIRST)), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestIndexedStorage(unittest.TestCase):
+
+    def test_lookup_from_either_side(self):
+        my_cv = CoupledValues({"a": 1, "b": 2})
+        self.assertEqual(my_cv["a"], 1)
+        self.assertEqual(my_cv[2], "b")
+        self.assertIn("b", my_cv)
+        self.assertNotIn("c", my_cv)
+
+    def test_pairs_keep_insertion_order(self):
+        my_cv = CoupledValues([(str(i), i) for i in range(100)])
+        self.assertEqual(
+            [pair.first for pair in my_cv._iterate_pairs()],
+            [str(i) for i in range(100)]
+        )
+
+    def test_update_reindexes_both_values(self):
+        my_cv = CoupledValues({"a": 1})
+        my_cv.update("a", 2)
+        self.assertEqual(my_cv["a"], 2)
+        self.assertEqual(my_cv[2], "a")
+        self.assertNotIn(1, my_cv)
+        my_cv.update("b", 3)
+        self.assertEqual(my_cv["b"], 3)
+
+    def test_pop_removes_pair_from_index(self):
+        my_cv = CoupledValues({"a": 1, "b": 2})
+        self.assertEqual(my_cv.pop(1), "a")
+        self.assertNotIn("a", my_cv)
+        self.assertNotIn(1, my_cv)
+        self.assertEqual(len(my_cv), 1)
+
+    def test_unhashable_values(self):
+        my_cv = CoupledValues([(["a"], 1), ("b", {"c": 2})])
+        self.assertEqual(my_cv[["a"]], 1)
+        self.assertEqual(my_cv[1], ["a"])
+        self.assertEqual(my_cv[{"c": 2}], "b")
+        my_cv.update(["a"], 3)
+        self.assertEqual(my_cv[3], ["a"])
+        self.assertEqual(my_cv.pop({"c": 2}), "b")
+        self.assertEqual(len(my_cv), 1)
+        with self.assertRaises(ClashingError):
+            my_cv.push((["a"], 4))
+
+    def test_clear(self):
+        my_cv = CoupledValues({"a": 1, "b": [2]})
+        my_cv.clear()
+        self.assertEqual(len(my_cv), 0)
+        self.assertNotIn("a", my_cv)
+        self.assertNotIn([2], my_cv)
+
+    def test_missing_key_raises_in_error_on(self):
+        my_cv = CoupledValues({"a": 1})
+        with self.assertRaises(KeyError):
+            my_cv["z"]
+        with self.assertRaises(KeyError):
+            my_cv.pop("z")
+
+    def test_missing_key_returns_none_in_error_off(self):
+        my_cv = CoupledValues({"a": 1}, error_mode=ERROR_OFF)
+        self.assertIsNone(my_cv["z"])
+        self.assertIsNone(my_cv.pop("z"))
+
+    def test_update_errors(self):
+        my_cv = CoupledValues({"a": 1, "b": 2})
+        with self.assertRaises(ValueError):
+            my_cv.update("a", "a")
+        with self.assertRaises(ClashingError):
+            my_cv.update("a", 2)
+        self.assertEqual(my_cv["a"], 1)
+
+    def test_invalid_error_mode(self):
+        with self.assertRaises(ValueError):
+            CoupledValues(error_mode="sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestStreamingPush(unittest.TestCase):
+
+    def test_push_from_generator(self):
+        my_cv = CoupledValues((i, f"id-{i}") for i in range(100))
+        self.assertEqual(len(my_cv), 100)
+        my_cv.push(((i, f"id-{i}") for i in range(100, 150)), chunk_size=7)
+        self.assertEqual(len(my_cv), 150)
+        self.assertEqual(my_cv["id-149"], 149)
+
+    def test_progress_is_called_after_every_chunk(self):
+        calls = []
+        CoupledValues(
+            [(i, -i - 1) for i in range(10)], chunk_size=4,
+            progress=calls.append
+        )
+        self.assertEqual(calls, [4, 8, 10])
+
+    def test_every_clash_across_chunks_is_reported(self):
+        my_cv = CoupledValues({"a": 1})
+        calls = []
+        with self.assertRaises(ClashingError) as context:
+            my_cv.push(
+                [("b", 2), ("a", 3), ("c", 4), ("d", 2), ("e", 5), ("f", 4)],
+                chunk_size=2, progress=calls.append
+            )
+        self.assertEqual(sorted(context.exception.values, key=str),
+                         [2, 4, "a"])
+        self.assertEqual(calls, [])
+        self.assertEqual(len(my_cv), 1)
+
+    def test_clashing_chunk_rolls_back_earlier_chunks(self):
+        my_cv = CoupledValues({"a": 1})
+        calls = []
+        with self.assertRaises(ClashingError) as context:
+            my_cv.push(
+                [("b", 2), ("c", 3), ("d", 4), ("e", 2), ("f", 6), ("a", 7)],
+                chunk_size=2, progress=calls.append
+            )
+        self.assertEqual(sorted(context.exception.values, key=str),
+                         [2, "a"])
+        self.assertEqual(calls, [2])
+        self.assertEqual(len(my_cv), 1)
+        self.assertNotIn("b", my_cv)
+        self.assertNotIn(4, my_cv)
+
+    def test_chunks_are_read_lazily(self):
+        read = []
+
+        def pairs():
+            for i in range(10):
+                read.append(i)
+                yield i, -i - 1
+
+        def progress(pushed):
+            self.assertEqual(len(read), pushed)
+
+        CoupledValues(pairs(), chunk_size=4, progress=progress)
+
+    def test_failing_progress_rolls_back(self):
+        my_cv = CoupledValues({"a": 1})
+
+        def progress(pushed):
+            if pushed > 2:
+                raise RuntimeError("stop")
+
+        with self.assertRaises(RuntimeError):
+            my_cv.push([("b", 2), ("c", 3), ("d", 4)], chunk_size=2,
+                       progress=progress)
+        self.assertEqual(len(my_cv), 1)
+        self.assertNotIn("b", my_cv)
+        self.assertNotIn(4, my_cv)
+
+    def test_chunk_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            CoupledValues([("a", 1)], chunk_size=0)
+        my_cv = CoupledValues()
+        with self.assertRaises(ValueError):
+            my_cv.push([("a", 1)], chunk_size=-1)
+        self.assertEqual(len(my_cv), 0)
+
+    def test_change_feed_sees_chunked_push_once(self):
+        my_cv = CoupledValues()
+        feed = my_cv.change_feed()
+        my_cv.push([("a", 1), ("b", 2), ("c", 3)], chunk_size=2)
+        self.assertEqual([change[2] for change in feed.drain()],
+                         ["a", "b", "c"])
+        feed.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _pair_types(values):
+    return {pair.first: type(pair) for pair in values._iterate_pairs()}
+
+
+class TestTransaction(unittest.TestCase):
+
+    def test_swap_values(self):
+        my_cv = CoupledValues({"a": 1, "b": 2})
+        with my_cv.transaction() as batch:
+            batch["a"] = 2
+            batch["b"] = 1
+            self.assertEqual(batch[1], "b")
+            self.assertEqual(my_cv[1], "a")
+        self.assertEqual(my_cv["a"], 2)
+        self.assertEqual(my_cv["b"], 1)
+
+    def test_chained_rename(self):
+        my_cv = CoupledValues({"a": "x", "b": "y"})
+        with my_cv.transaction() as batch:
+            batch.update("x", "b")
+            batch.update("y", "c")
+            self.assertIn("c", batch)
+            self.assertNotIn("a", batch)
+        self.assertEqual(my_cv["x"], "b")
+        self.assertEqual(my_cv["c"], "y")
+        self.assertNotIn("a", my_cv)
+
+    def test_push_and_pop(self):
+        my_cv = CoupledValues({"a": 1})
+        with my_cv.transaction() as batch:
+            batch.push([("b", 2), ("c", 3)])
+            self.assertEqual(batch.pop("a"), 1)
+            self.assertEqual(batch.pop(3), "c")
+        self.assertEqual(len(my_cv), 1)
+        self.assertEqual(my_cv["b"], 2)
+
+    def test_clash_leaves_set_unchanged(self):
+        my_cv = CoupledValues({"a": 1, "b": 2})
+        with self.assertRaises(ClashingError) as context:
+            with my_cv.transaction() as batch:
+                batch["a"] = 2
+                batch.push(("c", 1))
+        self.assertEqual(context.exception.values, [2])
+        self.assertEqual(my_cv["a"], 1)
+        self.assertNotIn("c", my_cv)
+
+    def test_rolled_back_on_error(self):
+        my_cv = CoupledValues({"a": 1})
+        with self.assertRaises(RuntimeError):
+            with my_cv.transaction() as batch:
+                batch["a"] = 5
+                raise RuntimeError("stop")
+        self.assertEqual(my_cv["a"], 1)
+        batch = my_cv.transaction()
+        batch["a"] = 6
+        batch.rollback()
+        self.assertEqual(my_cv["a"], 1)
+
+    def test_closed_transaction(self):
+        batch = CoupledValues({"a": 1}).transaction()
+        batch.commit()
+        with self.assertRaises(RuntimeError):
+            batch["a"] = 2
+        with self.assertRaises(RuntimeError):
+            batch.commit()
+        with self.assertRaises(RuntimeError):
+            batch.rollback()
+
+    def test_errors(self):
+        my_cv = CoupledValues({"a": 1})
+        with my_cv.transaction() as batch:
+            with self.assertRaises(ValueError):
+                batch.update("a", "a")
+            with self.assertRaises(KeyError):
+                batch["missing"]
+            with self.assertRaises(KeyError):
+                batch.pop("missing")
+        my_cv = CoupledValues({"a": 1}, error_mode=ERROR_OFF)
+        with my_cv.transaction() as batch:
+            self.assertIsNone(batch["missing"])
+            self.assertIsNone(batch.pop("missing"))
+
+    def test_unhashable_values(self):
+        my_cv = CoupledValues([(["a"], 1)])
+        with my_cv.transaction() as batch:
+            batch[["a"]] = 2
+            batch.push((["b"], 3))
+            self.assertEqual(batch[["b"]], 3)
+        self.assertEqual(my_cv[2], ["a"])
+        self.assertEqual(my_cv[3], ["b"])
+
+    def test_apply_batch(self):
+        my_cv = CoupledValues({"a": 1, "b": 2})
+        self.assertEqual(
+            my_cv.apply_batch([("pop", "a"), ("update", "b", 1)]), [1]
+        )
+        self.assertEqual(my_cv["b"], 1)
+        with self.assertRaises(ValueError):
+            my_cv.apply_batch([("update", "b", 5), ("rename", "b")])
+        self.assertEqual(my_cv["b"], 1)
+
+
+class TestTransactionPairTypes(unittest.TestCase):
+
+    def _swap(self, my_cv, a, b):
+        with my_cv.transaction() as batch:
+            first, second = batch[a], batch[b]
+            batch[a] = second
+            batch[b] = first
+            batch.push(("e", "f"))
+        return my_cv
+
+    def test_coupled_values_keeps_frozen_pairs(self):
+        my_cv = CoupledValues([FrozenCoupledPair("a", "b"), ("c", "d")])
+        self._swap(my_cv, "a", "c")
+        self.assertEqual(my_cv["a"], "d")
+        self.assertEqual(
+            _pair_types(my_cv),
+            {"a": FrozenCoupledPair, "c": CoupledPair, "e": CoupledPair}
+        )
+
+    def test_concurrent(self):
+        my_cv = self._swap(ConcurrentCoupledValues({"a": "b", "c": "d"}),
+                           "a", "c")
+        self.assertEqual(my_cv["c"], "b")
+        self.assertEqual(set(_pair_types(my_cv).values()), {CoupledPair})
+
+    def test_keyed(self):
+        my_cv = KeyedCoupledValues({"a": "b", "c": "d"},
+                                   key_func=normalize_text)
+        self._swap(my_cv, "a", "c")
+        self.assertEqual(set(_pair_types(my_cv).values()), {KeyedCoupledPair})
+        self.assertEqual(my_cv[" A "], "d")
+        self.assertEqual(my_cv["F"], "e")
+
+    def test_identity(self):
+        my_cv = self._swap(IdentityCoupledValues({"a": "b", "c": "d"}),
+                           "a", "c")
+        self.assertEqual(set(_pair_types(my_cv).values()),
+                         {IdentityCoupledPair})
+        self.assertEqual(my_cv["a"], "d")
+
+    def test_str(self):
+        my_cv = self._swap(StrCoupledValues({"a": "b", "c": "d"}), "a", "c")
+        self.assertEqual(my_cv["b"], "c")
+        with self.assertRaises(TypeError):
+            with my_cv.transaction() as batch:
+                batch["x"] = "y"
+                batch["a"] = 1
+        self.assertNotIn("x", my_cv)
+        self.assertEqual(my_cv["a"], "d")
+
+    def test_int(self):
+        my_cv = IntCoupledValues({1: 2, 3: 4})
+        with my_cv.transaction() as batch:
+            batch[1] = 4
+            batch[3] = 2
+        self.assertEqual(my_cv[4], 1)
+        with self.assertRaises(TypeError):
+            with my_cv.transaction() as batch:
+                batch[1] = "x"
+        self.assertEqual(my_cv[1], 4)
+
+    def test_cache_and_sorted(self):
+        for cls in (CacheCoupledValues, SortedCoupledValues):
+            my_cv = self._swap(cls({"a": "b", "c": "d"}), "a", "c")
+            self.assertEqual(my_cv["a"], "d")
+            self.assertEqual(len(my_cv), 3)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numeric(self):
+        my_cv = NumericCoupledValues({1: 2, 3: 4})
+        with my_cv.transaction() as batch:
+            batch[1] = 4
+            batch[3] = 2
+        self.assertEqual(my_cv[4], 1)
+        with self.assertRaises(TypeError):
+            with my_cv.transaction() as batch:
+                batch[1] = "x"
+        self.assertEqual(my_cv[1], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import pickle
+import sys
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class _CountingIntCoupledValues(IntCoupledValues):
+
+    conversions = 0
+
+    @classmethod
+    def _convert(cls, value):
+        cls.conversions += 1
+        return super()._convert(value)
+
+
+class TestBuildTyped(unittest.TestCase):
+
+    def test_detects_value_type(self):
+        self.assertIsInstance(build_typed({"a": "b"}), StrCoupledValues)
+        self.assertIsInstance(build_typed({1: 2}), IntCoupledValues)
+        self.assertIs(type(build_typed({1: "one"})), CoupledValues)
+        self.assertIs(type(build_typed()), CoupledValues)
+        my_cv = build_typed((str(i), f"v{i}") for i in range(10))
+        self.assertIsInstance(my_cv, StrCoupledValues)
+        self.assertEqual(len(my_cv), 10)
+
+    def test_value_type(self):
+        self.assertIsInstance(build_typed({}, value_type=int), IntCoupledValues)
+        with self.assertRaises(TypeError):
+            build_typed({"a": 1}, value_type=str)
+        with self.assertRaises(ValueError):
+            build_typed({}, value_type=float)
+
+
+class TestStrCoupledValues(unittest.TestCase):
+
+    def test_lookups(self):
+        my_cv = StrCoupledValues({"en": "English", "fr": "French"})
+        self.assertEqual(my_cv["French"], "fr")
+        self.assertEqual(my_cv.get_many(["en", "fr"]), ["English", "French"])
+        self.assertEqual(my_cv.contains_many(["en", "de", 1, ["x"]]),
+                         [True, False, False, False])
+        self.assertEqual(len(my_cv), 2)
+
+    def test_values_are_interned(self):
+        key = "".join(["lo", "cale"])
+        my_cv = StrCoupledValues({key: "value"})
+        stored = my_cv._find_pair("value").first
+        self.assertIs(stored, sys.intern("locale"))
+        copy = pickle.loads(pickle.dumps(my_cv))
+        self.assertIs(copy._find_pair("value").first, sys.intern("locale"))
+
+    def test_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            StrCoupledValues({"a": 1})
+        my_cv = StrCoupledValues({"a": "b"})
+        with self.assertRaises(TypeError):
+            my_cv.push(("c", 2))
+        with self.assertRaises(TypeError):
+            my_cv.update("a", 2)
+        self.assertEqual(my_cv["a"], "b")
+
+    def test_update_and_pop(self):
+        my_cv = StrCoupledValues({"a": "b", "c": "d"})
+        my_cv.update("b", "z")
+        self.assertEqual(my_cv["b"], "z")
+        self.assertNotIn("a", my_cv)
+        my_cv["c"] = "e"
+        self.assertEqual(my_cv["e"], "c")
+        with self.assertRaises(ClashingError):
+            my_cv.update("z", "c")
+        my_cv.update("missing", "x")
+        self.assertEqual(my_cv["x"], "missing")
+        with self.assertRaises(ValueError):
+            my_cv.update("z", "z")
+        self.assertEqual(my_cv.pop("e"), "c")
+        self.assertNotIn("c", my_cv)
+        my_cv.clear()
+        self.assertEqual(len(my_cv), 0)
+
+
+class TestIntCoupledValues(unittest.TestCase):
+
+    def test_pairs_hold_stored_values(self):
+        my_cv = IntCoupledValues({1: 2})
+        pair = my_cv._find_pair(1.0)
+        self.assertEqual(pair, CoupledPair(1, 2))
+        self.assertIs(type(pair.first), int)
+        pair = my_cv._find_pair(2.0)
+        self.assertIs(type(pair.second), int)
+        self.assertIsNone(my_cv._find_pair(3))
+        self.assertIsNone(my_cv._find_pair(["x"]))
+
+    def test_rejects_bool_and_other_types(self):
+        with self.assertRaises(TypeError):
+            IntCoupledValues({True: 2})
+        with self.assertRaises(TypeError):
+            IntCoupledValues({1.5: 2})
+
+    def test_values_are_converted_once(self):
+        _CountingIntCoupledValues.conversions = 0
+        my_cv = _CountingIntCoupledValues({1: 2, 3: 4})
+        self.assertEqual(_CountingIntCoupledValues.conversions, 4)
+        my_cv.push((5, 6))
+        self.assertEqual(_CountingIntCoupledValues.conversions, 6)
+        my_cv._push_pair(CoupledPair(7, 8))
+        self.assertEqual(_CountingIntCoupledValues.conversions, 8)
+
+    def test_converted_by_other_entry_points(self):
+        copy = loads(dumps(IntCoupledValues({1: 2})), trusted=True,
+                     cls=IntCoupledValues)
+        self.assertEqual(copy[2], 1)
+        built = build_parallel({1: 2}, workers=1, cls=IntCoupledValues)
+        self.assertIsInstance(built, IntCoupledValues)
+        with self.assertRaises(TypeError):
+            build_parallel({"a": 2}, workers=1, cls=IntCoupledValues)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#
+# MIT License
+#
+# Copyright(c) 2020 GrayChrysTea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from coupledpairs import *
+from coupledvalues import *
+
+
+class TestValidate(unittest.TestCase):
+
+    def test_valid_set(self):
+        my_cv = CoupledValues([("a", "b"), (["c"], "d")])
+        self.assertEqual(my_cv.validate(), [])
+        self.assertEqual(CoupledValues().validate(), [])
+
+    def test_finds_every_duplicate(self):
+        my_cv = CoupledValues([("a", "b"), ("c", "d"), (["e"], 1), (["f"], 2)])
+        my_cv._find_pair("a").modify("a", "d")
+        my_cv._find_pair(2).modify(["f"], ["e"])
+        self.assertEqual(my_cv.validate(), ["d", ["e"]])
+
+    def test_reindexes_modified_pairs(self):
+        my_cv = CoupledValues({"a": "b"})
+        my_cv._find_pair("a").modify("a", "z")
+        self.assertEqual(my_cv.validate(), [])
+        self.assertEqual(my_cv["z"], "a")
+        self.assertNotIn("b", my_cv)
+
+    def test_changed_only_needs_tracking(self):
+        my_cv = CoupledValues({"a": "b", "c": "d"})
+        my_cv._find_pair("a").modify("a", "d")
+        # Without change tracking the whole set is checked
+        self.assertEqual(my_cv.validate(changed_only=True), ["d"])
+
+    def test_changed_only(self):
+        my_cv = CoupledValues({"a": "b", "c": "d", "e": "f"})
+        my_cv.enable_change_tracking()
+        pair = my_cv._find_pair("a")
+        pair.modify("a", "d")
+        self.assertEqual(my_cv.validate(changed_only=True), ["d"])
+        # Still reported until it is fixed
+        self.assertEqual(my_cv.validate(changed_only=True), ["d"])
+        pair.modify("a", "x")
+        self.assertEqual(my_cv.validate(changed_only=True), [])
+        self.assertEqual(my_cv["x"], "a")
+        self.assertNotIn("b", my_cv)
+        self.assertEqual(my_cv.validate(changed_only=True), [])
+
+    def test_disable_change_tracking(self):
+        my_cv = CoupledValues({"a": "b", "c": "d"})
+        my_cv.enable_change_tracking()
+        my_cv.disable_change_tracking()
+        my_cv._find_pair("a").modify("a", "z")
+        self.assertEqual(my_cv.validate(changed_only=True), [])
+        self.assertEqual(my_cv["z"], "a")
+
+    def test_popped_pairs_are_not_tracked(self):
+        my_cv = CoupledValues({"a": "b", "c": "d"})
+        my_cv.enable_change_tracking()
+        pair = my_cv._find_pair("a")
+        my_cv.pop("a")
+        pair.modify("a", "d")
+        self.assertEqual(my_cv.validate(changed_only=True), [])
+
+
+if __name__ == "__main__":
+    unittest.main()